@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Evaluación Masiva de Mezclas desde CSV/Excel
+============================================
+
+Predice la resistencia de todas las mezclas de una planilla sin abrir la
+GUI. El CSV se lee por bloques (también el formato ';' con coma decimal
+de Concrete_Data.csv), cada bloque se predice con una sola llamada a
+predict_batch y se escribe de inmediato, de modo que archivos más
+grandes que la memoria se procesan con memoria constante.
+
+Uso:
+    python main.py score entrada.csv -o salida.csv
+    python batch_scoring.py Concrete_Data.xls -o salida.csv --chunk-size 5000
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from utils import DATASET_COLUMN_MAPPING, MPA_TO_KG_CM2
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 10000
+EXCEL_SUFFIXES = ('.xls', '.xlsx')
+_MPA_STRENGTH_COLUMN = 'Concrete compressive strength(MPa, megapascals)'
+
+# Columnas agregadas a cada fila de la salida
+OUTPUT_COLUMNS = [
+    'resistencia_predicha_kg_cm2',
+    'relacion_agua_cemento',
+    'total_cementicios_kg_m3',
+    'clasificacion_nec',
+    'dentro_de_rango',
+    'alertas_rango'
+]
+
+
+def detect_csv_format(path: Union[str, Path]) -> Tuple[str, str]:
+    """
+    Detectar separador y símbolo decimal a partir de las primeras líneas.
+
+    Args:
+        path: Archivo CSV
+
+    Returns:
+        Tuple[str, str]: (separador, decimal), p. ej. (';', ',') para Concrete_Data.csv
+    """
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        header = f.readline()
+        sample = f.readline()
+
+    if header.count(';') > header.count(','):
+        sep = ';'
+    elif header.count('\t') > header.count(','):
+        sep = '\t'
+    else:
+        sep = ','
+
+    # Con ';' o tabulador, una coma entre dígitos solo puede ser decimal
+    decimal = ','
+    if sep == ',' or not any(a.isdigit() and b == ',' and c.isdigit()
+                             for a, b, c in zip(sample, sample[1:], sample[2:])):
+        decimal = '.'
+    return sep, decimal
+
+
+def _normalize_columns(chunk: "pd.DataFrame") -> "pd.DataFrame":
+    """Renombrar columnas del dataset original a los nombres del modelo."""
+    import pandas as pd
+
+    in_mpa = any(str(c).strip() == _MPA_STRENGTH_COLUMN for c in chunk.columns)
+    chunk = chunk.rename(columns=lambda c: DATASET_COLUMN_MAPPING.get(str(c).strip(), str(c).strip()))
+    if in_mpa:
+        # Igual que load_concrete_dataset: la resistencia medida pasa a kg/cm²
+        strength = DATASET_COLUMN_MAPPING[_MPA_STRENGTH_COLUMN]
+        chunk[strength] = pd.to_numeric(chunk[strength], errors='coerce') * MPA_TO_KG_CM2
+        chunk[strength] = chunk[strength].round(2)
+    return chunk
+
+
+def iter_input_chunks(path: Union[str, Path],
+                      chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator["pd.DataFrame"]:
+    """
+    Leer la entrada por bloques con los nombres de columnas del modelo.
+
+    Los CSV se leen en streaming; las planillas Excel no admiten lectura
+    parcial, se cargan completas (están limitadas por el propio formato) y
+    se recorren por bloques.
+
+    Args:
+        path: Archivo .csv, .xls o .xlsx
+        chunk_size: Filas por bloque
+
+    Yields:
+        pd.DataFrame: Bloque de filas
+    """
+    import pandas as pd
+
+    path = Path(path)
+    if path.suffix.lower() in EXCEL_SUFFIXES:
+        sheet = _normalize_columns(pd.read_excel(path))
+        for start in range(0, len(sheet), chunk_size):
+            yield sheet.iloc[start:start + chunk_size]
+        return
+
+    sep, decimal = detect_csv_format(path)
+    with pd.read_csv(path, sep=sep, decimal=decimal, chunksize=chunk_size) as reader:
+        for chunk in reader:
+            yield _normalize_columns(chunk)
+
+
+def score_chunk(model_handler, chunk: "pd.DataFrame") -> "pd.DataFrame":
+    """
+    Agregar las columnas de predicción a un bloque.
+
+    Las filas con valores vacíos o no numéricos quedan sin predicción
+    (resistencia NaN) en lugar de abortar el archivo completo.
+
+    Args:
+        model_handler: ConcreteModelHandler cargado
+        chunk: Bloque con las variables de entrada por nombre
+
+    Returns:
+        pd.DataFrame: Bloque original más OUTPUT_COLUMNS
+    """
+    import pandas as pd
+
+    features = model_handler.feature_names
+    missing = [f for f in features if f not in chunk.columns]
+    if missing:
+        raise ValueError(f"Faltan las columnas: {', '.join(missing)}")
+
+    X = chunk[features].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+    valid = np.isfinite(X).all(axis=1)
+
+    n = len(chunk)
+    output = {
+        'resistencia_predicha_kg_cm2': np.full(n, np.nan),
+        'relacion_agua_cemento': np.full(n, np.nan),
+        'total_cementicios_kg_m3': np.full(n, np.nan),
+        'clasificacion_nec': np.full(n, '', dtype=object),
+        'dentro_de_rango': np.zeros(n, dtype=bool),
+        'alertas_rango': np.zeros(n, dtype=np.uint8)
+    }
+    # Las filas sin predicción también informan qué variables faltan o están fuera de rango
+    if not valid.all():
+        output['alertas_rango'][~valid] = model_handler.range_flags(X[~valid])
+    if valid.any():
+        batch = model_handler.predict_batch(X[valid])
+        for column in OUTPUT_COLUMNS:
+            output[column][valid] = batch[column]
+
+    scored = chunk.copy()
+    for column in OUTPUT_COLUMNS:
+        scored[column] = output[column]
+    return scored
+
+
+def score_file(input_path: Union[str, Path], output_path: Union[str, Path],
+               model_handler=None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, Any]:
+    """
+    Predecir todas las mezclas de un archivo y escribir el resultado por bloques.
+
+    La salida conserva el separador y el decimal de un CSV de entrada; para
+    Excel se escribe CSV estándar.
+
+    Args:
+        input_path: Archivo de entrada (.csv, .xls, .xlsx)
+        output_path: CSV de salida
+        model_handler: ConcreteModelHandler (por defecto se crea uno)
+        chunk_size: Filas por bloque
+
+    Returns:
+        Dict: Resumen (filas, sin predicción, fuera de rango, tiempo)
+    """
+    if model_handler is None:
+        from model_handler_fixed import ConcreteModelHandler
+        model_handler = ConcreteModelHandler()
+    if not model_handler.is_loaded:
+        raise RuntimeError("Modelo no cargado correctamente")
+
+    input_path = Path(input_path)
+    if input_path.suffix.lower() in EXCEL_SUFFIXES:
+        sep, decimal = ',', '.'
+    else:
+        sep, decimal = detect_csv_format(input_path)
+
+    start = time.perf_counter()
+    rows = unscored = out_of_range = 0
+
+    with open(output_path, 'w', newline='', encoding='utf-8') as out:
+        for index, chunk in enumerate(iter_input_chunks(input_path, chunk_size)):
+            scored = score_chunk(model_handler, chunk)
+            scored.to_csv(out, sep=sep, decimal=decimal, index=False, header=index == 0)
+
+            rows += len(scored)
+            predicted = scored['resistencia_predicha_kg_cm2'].notna()
+            unscored += int((~predicted).sum())
+            out_of_range += int((predicted & ~scored['dentro_de_rango']).sum())
+            logger.info(f"Bloque {index + 1}: {rows} filas procesadas")
+
+    elapsed = time.perf_counter() - start
+    summary = {
+        'filas': rows,
+        'filas_sin_prediccion': unscored,
+        'filas_fuera_de_rango': out_of_range,
+        'segundos': round(elapsed, 3),
+        'filas_por_segundo': round(rows / elapsed, 1) if elapsed > 0 else 0.0
+    }
+    logger.info(f"Evaluacion masiva completada: {summary}")
+    return summary
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    """Argumentos del modo de evaluación masiva."""
+    parser = argparse.ArgumentParser(
+        prog="main.py score",
+        description="Predecir la resistencia de todas las mezclas de un CSV/Excel")
+    parser.add_argument('input', help="Archivo de entrada (.csv, .xls, .xlsx)")
+    parser.add_argument('-o', '--output', help="CSV de salida (por defecto <entrada>_predicciones.csv)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Filas por bloque (por defecto {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument('--model', default="modelo_hormigon_ecuador_v1.pkl",
+                        help="Modelo .pkl o directorio .forest")
+    parser.add_argument('--metadata', default="modelo_metadata.json",
+                        help="Archivo de metadata del modelo")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada de `python main.py score`."""
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    input_path = Path(args.input)
+    if not input_path.is_file():
+        print(f"ERROR: No se encontro el archivo de entrada '{input_path}'")
+        return 1
+    output_path = Path(args.output) if args.output else \
+        input_path.with_name(f"{input_path.stem}_predicciones.csv")
+
+    from model_handler_fixed import ConcreteModelHandler
+    handler = ConcreteModelHandler(args.model, args.metadata)
+    if not handler.is_loaded:
+        print("ERROR: No se pudo cargar el modelo")
+        return 1
+
+    try:
+        summary = score_file(input_path, output_path, handler, args.chunk_size)
+    except Exception as e:
+        logger.error(f"Error en evaluacion masiva: {e}")
+        print(f"ERROR: {e}")
+        return 1
+
+    print(f"=> {summary['filas']} mezclas evaluadas en {summary['segundos']} s "
+          f"({summary['filas_por_segundo']} filas/s)")
+    if summary['filas_sin_prediccion']:
+        print(f"   {summary['filas_sin_prediccion']} filas sin prediccion (valores vacios o no numericos)")
+    if summary['filas_fuera_de_rango']:
+        print(f"   {summary['filas_fuera_de_rango']} filas fuera del rango de entrenamiento")
+    print(f"=> Resultados guardados en {output_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+    sys.exit(main())
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Benchmarks de la Ruta de Predicción y de la GUI
+===============================================
+
+Mide los tiempos que el README promete (resultados en menos de 100 ms) y
+los compara con una línea base guardada:
+
+- carga del modelo (pkl o artefacto .forest, el que use el handler)
+- latencia y filas/s de predict_batch para varios tamaños de lote, junto
+  con la llamada cruda al modelo (sklearn y motor plano)
+- costo de predict_strength por encima de la predicción cruda de una fila
+  (sin caché y con acierto de caché)
+- ensayos de laboratorio más cercanos (se consultan en cada actualización en vivo)
+- redibujado del gráfico de resultados
+- inserción de una predicción en el historial con 10, 1k y 10k filas
+
+Uso:
+    python main.py bench                      # comparar con la línea base
+    python main.py bench --save-baseline      # guardar la línea base
+    python benchmarks.py --quick --tolerance 0.5
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASELINE_PATH = "benchmark_baseline.json"
+BATCH_SIZES = (1, 10, 100, 1000, 10000)
+HISTORY_SIZES = (10, 1000, 10000)
+DEFAULT_TOLERANCE = 0.25
+# Diferencias menores a esto son ruido del reloj, aunque superen la tolerancia
+MIN_REGRESSION_MS = 0.05
+
+
+def measure(fn: Callable[[], Any], repeat: int = 20, warmup: int = 2,
+            setup: Optional[Callable[[], Any]] = None) -> Dict[str, float]:
+    """
+    Medir una función varias veces.
+
+    Args:
+        fn: Función a medir (sin argumentos)
+        repeat: Mediciones
+        warmup: Llamadas previas sin medir
+        setup: Preparación antes de cada llamada (fuera del tiempo medido)
+
+    Returns:
+        Dict: 'mediana_ms', 'p95_ms', 'min_ms' y 'repeticiones'
+    """
+    for _ in range(warmup):
+        if setup is not None:
+            setup()
+        fn()
+
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    return {
+        'mediana_ms': round(statistics.median(samples), 4),
+        'p95_ms': round(float(np.percentile(samples, 95)), 4),
+        'min_ms': round(min(samples), 4),
+        'repeticiones': repeat
+    }
+
+
+def benchmark_mixes(handler, rows: int, seed: int = 0) -> np.ndarray:
+    """Matriz (rows, 8) de mezclas uniformes dentro de VALID_RANGES."""
+    low, high = np.array([handler.VALID_RANGES[f] for f in handler.feature_names]).T
+    return np.random.default_rng(seed).uniform(low, high, size=(rows, len(low)))
+
+
+def bench_model_load(model_path: str, metadata_path: str, repeat: int) -> Dict[str, Dict[str, float]]:
+    """Tiempo de construir un ConcreteModelHandler (lectura del modelo y metadata)."""
+    from model_handler_fixed import ConcreteModelHandler
+    return {'carga_modelo': measure(lambda: ConcreteModelHandler(model_path, metadata_path),
+                                    repeat=repeat, warmup=1)}
+
+
+def bench_predict(handler, batch_sizes: Sequence[int], repeat: int) -> Dict[str, Dict[str, float]]:
+    """Latencia y filas/s de predict_batch y de la predicción cruda por tamaño de lote."""
+    results = {}
+    for size in batch_sizes:
+        X = benchmark_mixes(handler, size)
+        # Los lotes grandes se miden menos veces para acotar la duración
+        times = max(3, repeat // max(1, size // 1000))
+        candidates = {f'predict_batch_{size}': lambda: handler.predict_batch(X)}
+        if handler.model is not None:
+            candidates[f'modelo_sklearn_{size}'] = lambda: handler.model.predict(X)
+        if handler.engine is not None:
+            candidates[f'motor_plano_{size}'] = lambda: handler.engine.predict(X)
+
+        for name, fn in candidates.items():
+            stats = measure(fn, repeat=times)
+            stats['filas_por_segundo'] = round(size / (stats['mediana_ms'] / 1000), 1)
+            results[name] = stats
+    return results
+
+
+def bench_predict_strength(handler, repeat: int) -> Dict[str, Dict[str, float]]:
+    """predict_strength sin caché y con acierto de caché frente a la predicción cruda."""
+    mix = handler.get_preset_mixes()["C25 - Estructural"]
+    X = np.array([[mix[f] for f in handler.feature_names]])
+    # Mismo camino que predict_strength: motor plano para una fila, si existe
+    raw = handler.engine.predict if handler.engine is not None else handler.model.predict
+
+    results = {
+        'prediccion_cruda_1': measure(lambda: raw(X), repeat=repeat),
+        'predict_strength_sin_cache': measure(lambda: handler.predict_strength(mix), repeat=repeat,
+                                              setup=handler.clear_cache),
+        'predict_strength_cache': measure(lambda: handler.predict_strength(mix), repeat=repeat)
+    }
+    overhead = results['predict_strength_sin_cache']['mediana_ms'] - results['prediccion_cruda_1']['mediana_ms']
+    results['predict_strength_sin_cache']['sobrecosto_ms'] = round(overhead, 4)
+    return results
+
+
+def bench_neighbors(handler, repeat: int, k: int = 5) -> Dict[str, Dict[str, float]]:
+    """Top-k ensayos más cercanos de una mezcla (índice ya cargado)."""
+    mix = handler.get_preset_mixes()["C25 - Estructural"]
+    handler.neighbor_index()
+    return {f'vecinos_k{k}': measure(lambda: handler.check_extrapolation(mix, k=k), repeat=repeat)}
+
+
+def bench_chart_redraw(repeat: int) -> Dict[str, Dict[str, float]]:
+    """Rasterizar el gráfico de resultados al tamaño por defecto."""
+    from chart_rendering import render_results_chart
+    return {'grafico_resultados': measure(lambda: render_results_chart(250.0), repeat=repeat)}
+
+
+def bench_history_update(sizes: Sequence[int], repeat: int) -> Dict[str, Dict[str, float]]:
+    """Agregar una predicción al historial (modelo + QTableView visible) con n filas previas."""
+    from PyQt6.QtCore import Qt
+    from PyQt6.QtWidgets import QApplication, QTableView
+    from history_model import HISTORY_FEATURES, HistoryTableModel
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    rng = np.random.default_rng(0)
+    inputs = dict(zip(HISTORY_FEATURES, rng.uniform(0, 500, len(HISTORY_FEATURES))))
+
+    results = {}
+    for size in sizes:
+        model = HistoryTableModel()
+        view = QTableView()
+        view.setModel(model)
+        view.setSortingEnabled(True)
+        view.sortByColumn(-1, Qt.SortOrder.AscendingOrder)
+        view.resize(1000, 400)
+        view.show()
+        timestamps = [f"2026-01-01T00:00:{i:06d}" for i in range(size)]
+        model.extend(timestamps, rng.uniform(0, 600, (size, 1 + len(HISTORY_FEATURES))))
+
+        counter = iter(range(size, size + repeat + 10))
+
+        def append():
+            model.append(f"2026-01-01T00:00:{next(counter):06d}", 250.0, inputs)
+            app.processEvents()
+
+        results[f'historial_agregar_{size}'] = measure(append, repeat=repeat)
+        view.close()
+        view.deleteLater()
+    app.processEvents()
+    return results
+
+
+def run_benchmarks(model_path: str = "modelo_hormigon_ecuador_v1.pkl",
+                   metadata_path: str = "modelo_metadata.json",
+                   batch_sizes: Sequence[int] = BATCH_SIZES,
+                   history_sizes: Sequence[int] = HISTORY_SIZES,
+                   repeat: int = 20, gui: bool = True) -> Dict[str, Any]:
+    """
+    Ejecutar todos los benchmarks.
+
+    Args:
+        model_path: Modelo a medir
+        metadata_path: Metadata del modelo
+        batch_sizes: Tamaños de lote de predict_batch
+        history_sizes: Filas previas del historial
+        repeat: Mediciones por benchmark
+        gui: Incluir gráfico e historial (requieren PyQt6/matplotlib)
+
+    Returns:
+        Dict: 'entorno' y 'resultados' (nombre -> estadísticas)
+    """
+    from model_handler_fixed import ConcreteModelHandler
+    handler = ConcreteModelHandler(model_path, metadata_path)
+    if not handler.is_loaded:
+        raise RuntimeError(f"No se pudo cargar el modelo {model_path}")
+
+    results = {}
+    results.update(bench_model_load(model_path, metadata_path, repeat=max(3, repeat // 4)))
+    results.update(bench_predict(handler, batch_sizes, repeat))
+    results.update(bench_predict_strength(handler, repeat))
+    results.update(bench_neighbors(handler, repeat))
+    if gui:
+        results.update(bench_chart_redraw(max(3, repeat // 4)))
+        results.update(bench_history_update(history_sizes, repeat))
+
+    return {'entorno': environment_info(handler), 'resultados': results}
+
+
+def environment_info(handler=None) -> Dict[str, Any]:
+    """Datos de la máquina para saber si una línea base es comparable."""
+    info = {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'procesador': platform.processor() or platform.machine(),
+        'nucleos': os.cpu_count(),
+        'numpy': np.__version__
+    }
+    if handler is not None:
+        info['modelo_sha256'] = handler.model_hash
+        info['motor_plano'] = handler.engine is not None
+    return info
+
+
+def save_baseline(report: Dict[str, Any], path: Union[str, Path] = DEFAULT_BASELINE_PATH):
+    """Guardar un reporte como línea base."""
+    from training_pipeline import write_json_atomic
+    write_json_atomic(Path(path), report)
+    logger.info(f"Linea base guardada en {path}")
+
+
+def load_baseline(path: Union[str, Path] = DEFAULT_BASELINE_PATH) -> Optional[Dict[str, Any]]:
+    """Leer una línea base (None si no existe)."""
+    path = Path(path)
+    if not path.is_file():
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare_to_baseline(report: Dict[str, Any], baseline: Dict[str, Any],
+                        tolerance: float = DEFAULT_TOLERANCE) -> List[Dict[str, Any]]:
+    """
+    Comparar las medianas de un reporte con la línea base.
+
+    Args:
+        report: Resultado de run_benchmarks
+        baseline: Línea base guardada
+        tolerance: Aumento relativo permitido antes de marcar regresión (0.25 = 25%)
+
+    Returns:
+        List[Dict]: Por benchmark 'nombre', 'base_ms', 'actual_ms', 'cambio' y
+        'estado' ('regresion', 'mejora', 'igual' o 'nuevo')
+    """
+    rows = []
+    for name, stats in report['resultados'].items():
+        current = stats['mediana_ms']
+        previous = baseline.get('resultados', {}).get(name, {}).get('mediana_ms')
+        if previous is None:
+            rows.append({'nombre': name, 'base_ms': None, 'actual_ms': current,
+                         'cambio': None, 'estado': 'nuevo'})
+            continue
+
+        change = (current - previous) / previous if previous > 0 else 0.0
+        if change > tolerance and current - previous > MIN_REGRESSION_MS:
+            status = 'regresion'
+        elif change < -tolerance and previous - current > MIN_REGRESSION_MS:
+            status = 'mejora'
+        else:
+            status = 'igual'
+        rows.append({'nombre': name, 'base_ms': previous, 'actual_ms': current,
+                     'cambio': round(change, 4), 'estado': status})
+    return rows
+
+
+def format_report(report: Dict[str, Any], comparison: Optional[List[Dict[str, Any]]] = None,
+                  baseline: Optional[Dict[str, Any]] = None) -> str:
+    """Reporte de texto con los tiempos y, si hay línea base, el cambio de cada uno."""
+    lines = ["=== BENCHMARKS ==="]
+    if comparison is None:
+        for name, stats in report['resultados'].items():
+            extra = f"  {stats['filas_por_segundo']:>12,.0f} filas/s" if 'filas_por_segundo' in stats else ""
+            lines.append(f"  {name:<32} {stats['mediana_ms']:10.3f} ms  p95 {stats['p95_ms']:10.3f} ms{extra}")
+    else:
+        labels = {'regresion': 'REGRESION', 'mejora': 'mejora', 'igual': '', 'nuevo': 'nuevo'}
+        for row in comparison:
+            base = f"{row['base_ms']:10.3f}" if row['base_ms'] is not None else f"{'-':>10}"
+            change = f"{row['cambio'] * 100:+7.1f}%" if row['cambio'] is not None else f"{'':>8}"
+            lines.append(f"  {row['nombre']:<32} {base} -> {row['actual_ms']:10.3f} ms "
+                         f"{change}  {labels[row['estado']]}")
+        regressions = sum(row['estado'] == 'regresion' for row in comparison)
+        lines.append(f"=> {regressions} regresiones de {len(comparison)} benchmarks")
+
+    strength = report['resultados'].get('predict_strength_sin_cache', {})
+    if 'sobrecosto_ms' in strength:
+        lines.append(f"=> predict_strength agrega {strength['sobrecosto_ms']:.3f} ms "
+                     f"a la predicción cruda de una fila")
+
+    if baseline is not None:
+        current, previous = report['entorno'], baseline.get('entorno', {})
+        different = [key for key in ('procesador', 'nucleos', 'python', 'modelo_sha256')
+                     if previous.get(key) != current.get(key)]
+        if different:
+            lines.append(f"AVISO: la línea base ({previous.get('fecha')}) se midió en otro entorno "
+                         f"({', '.join(different)}); las diferencias pueden no ser regresiones")
+    return "\n".join(lines)
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    """Argumentos de los benchmarks."""
+    parser = argparse.ArgumentParser(prog="main.py bench",
+                                     description="Benchmarks de predicción y de la GUI con línea base")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE_PATH,
+                        help=f"Archivo de línea base (por defecto {DEFAULT_BASELINE_PATH})")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="Guardar los resultados como nueva línea base")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="Aumento relativo que cuenta como regresión (por defecto 0.25)")
+    parser.add_argument('--repeat', type=int, default=20, help="Mediciones por benchmark")
+    parser.add_argument('--quick', action='store_true',
+                        help="Menos repeticiones y lotes de hasta 1000 filas")
+    parser.add_argument('--no-gui', action='store_true',
+                        help="Omitir gráfico e historial (sin PyQt6/matplotlib)")
+    parser.add_argument('--json', metavar='ARCHIVO', help="Guardar además el reporte completo en JSON")
+    parser.add_argument('--model', default="modelo_hormigon_ecuador_v1.pkl", help="Modelo a medir")
+    parser.add_argument('--metadata', default="modelo_metadata.json", help="Metadata del modelo")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada de `python main.py bench`; devuelve 1 si hay regresiones."""
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    if not args.no_gui:
+        os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+    # Las predicciones registran cada llamada en INFO; se mide el cálculo, no el log
+    logging.getLogger().setLevel(logging.WARNING)
+    batch_sizes = tuple(s for s in BATCH_SIZES if s <= 1000) if args.quick else BATCH_SIZES
+    repeat = min(args.repeat, 5) if args.quick else args.repeat
+
+    try:
+        report = run_benchmarks(args.model, args.metadata, batch_sizes, HISTORY_SIZES,
+                                repeat=repeat, gui=not args.no_gui)
+    except Exception as e:
+        print(f"ERROR: {e}")
+        return 1
+
+    if args.json:
+        from training_pipeline import write_json_atomic
+        write_json_atomic(Path(args.json), report)
+
+    baseline = None if args.save_baseline else load_baseline(args.baseline)
+    comparison = compare_to_baseline(report, baseline, args.tolerance) if baseline else None
+    print(format_report(report, comparison, baseline))
+
+    if args.save_baseline:
+        save_baseline(report, args.baseline)
+        print(f"=> Línea base guardada en {args.baseline}")
+    elif baseline is None:
+        print(f"=> Sin línea base en {args.baseline}; usar --save-baseline para crearla")
+
+    return 1 if comparison and any(row['estado'] == 'regresion' for row in comparison) else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+    sys.exit(main())
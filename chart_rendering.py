@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Renderizado de Gráficos fuera del Hilo de la GUI
+================================================
+
+Dibuja los gráficos de resultados con el backend Agg de matplotlib (sin
+pyplot ni widgets Qt), por lo que puede ejecutarse en un hilo de trabajo.
+El resultado es un QImage que la GUI solo tiene que mostrar.
+"""
+
+import logging
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from PyQt6.QtGui import QImage
+
+logger = logging.getLogger(__name__)
+
+# Rangos NEC básicos mostrados en el gráfico de resultados
+NEC_CHART_RANGES = [140, 280, 420, 600]
+NEC_CHART_LABELS = ['Baja\n<140', 'Normal\n140-280', 'Alta\n280-420', 'Ultra\n>420']
+NEC_CHART_COLORS = ['#ef4444', '#f97316', '#22c55e', '#3b82f6']
+
+
+def figure_to_qimage(figure: Figure) -> QImage:
+    """
+    Rasterizar una figura Agg a QImage.
+
+    Args:
+        figure: Figura de matplotlib asociada a un FigureCanvasAgg
+
+    Returns:
+        QImage: Copia independiente del buffer RGBA
+    """
+    canvas = figure.canvas
+    canvas.draw()
+    width, height = canvas.get_width_height()
+    buffer = canvas.buffer_rgba()
+    return QImage(bytes(buffer), width, height, QImage.Format.Format_RGBA8888).copy()
+
+
+def new_figure(width_px: int, height_px: int, dpi: int = 100) -> Figure:
+    """Crear una figura Agg del tamaño indicado en píxeles."""
+    figure = Figure(figsize=(max(width_px, 100) / dpi, max(height_px, 100) / dpi),
+                    dpi=dpi, facecolor='white')
+    FigureCanvasAgg(figure)
+    return figure
+
+
+def render_results_chart(resistance: float, width_px: int = 1000,
+                         height_px: int = 600, dpi: int = 100) -> QImage:
+    """
+    Gráfico de clasificación NEC con la resistencia predicha.
+
+    Args:
+        resistance: Resistencia predicha en kg/cm²
+        width_px: Ancho de la imagen
+        height_px: Alto de la imagen
+        dpi: Resolución de la figura
+
+    Returns:
+        QImage: Gráfico rasterizado
+    """
+    figure = new_figure(width_px, height_px, dpi)
+    try:
+        ax = figure.add_subplot(111)
+
+        # Gráfico de barras simple
+        ax.bar(NEC_CHART_LABELS, NEC_CHART_RANGES, color=NEC_CHART_COLORS, alpha=0.7, width=0.6)
+
+        # Línea de resistencia actual
+        ax.axhline(y=resistance, color='black', linestyle='--', linewidth=3,
+                   label=f'Predicción: {resistance:.1f} kg/cm²')
+
+        # Configuración básica
+        ax.set_ylabel('Resistencia (kg/cm²)', fontsize=12)
+        ax.set_title('Clasificación NEC Ecuador', fontsize=14, pad=20)
+        ax.set_ylim(0, 700)
+        ax.legend()
+        ax.grid(True, alpha=0.3)
+
+        # Layout simple sin tight_layout que puede causar errores
+        figure.subplots_adjust(left=0.1, right=0.95, top=0.9, bottom=0.15)
+        return figure_to_qimage(figure)
+
+    except Exception as e:
+        logger.error(f"Error en graficos - se muestra solo el valor: {e}")
+        figure.clear()
+        ax = figure.add_subplot(111)
+        ax.text(0.5, 0.5, f'Resistencia: {resistance:.2f} kg/cm²',
+                ha='center', va='center', fontsize=16, transform=ax.transAxes)
+        ax.set_title('Resultado de Predicción')
+        ax.axis('off')
+        return figure_to_qimage(figure)
+
+
+def render_sweep_chart(sweep: Dict[str, Any], base_inputs: Dict[str, float],
+                       labels: Dict[str, str], width_px: int = 1000,
+                       height_px: int = 600, dpi: int = 100) -> QImage:
+    """
+    Curva de respuesta (1-D) o mapa de calor (2-D) de un barrido.
+
+    Args:
+        sweep: Resultado de ConcreteModelHandler.sweep
+        base_inputs: Mezcla base, marcada sobre el gráfico
+        labels: Nombre amigable de cada variable
+        width_px: Ancho de la imagen
+        height_px: Alto de la imagen
+        dpi: Resolución de la figura
+
+    Returns:
+        QImage: Gráfico rasterizado
+    """
+    figure = new_figure(width_px, height_px, dpi)
+    ax = figure.add_subplot(111)
+    x_feature, y_feature = sweep['x_variable'], sweep['y_variable']
+    x, strength = sweep['x'], sweep['resistencia_kg_cm2']
+
+    if y_feature is None:
+        # Bandas NEC de fondo y curva de resistencia
+        lower = 0
+        for upper, color in zip(NEC_CHART_RANGES, NEC_CHART_COLORS):
+            ax.axhspan(lower, upper, color=color, alpha=0.08)
+            lower = upper
+        ax.plot(x, strength, color='#1e40af', linewidth=2.5)
+        ax.axvline(base_inputs[x_feature], color='black', linestyle='--', linewidth=1.5,
+                   label=f'Mezcla actual: {base_inputs[x_feature]:g}')
+        ax.set_ylabel('Resistencia (kg/cm²)', fontsize=12)
+        ax.set_ylim(0, max(float(np.max(strength)) * 1.1, 300))
+        ax.legend(loc='best')
+        ax.grid(True, alpha=0.3)
+        ax.set_title(f'Resistencia vs {labels[x_feature]}', fontsize=14)
+    else:
+        y = sweep['y']
+        mesh = ax.pcolormesh(x, y, strength, cmap='viridis', shading='auto')
+        figure.colorbar(mesh, ax=ax, label='Resistencia (kg/cm²)')
+        # Límites NEC como curvas de nivel
+        levels = [v for v in NEC_CHART_RANGES[:-1] if strength.min() < v < strength.max()]
+        if levels:
+            contours = ax.contour(x, y, strength, levels=levels, colors='white', linewidths=1.2)
+            ax.clabel(contours, fmt='%d', fontsize=9)
+        ax.plot(base_inputs[x_feature], base_inputs[y_feature], marker='o', markersize=10,
+                markerfacecolor='white', markeredgecolor='black')
+        ax.set_ylabel(labels[y_feature], fontsize=12)
+        ax.set_title(f'Resistencia: {labels[x_feature]} vs {labels[y_feature]}', fontsize=14)
+
+    ax.set_xlabel(labels[x_feature], fontsize=12)
+    figure.subplots_adjust(left=0.1, right=0.95, top=0.9, bottom=0.12)
+    return figure_to_qimage(figure)
+
+
+def render_age_curves(curves: List[Tuple[str, np.ndarray, np.ndarray]],
+                      width_px: int = 1000, height_px: int = 600, dpi: int = 100) -> QImage:
+    """
+    Curvas de desarrollo de resistencia con la edad (varias mezclas superpuestas).
+
+    Args:
+        curves: (etiqueta, edades en días, resistencia) por mezcla; la primera
+            es la mezcla actual y se resalta
+        width_px: Ancho de la imagen
+        height_px: Alto de la imagen
+        dpi: Resolución de la figura
+
+    Returns:
+        QImage: Gráfico rasterizado
+    """
+    figure = new_figure(width_px, height_px, dpi)
+    ax = figure.add_subplot(111)
+
+    lower = 0
+    for upper, color in zip(NEC_CHART_RANGES, NEC_CHART_COLORS):
+        ax.axhspan(lower, upper, color=color, alpha=0.08)
+        lower = upper
+
+    top = 300.0
+    for i, (label, ages, strength) in enumerate(curves):
+        current = i == 0
+        ax.plot(ages, strength, marker='o', linewidth=2.5 if current else 1.2,
+                color='#1e40af' if current else None, alpha=1.0 if current else 0.75,
+                linestyle='-' if current else '--', label=label)
+        top = max(top, float(np.max(strength)))
+
+    ages = curves[0][1] if curves else []
+    ax.set_xscale('log')
+    ax.set_xticks(ages)
+    ax.set_xticklabels([f'{age:g}' for age in ages])
+    ax.set_xlabel('Edad de ensayo (días, escala log)', fontsize=12)
+    ax.set_ylabel('Resistencia (kg/cm²)', fontsize=12)
+    ax.set_ylim(0, top * 1.1)
+    ax.set_title('Desarrollo de Resistencia con la Edad', fontsize=14)
+    ax.grid(True, alpha=0.3)
+    if curves:
+        ax.legend(loc='lower right', fontsize=9)
+    figure.subplots_adjust(left=0.1, right=0.95, top=0.9, bottom=0.12)
+    return figure_to_qimage(figure)
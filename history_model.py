@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Modelo de Historial de Predicciones
+===================================
+
+QAbstractTableModel respaldado por arrays columnares. Agregar una
+predicción solo inserta una fila (amortizado O(1)) y la vista pide datos
+únicamente de las filas visibles, en lugar de recrear un
+QTableWidgetItem por celda en cada predicción.
+
+Sin orden elegido la tabla muestra lo más reciente arriba, igual que las
+páginas del historial guardado: las predicciones nuevas entran en la fila
+0 y las páginas más antiguas se agregan al final.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+# Variables de entrada en el orden en que se guardan
+HISTORY_FEATURES = [
+    'Cemento_kg_m3',
+    'Escoria_Alto_Horno_kg_m3',
+    'Ceniza_Volante_kg_m3',
+    'Agua_kg_m3',
+    'Superplastificante_kg_m3',
+    'Agregado_Grueso_kg_m3',
+    'Agregado_Fino_kg_m3',
+    'Edad_dias'
+]
+
+
+class HistoryTableModel(QAbstractTableModel):
+    """Historial de predicciones en arrays columnares para QTableView."""
+
+    HEADERS = [
+        "Fecha/Hora", "Resistencia (kg/cm²)", "Cemento", "Agua",
+        "Escoria", "Ceniza V.", "Superplast.", "A. Grueso",
+        "A. Fino", "Edad (días)"
+    ]
+
+    # Columna de la tabla -> columna del array de valores (0 = resistencia)
+    _VALUE_COLUMN = {
+        1: 0,
+        2: 1 + HISTORY_FEATURES.index('Cemento_kg_m3'),
+        3: 1 + HISTORY_FEATURES.index('Agua_kg_m3'),
+        4: 1 + HISTORY_FEATURES.index('Escoria_Alto_Horno_kg_m3'),
+        5: 1 + HISTORY_FEATURES.index('Ceniza_Volante_kg_m3'),
+        6: 1 + HISTORY_FEATURES.index('Superplastificante_kg_m3'),
+        7: 1 + HISTORY_FEATURES.index('Agregado_Grueso_kg_m3'),
+        8: 1 + HISTORY_FEATURES.index('Agregado_Fino_kg_m3'),
+        9: 1 + HISTORY_FEATURES.index('Edad_dias')
+    }
+
+    def __init__(self, parent=None, initial_capacity: int = 1024):
+        """
+        Inicializar el modelo vacío.
+
+        Args:
+            parent: QObject padre
+            initial_capacity: Filas reservadas inicialmente (se duplica al llenarse)
+        """
+        super().__init__(parent)
+        self._timestamps: List[str] = []
+        self._values = np.empty((initial_capacity, 1 + len(HISTORY_FEATURES)), dtype=np.float64)
+        self._size = 0
+        # Orden por defecto (más recientes arriba): filas agregadas con append,
+        # mostradas de la última a la primera, seguidas de las páginas de extend
+        self._appended: List[int] = []
+        self._loaded: List[int] = []
+        # Permutación fila visible -> fila almacenada (None = orden por defecto)
+        self._order: Optional[np.ndarray] = None
+        self._sort_column = -1
+        self._sort_order = Qt.SortOrder.AscendingOrder
+
+    def __len__(self) -> int:
+        return self._size
+
+    # --- API de QAbstractTableModel ---
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._size
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section: int, orientation: Qt.Orientation,
+                   role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+
+        row = self._storage_row(index.row())
+        column = index.column()
+        if column == 0:
+            return self._timestamps[row][:19]  # Sin microsegundos
+        value = self._values[row, self._VALUE_COLUMN[column]]
+        if column == 1:
+            return f"{value:.2f}"
+        return str(float(value))
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder):
+        """Ordenar con argsort sobre la columna (sin llamar a data() por fila)."""
+        self.layoutAboutToBeChanged.emit()
+        self._sort_column, self._sort_order = column, order
+        # Columna negativa = sin orden (más recientes arriba)
+        self._order = None if column < 0 else self._sorted_order()
+        self.layoutChanged.emit()
+
+    # --- API del historial ---
+
+    def append(self, timestamp: str, resistance: float, inputs: Dict[str, float]):
+        """
+        Agregar una predicción insertando solo la fila nueva.
+
+        Args:
+            timestamp: Fecha ISO de la predicción
+            resistance: Resistencia predicha en kg/cm²
+            inputs: Valores de la mezcla
+        """
+        if self._size == len(self._values):
+            grown = np.empty((2 * len(self._values), self._values.shape[1]), dtype=np.float64)
+            grown[:self._size] = self._values[:self._size]
+            self._values = grown
+
+        storage_row = self._size
+        view_row = self._insert_position(timestamp, resistance, inputs)
+
+        self.beginInsertRows(QModelIndex(), view_row, view_row)
+        self._timestamps.append(timestamp)
+        self._values[storage_row, 0] = resistance
+        self._values[storage_row, 1:] = [inputs[f] for f in HISTORY_FEATURES]
+        self._size += 1
+        self._appended.append(storage_row)
+        if self._order is not None:
+            self._order = np.insert(self._order, view_row, storage_row)
+        self.endInsertRows()
+
+    def extend(self, timestamps: List[str], values: np.ndarray):
+        """
+        Agregar un bloque de filas más antiguas al final (p. ej. una página del historial guardado).
+
+        Args:
+            timestamps: Fechas ISO de cada fila
+            values: Matriz (n, 1 + variables) con la resistencia en la columna 0
+        """
+        count = len(timestamps)
+        if count == 0:
+            return
+
+        needed = self._size + count
+        if needed > len(self._values):
+            capacity = max(needed, 2 * len(self._values))
+            grown = np.empty((capacity, self._values.shape[1]), dtype=np.float64)
+            grown[:self._size] = self._values[:self._size]
+            self._values = grown
+
+        self.beginInsertRows(QModelIndex(), self._size, needed - 1)
+        self._timestamps.extend(timestamps)
+        self._values[self._size:needed] = values
+        self._size = needed
+        self._loaded.extend(range(needed - count, needed))
+        if self._order is not None:
+            self._order = np.concatenate([self._order, np.arange(needed - count, needed)])
+        self.endInsertRows()
+
+        # Reubicar el bloque según el orden activo
+        if self._order is not None:
+            self.sort(self._sort_column, self._sort_order)
+
+    def clear(self):
+        """Eliminar todas las filas."""
+        self.beginResetModel()
+        self._timestamps = []
+        self._size = 0
+        self._appended, self._loaded = [], []
+        self._order = None if self._sort_column < 0 else np.empty(0, dtype=np.intp)
+        self.endResetModel()
+
+    def record(self, view_row: int) -> Dict[str, Any]:
+        """Fila visible como diccionario (mismo formato que el historial anterior)."""
+        row = self._storage_row(view_row)
+        return {
+            'timestamp': self._timestamps[row],
+            'resistance': float(self._values[row, 0]),
+            **{f: float(v) for f, v in zip(HISTORY_FEATURES, self._values[row, 1:])}
+        }
+
+    def to_columns(self) -> Dict[str, Any]:
+        """Historial completo en orden de inserción, como columnas (para exportar)."""
+        columns = {'timestamp': list(self._timestamps),
+                   'resistance': self._values[:self._size, 0].copy()}
+        for i, feature in enumerate(HISTORY_FEATURES, start=1):
+            columns[feature] = self._values[:self._size, i].copy()
+        return columns
+
+    # --- Auxiliares ---
+
+    def _storage_row(self, view_row: int) -> int:
+        if self._order is not None:
+            return int(self._order[view_row])
+        recent = len(self._appended)
+        if view_row < recent:
+            return self._appended[recent - 1 - view_row]
+        return self._loaded[view_row - recent]
+
+    def _sort_keys(self) -> np.ndarray:
+        if self._sort_column == 0:
+            return np.array(self._timestamps[:self._size])
+        return self._values[:self._size, self._VALUE_COLUMN[self._sort_column]]
+
+    def _sorted_order(self) -> np.ndarray:
+        order = np.argsort(self._sort_keys(), kind='stable')
+        if self._sort_order == Qt.SortOrder.DescendingOrder:
+            order = order[::-1].copy()
+        return order
+
+    def _insert_position(self, timestamp: str, resistance: float,
+                         inputs: Dict[str, float]) -> int:
+        """Fila visible donde cae una nueva entrada según el orden activo."""
+        if self._order is None:
+            return 0
+
+        if self._sort_column == 0:
+            # Las marcas de tiempo crecen con cada inserción
+            ascending = self._sort_order == Qt.SortOrder.AscendingOrder
+            return self._size if ascending else 0
+        if self._sort_column == 1:
+            key = resistance
+        else:
+            key = inputs[HISTORY_FEATURES[self._VALUE_COLUMN[self._sort_column] - 1]]
+
+        keys = self._sort_keys()[self._order]
+        if self._sort_order == Qt.SortOrder.DescendingOrder:
+            # Claves descendentes: buscar sobre la secuencia invertida
+            return int(self._size - np.searchsorted(keys[::-1], key, side='left'))
+        return int(np.searchsorted(keys, key, side='right'))
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Almacén Persistente del Historial de Predicciones
+=================================================
+
+Guarda cada predicción en una tabla SQLite de solo inserción, con índices
+sobre fecha, clase NEC y resistencia. Las consultas por rango ("mezclas
+sobre 280 kg/cm² del último mes") y la carga por páginas de la pestaña de
+historial leen solo las filas pedidas, sin traer todo el historial a
+memoria.
+"""
+
+import csv
+import logging
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from history_model import HISTORY_FEATURES
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_PATH = "historial_predicciones.db"
+
+# Filas leídas del cursor por iteración en consultas y exportación
+FETCH_SIZE = 1000
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS predicciones (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    resistencia REAL NOT NULL,
+    clasificacion_nec TEXT,
+    {", ".join(f"{feature} REAL NOT NULL" for feature in HISTORY_FEATURES)}
+);
+CREATE INDEX IF NOT EXISTS idx_predicciones_timestamp ON predicciones (timestamp);
+CREATE INDEX IF NOT EXISTS idx_predicciones_clase ON predicciones (clasificacion_nec, timestamp);
+CREATE INDEX IF NOT EXISTS idx_predicciones_resistencia ON predicciones (resistencia);
+"""
+
+_COLUMNS = ['timestamp', 'resistencia', 'clasificacion_nec'] + HISTORY_FEATURES
+
+
+class HistoryStore:
+    """Historial de predicciones en SQLite con consultas indexadas."""
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_HISTORY_PATH):
+        """
+        Abrir (o crear) el almacén.
+
+        Args:
+            path: Archivo SQLite; ":memory:" para un historial temporal
+        """
+        self.path = str(path)
+        self._conn = sqlite3.connect(self.path)
+        if self.path != ":memory:":
+            # WAL: las inserciones no bloquean lecturas y el commit es barato
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        logger.info(f"Historial persistente abierto: {self.path} ({self.count()} predicciones)")
+
+    def close(self):
+        """Cerrar la conexión."""
+        self._conn.close()
+
+    # --- Escritura ---
+
+    def append(self, inputs: Dict[str, float], result: Dict[str, Any]):
+        """
+        Registrar una predicción.
+
+        Args:
+            inputs: Valores de la mezcla
+            result: Resultado de predict_strength
+        """
+        row = [result['timestamp'], float(result['resistencia_predicha_kg_cm2']),
+               result.get('clasificacion_nec')]
+        row.extend(float(inputs[feature]) for feature in HISTORY_FEATURES)
+        with self._conn:
+            self._conn.execute(
+                f"INSERT INTO predicciones ({', '.join(_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(_COLUMNS))})", row)
+
+    def clear(self):
+        """Eliminar todas las predicciones guardadas."""
+        with self._conn:
+            self._conn.execute("DELETE FROM predicciones")
+
+    # --- Lectura ---
+
+    def count(self, **filters) -> int:
+        """Número de predicciones que cumplen los filtros (ver query)."""
+        where, params = self._where(**filters)
+        return self._conn.execute(f"SELECT COUNT(*) FROM predicciones{where}", params).fetchone()[0]
+
+    def page(self, offset: int = 0, limit: int = 500) -> Tuple[List[str], np.ndarray]:
+        """
+        Página del historial, de la más reciente a la más antigua.
+
+        Args:
+            offset: Predicciones recientes a saltar
+            limit: Máximo de filas de la página
+
+        Returns:
+            Tuple[List[str], np.ndarray]: (fechas, matriz (n, 1 + variables)
+            con la resistencia en la primera columna), como HistoryTableModel
+        """
+        rows = self._conn.execute(
+            f"SELECT timestamp, resistencia, {', '.join(HISTORY_FEATURES)} FROM predicciones "
+            "ORDER BY timestamp DESC, id DESC LIMIT ? OFFSET ?", (limit, offset)).fetchall()
+        timestamps = [row[0] for row in rows]
+        values = np.array([row[1:] for row in rows], dtype=np.float64)
+        return timestamps, values.reshape(len(rows), 1 + len(HISTORY_FEATURES))
+
+    def query(self, min_resistance: Optional[float] = None,
+              max_resistance: Optional[float] = None,
+              since: Optional[Union[str, datetime]] = None,
+              until: Optional[Union[str, datetime]] = None,
+              nec_class: Optional[str] = None,
+              limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Recorrer las predicciones que cumplen los filtros, más recientes primero.
+
+        Los filtros se resuelven con los índices y las filas se leen del
+        cursor por bloques, por lo que el resultado puede ser arbitrariamente
+        grande.
+
+        Args:
+            min_resistance: Resistencia mínima en kg/cm² (inclusive)
+            max_resistance: Resistencia máxima en kg/cm² (inclusive)
+            since: Fecha inicial (inclusive)
+            until: Fecha final (exclusive)
+            nec_class: Clase NEC exacta (p. ej. "Alta Resistencia")
+            limit: Máximo de filas
+
+        Yields:
+            Dict: Predicción con las claves de la tabla
+        """
+        where, params = self._where(min_resistance, max_resistance, since, until, nec_class)
+        sql = f"SELECT {', '.join(_COLUMNS)} FROM predicciones{where} ORDER BY timestamp DESC, id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+
+        cursor = self._conn.execute(sql, params)
+        try:
+            while True:
+                rows = cursor.fetchmany(FETCH_SIZE)
+                if not rows:
+                    return
+                for row in rows:
+                    yield dict(zip(_COLUMNS, row))
+        finally:
+            cursor.close()
+
+    def export_csv(self, filename: Union[str, Path], **filters) -> int:
+        """
+        Escribir el historial (o una consulta) a CSV fila a fila.
+
+        Returns:
+            int: Filas escritas
+        """
+        written = 0
+        with open(filename, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(_COLUMNS)
+            for record in self.query(**filters):
+                writer.writerow([record[column] for column in _COLUMNS])
+                written += 1
+        logger.info(f"Historial exportado a {filename} ({written} filas)")
+        return written
+
+    # --- Auxiliares ---
+
+    @staticmethod
+    def _where(min_resistance: Optional[float] = None,
+               max_resistance: Optional[float] = None,
+               since: Optional[Union[str, datetime]] = None,
+               until: Optional[Union[str, datetime]] = None,
+               nec_class: Optional[str] = None) -> Tuple[str, List[Any]]:
+        clauses, params = [], []
+        if min_resistance is not None:
+            clauses.append("resistencia >= ?")
+            params.append(float(min_resistance))
+        if max_resistance is not None:
+            clauses.append("resistencia <= ?")
+            params.append(float(max_resistance))
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since.isoformat() if isinstance(since, datetime) else since)
+        if until is not None:
+            clauses.append("timestamp < ?")
+            params.append(until.isoformat() if isinstance(until, datetime) else until)
+        if nec_class is not None:
+            clauses.append("clasificacion_nec = ?")
+            params.append(nec_class)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
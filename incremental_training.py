@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Reentrenamiento Incremental con Nuevos Ensayos
+==============================================
+
+Agrega los resultados de cilindros nuevos al almacén de entrenamiento y
+actualiza el bosque sin reentrenar los 100 árboles: con warm_start se
+entrenan solo árboles nuevos sobre todos los datos y, opcionalmente, se
+retiran antes los más antiguos o los que peor predicen los ensayos nuevos,
+manteniendo el tamaño del bosque.
+
+Cada árbol registra cuántas filas del almacén existían cuando se entrenó
+("filas_vistas"); como el almacén es de solo inserción, son las primeras
+filas por id. Con eso y la semilla de cada árbol se reconstruye su muestra
+bootstrap y se calcula un OOB honesto: una fila es out-of-bag para un árbol
+si no estuvo en su muestra, incluidas las filas posteriores a su
+entrenamiento. Las métricas OOB y el linaje de los árboles se guardan en
+modelo_metadata.json.
+
+Uso:
+    python main.py retrain nuevos_ensayos.csv --new-trees 20
+    python main.py retrain nuevos_ensayos.csv --new-trees 20 --replace worst
+"""
+
+import argparse
+import json
+import logging
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from training_pipeline import RANDOM_STATE, TARGET_COLUMN, next_version, save_trained_model
+from training_store import DEFAULT_TRAINING_STORE_PATH, TrainingStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_NEW_TREES = 20
+REPLACE_MODES = ('oldest', 'worst')
+
+
+# --- Linaje de los árboles ---
+
+def encode_lineage(rows_seen: List[int]) -> List[Dict[str, int]]:
+    """Comprimir filas vistas por árbol en tramos [{arboles, filas_vistas}, ...]."""
+    runs: List[Dict[str, int]] = []
+    for seen in rows_seen:
+        if runs and runs[-1]['filas_vistas'] == seen:
+            runs[-1]['arboles'] += 1
+        else:
+            runs.append({'arboles': 1, 'filas_vistas': int(seen)})
+    return runs
+
+
+def decode_lineage(runs: List[Dict[str, int]]) -> List[int]:
+    """Inversa de encode_lineage: filas vistas por cada árbol, en orden."""
+    return [run['filas_vistas'] for run in runs for _ in range(run['arboles'])]
+
+
+def tree_training_rows(model, tree, rows_seen: int) -> np.ndarray:
+    """
+    Índices (con repetición) con que se entrenó un árbol del bosque.
+
+    Reproduce el muestreo bootstrap sin pesos de sklearn (randint con la
+    semilla del árbol) para el número de filas que existían al entrenarlo.
+    """
+    if not model.bootstrap:
+        return np.arange(rows_seen)
+    max_samples = model.max_samples
+    if max_samples is None:
+        n_bootstrap = rows_seen
+    elif isinstance(max_samples, (int, np.integer)):
+        n_bootstrap = int(max_samples)
+    else:
+        n_bootstrap = max(int(max_samples * rows_seen), 1)
+    return np.random.RandomState(tree.random_state).randint(0, rows_seen, n_bootstrap)
+
+
+def oob_metrics(model, rows_seen: List[int], X: np.ndarray, y: np.ndarray) -> Dict[str, Any]:
+    """
+    R² y MAE out-of-bag usando lo que realmente vio cada árbol.
+
+    Args:
+        model: RandomForestRegressor
+        rows_seen: Filas vistas por cada árbol (mismo orden que estimators_)
+        X: Todos los ensayos del almacén
+        y: Resistencias medidas
+
+    Returns:
+        Dict: oob_score, oob_mae_kg_cm2 y filas_sin_oob (filas que todos los árboles vieron)
+    """
+    from sklearn.metrics import mean_absolute_error, r2_score
+
+    totals = np.zeros(len(y))
+    counts = np.zeros(len(y))
+    for tree, seen in zip(model.estimators_, rows_seen):
+        oob = np.ones(len(y), dtype=bool)
+        oob[tree_training_rows(model, tree, seen)] = False
+        if oob.any():
+            totals[oob] += tree.predict(X[oob])
+            counts[oob] += 1
+
+    covered = counts > 0
+    predicted = totals[covered] / counts[covered]
+    return {
+        'oob_score': float(r2_score(y[covered], predicted)),
+        'oob_mae_kg_cm2': float(mean_absolute_error(y[covered], predicted)),
+        'filas_sin_oob': int((~covered).sum())
+    }
+
+
+def _trees_to_replace(model, rows_seen: List[int], mode: str, count: int,
+                      X_new: np.ndarray, y_new: np.ndarray) -> List[int]:
+    """Posiciones de los árboles a retirar: los más antiguos o los de mayor error en los ensayos nuevos."""
+    count = min(count, len(model.estimators_) - 1)
+    if mode == 'worst' and len(y_new):
+        errors = [np.abs(tree.predict(X_new) - y_new).mean() for tree in model.estimators_]
+        return sorted(np.argsort(errors)[::-1][:count].tolist())
+    # Más antiguos: menos filas vistas; a igualdad, los primeros del bosque
+    return sorted(sorted(range(len(rows_seen)), key=lambda i: (rows_seen[i], i))[:count])
+
+
+# --- Entrada de ensayos nuevos ---
+
+def read_lab_results(path: Union[str, Path], feature_names: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Leer ensayos nuevos (CSV/Excel con las columnas del modelo o del dataset UCI).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (X, y en kg/cm²)
+    """
+    import pandas as pd
+    from batch_scoring import iter_input_chunks
+
+    X_parts, y_parts = [], []
+    for chunk in iter_input_chunks(path):
+        missing = [c for c in feature_names + [TARGET_COLUMN] if c not in chunk.columns]
+        if missing:
+            raise ValueError(f"Faltan las columnas: {', '.join(missing)}")
+        values = chunk[feature_names + [TARGET_COLUMN]].apply(pd.to_numeric, errors='coerce')
+        values = values.to_numpy(dtype=np.float64)
+        valid = np.isfinite(values).all(axis=1)
+        if not valid.all():
+            logger.warning(f"{int((~valid).sum())} ensayos incompletos descartados de {path}")
+        X_parts.append(values[valid, :-1])
+        y_parts.append(values[valid, -1])
+
+    if not X_parts:
+        return np.empty((0, len(feature_names))), np.empty(0)
+    return np.vstack(X_parts), np.concatenate(y_parts)
+
+
+# --- Reentrenamiento ---
+
+def retrain_incremental(new_data: Optional[Union[str, Path]] = None,
+                        model_path: Union[str, Path] = "modelo_hormigon_ecuador_v1.pkl",
+                        metadata_path: Union[str, Path] = "modelo_metadata.json",
+                        store: Optional[TrainingStore] = None,
+                        new_trees: int = DEFAULT_NEW_TREES,
+                        replace: Optional[str] = None,
+                        write_artifact: bool = True) -> Dict[str, Any]:
+    """
+    Agregar ensayos al almacén y crecer (o renovar) el bosque con warm_start.
+
+    Args:
+        new_data: CSV/Excel con los ensayos nuevos (None = solo reentrenar)
+        model_path: Modelo .pkl a actualizar
+        metadata_path: Metadata a actualizar
+        store: Almacén de entrenamiento (por defecto datos_entrenamiento.db)
+        new_trees: Árboles nuevos a entrenar
+        replace: None para crecer el bosque; 'oldest' o 'worst' para retirar
+            antes new_trees árboles y mantener su tamaño
+        write_artifact: Regenerar el artefacto .forest
+
+    Returns:
+        Dict: Metadata escrita
+    """
+    import joblib
+    from sklearn.metrics import mean_absolute_error, r2_score
+
+    if new_trees < 1:
+        raise ValueError("new_trees debe ser al menos 1")
+    if replace is not None and replace not in REPLACE_MODES:
+        raise ValueError(f"replace debe ser uno de {REPLACE_MODES}")
+
+    metadata_path = Path(metadata_path)
+    with open(metadata_path, 'r', encoding='utf-8') as f:
+        metadata = json.load(f)
+    feature_names = metadata['modelo_info']['variables_entrada']
+    history = metadata.get('entrenamiento_incremental', {})
+
+    own_store = store is None
+    if own_store:
+        store = TrainingStore(DEFAULT_TRAINING_STORE_PATH)
+    try:
+        rows_before = store.count()
+        added = 0
+        if new_data is not None:
+            X_new, y_new = read_lab_results(new_data, feature_names)
+            added = store.append(X_new, y_new, Path(new_data).name)
+        X, y = store.arrays()
+    finally:
+        if own_store:
+            store.close()
+    logger.info(f"{added} ensayos nuevos; almacen con {len(y)} filas")
+
+    model = joblib.load(model_path)
+    # Sin linaje previo, el bosque se entrenó con las filas declaradas en la metadata
+    rows_seen = (decode_lineage(history['linaje_arboles']) if 'linaje_arboles' in history
+                 else [metadata['datos_entrenamiento']['num_muestras']] * len(model.estimators_))
+
+    removed: List[int] = []
+    if replace is not None:
+        removed = _trees_to_replace(model, rows_seen, replace, new_trees,
+                                    X[rows_before:], y[rows_before:])
+        keep = [i for i in range(len(model.estimators_)) if i not in set(removed)]
+        model.estimators_ = [model.estimators_[i] for i in keep]
+        rows_seen = [rows_seen[i] for i in keep]
+
+    # Semilla nueva por ronda: sklearn repetiría las semillas de árboles retirados
+    updates = history.get('actualizaciones', [])
+    model.set_params(warm_start=True, oob_score=False, n_jobs=-1,
+                     n_estimators=len(model.estimators_) + new_trees,
+                     random_state=RANDOM_STATE + len(updates) + 1)
+    model.fit(X, y)
+    model.set_params(warm_start=False)
+    rows_seen += [len(y)] * new_trees
+
+    oob = oob_metrics(model, rows_seen, X, y)
+    predicted = model.predict(X)
+    logger.info(f"Bosque actualizado: {len(model.estimators_)} arboles, "
+                f"OOB R2 {oob['oob_score']:.4f}, MAE {oob['oob_mae_kg_cm2']:.2f} kg/cm²")
+
+    updates.append({
+        'fecha': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'origen': Path(new_data).name if new_data is not None else None,
+        'filas_nuevas': added,
+        'arboles_nuevos': new_trees,
+        'arboles_retirados': len(removed),
+        'modo': replace or 'crecer',
+        'oob_score': oob['oob_score'],
+        'oob_mae_kg_cm2': oob['oob_mae_kg_cm2']
+    })
+    metadata['modelo_info']['version'] = next_version(metadata_path)
+    metadata['modelo_info']['fecha_entrenamiento'] = updates[-1]['fecha']
+    metadata['metricas'].update({
+        'r2_score': float(r2_score(y, predicted)),
+        'mae_kg_cm2': float(mean_absolute_error(y, predicted)),
+        'oob_score': oob['oob_score'],
+        'oob_mae_kg_cm2': oob['oob_mae_kg_cm2']
+    })
+    metadata['datos_entrenamiento']['num_muestras'] = int(len(y))
+    if 'hiperparametros' in metadata:
+        metadata['hiperparametros']['n_estimators'] = len(model.estimators_)
+    metadata['entrenamiento_incremental'] = {
+        'linaje_arboles': encode_lineage(rows_seen),
+        'actualizaciones': updates
+    }
+
+    save_trained_model(model, metadata, model_path, metadata_path, write_artifact)
+    return metadata
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    """Argumentos del modo de reentrenamiento incremental."""
+    parser = argparse.ArgumentParser(
+        prog="main.py retrain",
+        description="Agregar ensayos nuevos y actualizar el bosque sin reentrenarlo completo")
+    parser.add_argument('input', nargs='?', help="CSV/Excel con los ensayos nuevos")
+    parser.add_argument('--new-trees', type=int, default=DEFAULT_NEW_TREES,
+                        help=f"Árboles nuevos (por defecto {DEFAULT_NEW_TREES})")
+    parser.add_argument('--replace', choices=REPLACE_MODES, default=None,
+                        help="Retirar igual número de árboles: los más antiguos o los de mayor "
+                             "error en los ensayos nuevos (por defecto el bosque crece)")
+    parser.add_argument('--store', default=DEFAULT_TRAINING_STORE_PATH,
+                        help="Almacén de entrenamiento SQLite")
+    parser.add_argument('--model', default="modelo_hormigon_ecuador_v1.pkl", help="Modelo .pkl")
+    parser.add_argument('--metadata', default="modelo_metadata.json", help="Metadata del modelo")
+    parser.add_argument('--no-artifact', action='store_true',
+                        help="No regenerar el artefacto .forest")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada de `python main.py retrain`."""
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    if args.input and not Path(args.input).is_file():
+        print(f"ERROR: No se encontro el archivo de ensayos '{args.input}'")
+        return 1
+
+    store = TrainingStore(args.store)
+    try:
+        metadata = retrain_incremental(args.input, args.model, args.metadata, store,
+                                       args.new_trees, args.replace,
+                                       write_artifact=not args.no_artifact)
+    except Exception as e:
+        logger.error(f"Error en reentrenamiento incremental: {e}")
+        print(f"ERROR: {e}")
+        return 1
+    finally:
+        store.close()
+
+    update = metadata['entrenamiento_incremental']['actualizaciones'][-1]
+    trees = sum(run['arboles'] for run in metadata['entrenamiento_incremental']['linaje_arboles'])
+    print(f"=> Modelo v{metadata['modelo_info']['version']}: {update['filas_nuevas']} ensayos nuevos, "
+          f"{update['arboles_nuevos']} arboles nuevos, {update['arboles_retirados']} retirados "
+          f"({trees} en total)")
+    print(f"   OOB R2 {update['oob_score']:.4f}   OOB MAE {update['oob_mae_kg_cm2']:.2f} kg/cm²   "
+          f"({metadata['datos_entrenamiento']['num_muestras']} ensayos)")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+    sys.exit(main())
@@ -11,17 +11,21 @@ Versión: 1.0
 Fecha: 2025-09-04
 """
 
+import time
+_STARTUP_T0 = time.perf_counter()
+
 import sys
 import os
+import argparse
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 
 from PyQt6.QtWidgets import QApplication, QMainWindow, QSplashScreen
 from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QPixmap, QFont, QPalette, QColor
 
-from predictor_gui import ConcreteStrengthPredictor
+from model_artifact import default_artifact_path
 
 # Configurar logging
 logging.basicConfig(
@@ -36,13 +40,47 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+class StartupProfiler:
+    """Mide la duración de cada fase del arranque (--profile-startup)."""
+    
+    def __init__(self, enabled: bool = False):
+        """
+        Inicializar el perfilador.
+        
+        Args:
+            enabled: Si False, mark() y report() no hacen nada
+        """
+        self.enabled = enabled
+        self.phases: List[Tuple[str, float]] = []
+        self._last = _STARTUP_T0
+    
+    def mark(self, phase: str):
+        """Registrar el fin de una fase (tiempo desde la marca anterior)."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+    
+    def report(self):
+        """Imprimir el desglose de tiempos por fase."""
+        if not self.enabled:
+            return
+        total = sum(duration for _, duration in self.phases)
+        print("\n=== PERFIL DE ARRANQUE ===")
+        for phase, duration in self.phases:
+            print(f"  {phase:<40} {duration * 1000:8.1f} ms  {duration / total * 100:5.1f}%")
+        print(f"  {'TOTAL':<40} {total * 1000:8.1f} ms")
+
+
 class Application:
     """Clase principal para manejar la aplicación."""
     
-    def __init__(self):
+    def __init__(self, profiler: Optional[StartupProfiler] = None):
         """Inicializar la aplicación."""
         self.app = None
         self.main_window = None
+        self.profiler = profiler or StartupProfiler()
         self._setup_application()
     
     def _setup_application(self):
@@ -63,6 +101,7 @@ class Application:
         # Aplicar tema personalizado
         self._apply_custom_theme()
         
+        self.profiler.mark("QApplication y tema")
         logger.info("Aplicación PyQt6 inicializada correctamente")
     
     def _apply_custom_theme(self):
@@ -90,13 +129,19 @@ class Application:
     def run(self) -> int:
         """Ejecutar la aplicación principal."""
         try:
-            # Crear ventana principal
-            self.main_window = ConcreteStrengthPredictor()
+            from prediction_worker import PredictionWorker
             
-            # Mostrar ventana
-            self.main_window.show()
+            # Splash primero: se ve antes de cargar el modelo y construir la ventana
+            self.splash = self._create_splash()
+            self.splash.show()
+            self.app.processEvents()
+            self.profiler.mark("splash visible")
             
-            logger.info("Ventana principal mostrada")
+            # El modelo se carga en segundo plano; el event loop mantiene vivo el splash
+            self.model_loader = PredictionWorker(None)
+            self.model_loader.resultReady.connect(self._on_model_loaded)
+            self.model_loader.predictionFailed.connect(self._on_model_failed)
+            self.model_loader.submit_job(0, _load_model_handler)
             
             # Ejecutar aplicación
             return self.app.exec()
@@ -104,15 +149,121 @@ class Application:
         except Exception as e:
             logger.error(f"Error ejecutando aplicación: {e}")
             return 1
+    
+    def _create_splash(self) -> QSplashScreen:
+        """Splash liviano (sin imágenes externas) con el nombre de la aplicación."""
+        pixmap = QPixmap(420, 160)
+        pixmap.fill(QColor(37, 99, 235))
+        splash = QSplashScreen(pixmap)
+        splash.setFont(QFont("Segoe UI", 12))
+        splash.showMessage("Predictor de Resistencia de Hormigón\n\nCargando modelo...",
+                           Qt.AlignmentFlag.AlignCenter, QColor(255, 255, 255))
+        return splash
+    
+    def _on_model_loaded(self, request_id: int, model_handler):
+        """Con el modelo listo, construir y mostrar la ventana principal."""
+        self.profiler.mark("carga del modelo (segundo plano)")
+        self.model_loader.stop()
+        try:
+            # Importar la GUI aquí para poder medir su costo
+            from predictor_gui import ConcreteStrengthPredictor
+            self.profiler.mark("import predictor_gui")
+            
+            # Crear ventana principal
+            self.main_window = ConcreteStrengthPredictor(model_handler)
+            self.profiler.mark("construcción de la ventana")
+            
+            # Mostrar ventana
+            self.main_window.show()
+            self.splash.finish(self.main_window)
+            self.profiler.mark("show()")
+        except Exception as e:
+            logger.error(f"Error creando la ventana principal: {e}")
+            self.app.exit(1)
+            return
+        
+        logger.info("Ventana principal mostrada")
+        
+        # El primer ciclo del event loop marca la ventana ya pintada
+        QTimer.singleShot(0, self._on_first_event_loop)
+    
+    def _on_model_failed(self, request_id: int, error_msg: str):
+        """Cerrar el splash y terminar si el modelo no se pudo cargar."""
+        self.model_loader.stop()
+        logger.error(f"Error cargando el modelo: {error_msg}")
+        self.splash.close()
+        self.app.exit(1)
+    
+    def _on_first_event_loop(self):
+        """Cerrar el perfil de arranque al procesar el primer ciclo de eventos."""
+        self.profiler.mark("primer ciclo de eventos")
+        self.profiler.report()
+
+
+def _load_model_handler():
+    """Cargar el modelo (se ejecuta en el hilo de carga, no toca widgets)."""
+    from model_handler_fixed import ConcreteModelHandler
+    return ConcreteModelHandler()
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    """Interpretar argumentos propios; los demás se pasan a Qt."""
+    parser = argparse.ArgumentParser(description="Predictor de Resistencia de Hormigón")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="Imprimir el tiempo de cada fase del arranque")
+    parser.add_argument('--timing', action='store_true',
+                        help="Medir los tramos de tiempo de la predicción y de la interfaz")
+    parser.add_argument('--timing-dump', metavar='ARCHIVO',
+                        help="Guardar los tiempos medidos en JSON al cerrar (implica --timing)")
+    args, _ = parser.parse_known_args(argv)
+    return args
 
 
 def main():
     """Función principal de entrada."""
+    # Modo sin GUI: python main.py score entrada.csv -o salida.csv
+    if len(sys.argv) > 1 and sys.argv[1] == 'score':
+        import batch_scoring
+        return batch_scoring.main(sys.argv[2:])
+    
+    # Servicio HTTP/JSON: python main.py serve --port 8765 --workers 4
+    if len(sys.argv) > 1 and sys.argv[1] == 'serve':
+        import prediction_server
+        return prediction_server.main(sys.argv[2:])
+    
+    # Diseño inverso: python main.py optimize --target 280 --age 28
+    if len(sys.argv) > 1 and sys.argv[1] == 'optimize':
+        import mix_optimizer
+        return mix_optimizer.main(sys.argv[2:])
+    
+    # Reentrenamiento: python main.py train --workers 4
+    if len(sys.argv) > 1 and sys.argv[1] == 'train':
+        import training_pipeline
+        return training_pipeline.main(sys.argv[2:])
+    
+    # Reentrenamiento incremental: python main.py retrain nuevos.csv --new-trees 20
+    if len(sys.argv) > 1 and sys.argv[1] == 'retrain':
+        import incremental_training
+        return incremental_training.main(sys.argv[2:])
+    
+    # Benchmarks con línea base: python main.py bench --save-baseline
+    if len(sys.argv) > 1 and sys.argv[1] == 'bench':
+        import benchmarks
+        return benchmarks.main(sys.argv[2:])
+    
+    args = parse_args(sys.argv[1:])
+    profiler = StartupProfiler(enabled=args.profile_startup)
+    profiler.mark("importaciones base (PyQt6, logging)")
+    
+    if args.timing or args.timing_dump:
+        from timing_spans import TIMING
+        TIMING.enabled = True
+    
     # Verificar archivos requeridos
     model_path = Path("modelo_hormigon_ecuador_v1.pkl")
     metadata_path = Path("modelo_metadata.json")
     
-    if not model_path.exists():
+    if not model_path.exists() and not default_artifact_path(model_path).is_dir():
         print("ERROR: No se encontro el archivo del modelo 'modelo_hormigon_ecuador_v1.pkl'")
         print("   Asegurate de estar ejecutando desde el directorio correcto.")
         return 1
@@ -126,8 +277,14 @@ def main():
     print("=> Iniciando Predictor de Resistencia de Hormigon...")
     
     # Crear y ejecutar aplicación
-    app = Application()
-    return app.run()
+    app = Application(profiler)
+    exit_code = app.run()
+    
+    if args.timing_dump:
+        from timing_spans import TIMING
+        TIMING.dump_json(args.timing_dump)
+        print(f"=> Tiempos guardados en {args.timing_dump}")
+    return exit_code
 
 
 if __name__ == "__main__":
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Micro-lotes Asíncronos para el Servicio de Predicción
+=====================================================
+
+Una predicción individual gasta casi todo su tiempo en el costo fijo de
+llamar al modelo. MicroBatcher acumula las solicitudes concurrentes
+durante unos milisegundos (o hasta N filas), llama al modelo una sola vez
+con la matriz apilada y devuelve a cada llamador su fila.
+
+serve_async() expone el mismo contrato HTTP que prediction_server, pero
+con un bucle asyncio: /predict pasa por el micro-lote (y responde con los
+mismos campos que predict_strength) y /stats agrega las métricas de
+tamaño de lote.
+
+Uso:
+    python main.py serve --async --max-wait-ms 2 --max-batch 64
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import Counter
+from datetime import datetime
+from functools import partial
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from prediction_server import LatencyStats, MAX_BODY_BYTES, to_jsonable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WAIT_MS = 2.0
+DEFAULT_MAX_BATCH = 64
+
+
+class MicroBatcher:
+    """Agrupa predicciones concurrentes en una sola llamada al modelo."""
+
+    def __init__(self, predict_fn: Callable[[np.ndarray], Dict[str, np.ndarray]],
+                 max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+                 max_batch: int = DEFAULT_MAX_BATCH):
+        """
+        Inicializar el agrupador.
+
+        Args:
+            predict_fn: Función matriz (n, 8) -> dict de arrays columnares
+                (p. ej. ConcreteModelHandler.predict_batch)
+            max_wait_ms: Espera máxima desde la primera solicitud del lote
+            max_batch: Filas máximas por llamada al modelo
+        """
+        if max_batch < 1:
+            raise ValueError("max_batch debe ser al menos 1")
+        self.predict_fn = predict_fn
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_batch = max_batch
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._batch_sizes: Counter = Counter()
+
+    async def predict(self, row: np.ndarray) -> Dict[str, Any]:
+        """
+        Encolar una fila y esperar su resultado.
+
+        Args:
+            row: Vector de 8 variables en el orden del modelo
+
+        Returns:
+            Dict: Valores de la fila para cada columna de predict_fn
+        """
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((np.asarray(row, dtype=np.float64), future))
+        return await future
+
+    async def close(self):
+        """Detener la tarea de agrupación."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Métricas de los tamaños de lote logrados."""
+        batches = sum(self._batch_sizes.values())
+        rows = sum(size * count for size, count in self._batch_sizes.items())
+        return {
+            'lotes': batches,
+            'filas': rows,
+            'tamano_medio_lote': round(rows / batches, 2) if batches else 0.0,
+            'tamano_maximo_lote': max(self._batch_sizes, default=0),
+            'distribucion_tamanos': {str(size): count
+                                     for size, count in sorted(self._batch_sizes.items())},
+            'espera_maxima_ms': self.max_wait * 1000,
+            'lote_maximo': self.max_batch
+        }
+
+    async def _run(self):
+        """Bucle: esperar la primera fila, juntar más hasta el límite y predecir."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            rows, futures = zip(*batch)
+            self._batch_sizes[len(batch)] += 1
+            try:
+                # El modelo corre en un hilo para no bloquear el bucle de eventos
+                result = await loop.run_in_executor(None, self.predict_fn, np.vstack(rows))
+            except Exception as e:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for i, future in enumerate(futures):
+                if not future.done():
+                    future.set_result({key: values[i] for key, values in result.items()})
+
+
+class AsyncPredictionServer:
+    """Servidor HTTP/1.1 mínimo sobre asyncio con /predict en micro-lotes."""
+
+    def __init__(self, model_handler, max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+                 max_batch: int = DEFAULT_MAX_BATCH):
+        """
+        Inicializar el servidor.
+
+        Args:
+            model_handler: ConcreteModelHandler ya cargado
+            max_wait_ms: Espera máxima del micro-lote
+            max_batch: Filas máximas por micro-lote
+        """
+        self.model_handler = model_handler
+        # Misma información de incertidumbre que predict_strength en /predict
+        self.batcher = MicroBatcher(partial(model_handler.predict_batch, with_uncertainty=True),
+                                    max_wait_ms, max_batch)
+        self.stats = LatencyStats()
+
+    async def predict(self, payload: Any) -> Dict[str, Any]:
+        """Predicción individual agrupada con las demás; misma respuesta que predict_strength."""
+        if not isinstance(payload, dict):
+            raise ValueError("Se esperaba un objeto JSON con las variables de la mezcla")
+        inputs = {name: float(value) for name, value in payload.items()}
+
+        # Como predict_strength: fuera de rango solo se advierte, no se rechaza
+        is_valid, errors = self.model_handler.validate_inputs(inputs)
+        if not is_valid:
+            logger.warning(f"Inputs con advertencias: {', '.join(errors)}")
+
+        # Una variable faltante es KeyError (400) antes de entrar al lote
+        row = np.array([inputs[f] for f in self.model_handler.feature_names])
+        return self._strength_result(await self.batcher.predict(row))
+
+    def _strength_result(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Convertir una fila de predict_batch a los campos de predict_strength."""
+        labels = {label[0]: label for label in self.model_handler.nec_classes()}
+        nec_class, nec_color, nec_description = labels[row['clasificacion_nec']]
+        return {
+            'resistencia_predicha_kg_cm2': float(row['resistencia_predicha_kg_cm2']),
+            'relacion_agua_cemento': float(row['relacion_agua_cemento']),
+            'total_cementicios_kg_m3': float(row['total_cementicios_kg_m3']),
+            'clasificacion_nec': nec_class,
+            'color_clasificacion': nec_color,
+            'descripcion_nec': nec_description,
+            'confianza_prediccion': float(row['confianza_prediccion']),
+            'desviacion_estandar_kg_cm2': float(row['desviacion_estandar_kg_cm2']),
+            'intervalo_inferior_kg_cm2': float(row['intervalo_inferior_kg_cm2']),
+            'intervalo_superior_kg_cm2': float(row['intervalo_superior_kg_cm2']),
+            'edad_ensayo_dias': float(row['edad_ensayo_dias']),
+            'timestamp': datetime.now().isoformat()
+        }
+
+    async def predict_batch(self, payload: Any) -> Dict[str, Any]:
+        """Lote explícito del cliente: una llamada directa al modelo."""
+        mixes = payload.get('mezclas') if isinstance(payload, dict) else payload
+        if not isinstance(mixes, list) or not mixes:
+            raise ValueError("Se esperaba {\"mezclas\": [ {...}, ... ]} con al menos una mezcla")
+        with_uncertainty = isinstance(payload, dict) and bool(payload.get('incertidumbre'))
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, partial(self.model_handler.predict_batch, mixes, with_uncertainty=with_uncertainty))
+
+    async def route(self, method: str, path: str, body: bytes) -> Tuple[int, Dict[str, Any]]:
+        """Resolver una solicitud y devolver (estado, cuerpo JSON)."""
+        if method == 'GET' and path == '/stats':
+            return 200, {**self.stats.snapshot(), 'micro_lotes': self.batcher.stats()}
+        if method == 'GET' and path == '/health':
+            return 200, {'estado': 'ok', 'modelo_sha256': self.model_handler.model_hash}
+
+        routes = {'/predict': self.predict, '/predict/batch': self.predict_batch}
+        if method != 'POST' or path not in routes:
+            return 404, {'error': f"Ruta no encontrada: {path}"}
+
+        start = time.perf_counter()
+        status = 500
+        try:
+            payload = json.loads(body or b'null')
+            status, response = 200, await routes[path](payload)
+        except (ValueError, KeyError, TypeError) as e:
+            status, response = 400, {'error': str(e)}
+        except Exception as e:
+            logger.error(f"Error atendiendo {path}: {e}")
+            response = {'error': str(e)}
+        finally:
+            self.stats.record(0, time.perf_counter() - start, error=status != 200)
+        return status, response
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Atender una conexión (con keep-alive) hasta que el cliente la cierre."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, version = request_line.decode('latin-1').split()
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get('content-length') or 0)
+                if length > MAX_BODY_BYTES:
+                    status, response = 413, {'error': f"Cuerpo demasiado grande ({length} bytes)"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b''
+                    status, response = await self.route(method, path, body)
+                    connection = headers.get('connection', '').lower()
+                    keep_alive = connection == 'keep-alive' or (version == 'HTTP/1.1' and connection != 'close')
+
+                data = json.dumps(to_jsonable(response), ensure_ascii=False).encode('utf-8')
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ValueError, asyncio.IncompleteReadError, ConnectionError) as e:
+            logger.debug(f"Conexion cerrada: {e}")
+        finally:
+            writer.close()
+
+    async def start(self, host: str, port: int) -> asyncio.AbstractServer:
+        """Abrir el socket y empezar a aceptar conexiones."""
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 413: 'Payload Too Large',
+            500: 'Internal Server Error'}
+
+
+def serve_async(host: str, port: int, model_handler,
+                max_wait_ms: float = DEFAULT_MAX_WAIT_MS, max_batch: int = DEFAULT_MAX_BATCH):
+    """
+    Atender solicitudes con el bucle asyncio hasta Ctrl+C.
+
+    Args:
+        host: Interfaz de escucha
+        port: Puerto TCP
+        model_handler: ConcreteModelHandler ya cargado
+        max_wait_ms: Espera máxima del micro-lote
+        max_batch: Filas máximas por micro-lote
+    """
+    async def _main():
+        server = AsyncPredictionServer(model_handler, max_wait_ms, max_batch)
+        listener = await server.start(host, port)
+        logger.info(f"Servicio asincrono en http://{host}:{port} "
+                    f"(micro-lotes de hasta {max_batch} filas / {max_wait_ms} ms)")
+        try:
+            async with listener:
+                await listener.serve_forever()
+        finally:
+            await server.batcher.close()
+
+    try:
+        asyncio.run(_main())
+    except KeyboardInterrupt:
+        logger.info("Servicio asincrono detenido")
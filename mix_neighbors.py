@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Índice de Vecinos sobre los Ensayos de Laboratorio
+==================================================
+
+validate_inputs solo revisa cada variable por separado: una mezcla con
+todas las variables en rango pero en una combinación que nunca se ensayó
+recibe igual una predicción "confiable". Este índice mide qué tan lejos
+está la mezcla de los 1030 ensayos de Concrete_Data.csv.
+
+- Las variables se estandarizan (media 0, desviación 1) y se indexan en un
+  KDTree de sklearn; una consulta tarda décimas de milisegundo y acepta
+  lotes de cualquier tamaño.
+- El umbral de extrapolación es el percentil 99 de la distancia de cada
+  ensayo a su vecino más cercano (sin contarse a sí mismo): una mezcla más
+  lejos que eso de todo ensayo está fuera de la nube de datos.
+- El índice se guarda junto al modelo (`<modelo>.vecinos.npz`, sin pickle)
+  con el hash del CSV; si el CSV cambia se reconstruye. El árbol se
+  rearma al cargar (milisegundos); lo caro, leer el CSV con pandas, no.
+
+Uso:
+    index = load_or_build_index("modelo_hormigon_ecuador_v1.pkl")
+    index.check(mezcla)["extrapolacion"]
+"""
+
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+from model_artifact import file_sha256
+
+logger = logging.getLogger(__name__)
+
+NEIGHBORS_SUFFIX = ".vecinos.npz"
+DEFAULT_DATASET_PATH = "Concrete_Data.csv"
+EXTRAPOLATION_QUANTILE = 0.99
+DEFAULT_NEIGHBORS = 5
+
+
+def default_index_path(model_path: Union[str, Path]) -> Path:
+    """Índice guardado junto al modelo: modelo.pkl -> modelo.vecinos.npz."""
+    model_path = Path(model_path)
+    return model_path.with_name(model_path.stem + NEIGHBORS_SUFFIX)
+
+
+class MixNeighborIndex:
+    """Ensayos de laboratorio estandarizados en un KDTree."""
+
+    def __init__(self, features: np.ndarray, strengths: np.ndarray,
+                 feature_names: List[str], threshold: Optional[float] = None,
+                 source_sha256: Optional[str] = None):
+        """
+        Construir el índice.
+
+        Args:
+            features: Mezclas ensayadas (n, 8) en el orden de feature_names
+            strengths: Resistencia medida de cada mezcla en kg/cm²
+            feature_names: Nombres de las variables
+            threshold: Distancia de extrapolación (por defecto se calcula de los datos)
+            source_sha256: Hash del CSV del que provienen los ensayos
+        """
+        from sklearn.neighbors import KDTree
+
+        self.features = np.asarray(features, dtype=np.float64)
+        self.strengths = np.asarray(strengths, dtype=np.float64)
+        self.feature_names = list(feature_names)
+        self.source_sha256 = source_sha256
+        self.mean = self.features.mean(axis=0)
+        # Una variable constante no aporta distancia (evita dividir por cero)
+        std = self.features.std(axis=0)
+        self.scale = np.where(std > 0, std, 1.0)
+        self._tree = KDTree(self._standardize(self.features))
+        self.threshold = float(threshold) if threshold is not None else self._default_threshold()
+
+    def __len__(self) -> int:
+        return len(self.features)
+
+    def _standardize(self, X: np.ndarray) -> np.ndarray:
+        return (np.asarray(X, dtype=np.float64) - self.mean) / self.scale
+
+    def _default_threshold(self) -> float:
+        """Percentil EXTRAPOLATION_QUANTILE de la distancia de cada ensayo a su vecino."""
+        distances, _ = self._tree.query(self._standardize(self.features), k=2)
+        return float(np.quantile(distances[:, 1], EXTRAPOLATION_QUANTILE))
+
+    @classmethod
+    def from_csv(cls, csv_path: Union[str, Path] = DEFAULT_DATASET_PATH) -> "MixNeighborIndex":
+        """Construir el índice desde el dataset de laboratorio."""
+        from model_handler_fixed import ConcreteModelHandler
+        from training_pipeline import TARGET_COLUMN
+        from utils import load_concrete_dataset
+
+        feature_names = list(ConcreteModelHandler.FEATURE_NAMES)
+        df = load_concrete_dataset(str(csv_path))
+        return cls(df[feature_names].to_numpy(dtype=np.float64),
+                   df[TARGET_COLUMN].to_numpy(dtype=np.float64),
+                   feature_names, source_sha256=file_sha256(csv_path))
+
+    def save(self, path: Union[str, Path]):
+        """Guardar ensayos, umbral y hash del CSV en un .npz (escritura atómica)."""
+        from training_pipeline import write_atomic
+
+        def _dump(tmp_path: Path):
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, features=self.features, strengths=self.strengths,
+                         feature_names=np.array(self.feature_names),
+                         threshold=np.array(self.threshold),
+                         source_sha256=np.array(self.source_sha256 or ""))
+        write_atomic(Path(path), _dump)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "MixNeighborIndex":
+        """Cargar un índice guardado con save()."""
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data['features'], data['strengths'], data['feature_names'].tolist(),
+                       threshold=float(data['threshold']),
+                       source_sha256=str(data['source_sha256']) or None)
+
+    def query(self, X: np.ndarray, k: int = DEFAULT_NEIGHBORS):
+        """
+        Vecinos más cercanos de cada mezcla.
+
+        Args:
+            X: Mezclas (n, 8) en el orden de feature_names
+            k: Vecinos por mezcla
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: distancias estandarizadas e índices de
+            los ensayos, ambos (n, k) y ordenados del más cercano al más lejano
+        """
+        X = np.asarray(X, dtype=np.float64).reshape(-1, len(self.feature_names))
+        return self._tree.query(self._standardize(X), k=min(k, len(self)))
+
+    def check_batch(self, X: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Distancia al ensayo más cercano y alerta de extrapolación de un lote.
+
+        Returns:
+            Dict: 'distancia_vecino' (n,), 'indice_vecino' (n,) y 'extrapolacion' (n,)
+        """
+        distances, indices = self.query(X, k=1)
+        return {
+            'distancia_vecino': distances[:, 0],
+            'indice_vecino': indices[:, 0],
+            'extrapolacion': distances[:, 0] > self.threshold
+        }
+
+    def check(self, inputs: Dict[str, float], k: int = DEFAULT_NEIGHBORS) -> Dict[str, Any]:
+        """
+        Ensayos más parecidos a una mezcla y si la predicción extrapola.
+
+        Args:
+            inputs: Valores de la mezcla
+            k: Ensayos a devolver
+
+        Returns:
+            Dict: 'distancia_vecino', 'umbral', 'extrapolacion' y 'vecinos'
+            (lista de dicts con las variables, 'resistencia_medida_kg_cm2' y 'distancia')
+        """
+        row = np.array([[inputs[feature] for feature in self.feature_names]])
+        distances, indices = self.query(row, k)
+        neighbors = []
+        for distance, index in zip(distances[0], indices[0]):
+            sample = dict(zip(self.feature_names, self.features[index].tolist()))
+            sample['resistencia_medida_kg_cm2'] = round(float(self.strengths[index]), 2)
+            sample['distancia'] = round(float(distance), 3)
+            sample['indice_ensayo'] = int(index)
+            neighbors.append(sample)
+
+        nearest = float(distances[0, 0])
+        return {
+            'distancia_vecino': round(nearest, 3),
+            'umbral': round(self.threshold, 3),
+            'extrapolacion': nearest > self.threshold,
+            'vecinos': neighbors
+        }
+
+
+def load_or_build_index(model_path: Union[str, Path] = "modelo_hormigon_ecuador_v1.pkl",
+                        csv_path: Union[str, Path] = DEFAULT_DATASET_PATH,
+                        index_path: Optional[Union[str, Path]] = None) -> MixNeighborIndex:
+    """
+    Cargar el índice guardado junto al modelo o construirlo (y guardarlo).
+
+    Se reconstruye si no existe, si no se puede leer o si el CSV cambió.
+
+    Args:
+        model_path: Modelo junto al cual vive el índice
+        csv_path: Dataset de laboratorio
+        index_path: Ruta del índice (por defecto <modelo>.vecinos.npz)
+    """
+    index_path = Path(index_path) if index_path else default_index_path(model_path)
+    csv_path = Path(csv_path)
+    current_sha = file_sha256(csv_path) if csv_path.is_file() else None
+
+    if index_path.is_file():
+        try:
+            index = MixNeighborIndex.load(index_path)
+            if current_sha is None or index.source_sha256 == current_sha:
+                logger.info(f"Indice de vecinos cargado: {index_path} ({len(index)} ensayos)")
+                return index
+            logger.info("El dataset cambio desde que se construyo el indice de vecinos")
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning(f"Indice de vecinos ilegible ({e}); se reconstruye")
+
+    if current_sha is None:
+        raise FileNotFoundError(f"No se encontro el dataset '{csv_path}' para el indice de vecinos")
+
+    index = MixNeighborIndex.from_csv(csv_path)
+    try:
+        index.save(index_path)
+        logger.info(f"Indice de vecinos guardado en {index_path} (umbral {index.threshold:.3f})")
+    except OSError as e:
+        logger.warning(f"No se pudo guardar el indice de vecinos: {e}")
+    return index
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Diseño Inverso de Mezclas
+=========================
+
+Busca la mezcla más económica que alcanza una resistencia objetivo (p. ej.
+280 kg/cm² a 28 días) con evolución diferencial dentro de VALID_RANGES.
+Cada generación se evalúa con una sola llamada a predict_batch sobre toda
+la población. Todas las mezclas evaluadas se guardan para devolver además
+el frente de Pareto resistencia vs costo.
+
+El bosque extrapola mal lejos de los ensayos (p. ej. poco cemento con
+mucha agua "predicho" en 285 kg/cm²): la distancia al ensayo más cercano
+de Concrete_Data.csv (MixNeighborIndex) se penaliza como un límite más y
+las mezclas que extrapolan no se devuelven.
+
+Uso:
+    python main.py optimize --target 280 --age 28
+    python main.py optimize --target 350 --fix Escoria_Alto_Horno_kg_m3=0 --cost Cemento_kg_m3=0.20
+"""
+
+import argparse
+import logging
+import sys
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Costo referencial por kg de material (USD/kg); ajustar a los precios de la planta
+DEFAULT_COSTS = {
+    'Cemento_kg_m3': 0.17,
+    'Escoria_Alto_Horno_kg_m3': 0.06,
+    'Ceniza_Volante_kg_m3': 0.04,
+    'Agua_kg_m3': 0.001,
+    'Superplastificante_kg_m3': 2.50,
+    'Agregado_Grueso_kg_m3': 0.020,
+    'Agregado_Fino_kg_m3': 0.018,
+    'Edad_dias': 0.0
+}
+
+# Penalización por kg/cm² faltante respecto al objetivo (domina al costo)
+SHORTFALL_PENALTY = 10.0
+
+# Límites de dosificación observados en Concrete_Data.csv: sin ellos el
+# optimizador explota extrapolaciones del modelo (p. ej. 1700 kg/m³ de mezcla)
+MIX_DESIGN_LIMITS = {
+    'masa_total_kg_m3': (2195.0, 2551.0),
+    'cementantes_kg_m3': (200.0, 640.0),
+    'agua_cementantes': (0.235, 0.90)
+}
+
+
+def mix_cost(X: np.ndarray, feature_names: List[str], costs: Dict[str, float]) -> np.ndarray:
+    """Costo por m³ de cada fila de X (kg de material × costo por kg)."""
+    weights = np.array([costs.get(name, 0.0) for name in feature_names], dtype=np.float64)
+    return X @ weights
+
+
+def design_violation(X: np.ndarray, feature_names: List[str]) -> np.ndarray:
+    """
+    Magnitud con que cada mezcla sale de MIX_DESIGN_LIMITS (0 = factible).
+
+    Las tres medidas se normalizan por el ancho de su rango para sumarlas.
+    """
+    col = {name: i for i, name in enumerate(feature_names)}
+    binder = X[:, col['Cemento_kg_m3']] + X[:, col['Escoria_Alto_Horno_kg_m3']] + \
+        X[:, col['Ceniza_Volante_kg_m3']]
+    measures = {
+        'masa_total_kg_m3': X[:, [i for name, i in col.items() if name != 'Edad_dias']].sum(axis=1),
+        'cementantes_kg_m3': binder,
+        'agua_cementantes': X[:, col['Agua_kg_m3']] / np.maximum(binder, 1e-9)
+    }
+
+    violation = np.zeros(len(X))
+    for name, values in measures.items():
+        low, high = MIX_DESIGN_LIMITS[name]
+        violation += (np.maximum(low - values, 0) + np.maximum(values - high, 0)) / (high - low)
+    return violation
+
+
+def pareto_front(strength: np.ndarray, cost: np.ndarray) -> np.ndarray:
+    """
+    Índices no dominados (mayor resistencia, menor costo), ordenados por costo.
+
+    Args:
+        strength: Resistencia de cada mezcla
+        cost: Costo de cada mezcla
+
+    Returns:
+        np.ndarray: Índices del frente
+    """
+    order = np.lexsort((-strength, cost))
+    best_so_far = np.maximum.accumulate(strength[order])
+    # Una mezcla es no dominada si supera a todas las más baratas
+    improves = np.empty(len(order), dtype=bool)
+    improves[0] = True
+    improves[1:] = strength[order][1:] > best_so_far[:-1]
+    return order[improves]
+
+
+def extrapolation_excess(X: np.ndarray, neighbor_index) -> np.ndarray:
+    """
+    Cuánto supera cada mezcla el umbral de extrapolación (0 = cerca de algún ensayo).
+
+    Se expresa en unidades del umbral para sumarse a design_violation.
+    """
+    if neighbor_index is None:
+        return np.zeros(len(X))
+    distance = neighbor_index.check_batch(X)['distancia_vecino']
+    return np.maximum(distance - neighbor_index.threshold, 0.0) / neighbor_index.threshold
+
+
+def optimize_mix(model_handler, target_strength: float = 280.0,
+                 fixed: Optional[Dict[str, float]] = None,
+                 costs: Optional[Dict[str, float]] = None,
+                 population: int = 60, generations: int = 100,
+                 mutation: float = 0.7, crossover: float = 0.9,
+                 max_pareto_points: int = 25, seed: Optional[int] = None,
+                 neighbor_index=None) -> Dict[str, Any]:
+    """
+    Mezcla de menor costo que alcanza la resistencia objetivo.
+
+    Evolución diferencial (rand/1/bin) sobre las variables libres, acotadas
+    a VALID_RANGES. La aptitud es costo + penalización por resistencia
+    faltante, por salir de MIX_DESIGN_LIMITS y por alejarse de los ensayos
+    de laboratorio más allá del umbral de extrapolación, calculada para
+    toda la población en una sola llamada al modelo. El resultado y el
+    frente solo incluyen mezclas factibles que no extrapolan.
+
+    Args:
+        model_handler: ConcreteModelHandler cargado
+        target_strength: Resistencia mínima buscada en kg/cm²
+        fixed: Variables fijas (por defecto Edad_dias = 28)
+        costs: Costo por kg de cada material (por defecto DEFAULT_COSTS)
+        population: Mezclas por generación
+        generations: Número de generaciones
+        mutation: Factor F de la evolución diferencial
+        crossover: Probabilidad de cruce CR
+        max_pareto_points: Puntos máximos del frente devuelto
+        seed: Semilla para resultados reproducibles
+        neighbor_index: MixNeighborIndex (por defecto el del handler; sin
+            dataset se optimiza sin la restricción de extrapolación)
+
+    Returns:
+        Dict: mejor mezcla, su resistencia, costo y distancia al ensayo más
+        cercano, y el frente de Pareto
+    """
+    if not model_handler.is_loaded:
+        raise RuntimeError("Modelo no cargado correctamente")
+    if population < 4:
+        raise ValueError("La población debe tener al menos 4 mezclas")
+
+    names = model_handler.feature_names
+    fixed = {'Edad_dias': 28} if fixed is None else dict(fixed)
+    costs = dict(DEFAULT_COSTS, **(costs or {}))
+    unknown = [name for name in list(fixed) + list(costs) if name not in names]
+    if unknown:
+        raise ValueError(f"Variables desconocidas: {', '.join(unknown)}")
+
+    free = np.array([i for i, name in enumerate(names) if name not in fixed])
+    if len(free) == 0:
+        raise ValueError("No hay variables libres para optimizar")
+    lower = np.array([model_handler.VALID_RANGES[names[i]][0] for i in free], dtype=np.float64)
+    upper = np.array([model_handler.VALID_RANGES[names[i]][1] for i in free], dtype=np.float64)
+
+    base = np.zeros(len(names))
+    for name, value in fixed.items():
+        base[names.index(name)] = value
+
+    if neighbor_index is None:
+        try:
+            neighbor_index = model_handler.neighbor_index()
+        except (OSError, ValueError) as e:
+            logger.warning(f"Sin indice de vecinos, no se penaliza la extrapolacion: {e}")
+
+    rng = np.random.default_rng(seed)
+    archive_X, archive_strength = [], []
+
+    def evaluate(free_values: np.ndarray):
+        X = np.tile(base, (len(free_values), 1))
+        X[:, free] = free_values
+        strength = model_handler.predict_batch(X)['resistencia_predicha_kg_cm2']
+        cost = mix_cost(X, names, costs)
+        violation = design_violation(X, names) + extrapolation_excess(X, neighbor_index)
+        archive_X.append(X[violation == 0])
+        archive_strength.append(strength[violation == 0])
+        fitness = cost + SHORTFALL_PENALTY * np.maximum(target_strength - strength, 0.0)
+        return fitness + SHORTFALL_PENALTY * 1000 * violation
+
+    pop = lower + rng.random((population, len(free))) * (upper - lower)
+    fitness = evaluate(pop)
+
+    for _ in range(generations):
+        # Tres donantes distintos entre sí y del individuo, para toda la población a la vez
+        keys = rng.random((population, population))
+        np.fill_diagonal(keys, np.inf)
+        r1, r2, r3 = np.argsort(keys, axis=1)[:, :3].T
+
+        mutant = np.clip(pop[r1] + mutation * (pop[r2] - pop[r3]), lower, upper)
+        cross = rng.random(pop.shape) < crossover
+        cross[np.arange(population), rng.integers(0, len(free), population)] = True
+        trial = np.where(cross, mutant, pop)
+
+        trial_fitness = evaluate(trial)
+        better = trial_fitness <= fitness
+        pop[better] = trial[better]
+        fitness[better] = trial_fitness[better]
+
+    all_X = np.vstack(archive_X)
+    all_strength = np.concatenate(archive_strength)
+    all_cost = mix_cost(all_X, names, costs)
+    if len(all_X) == 0:
+        raise ValueError("Ninguna mezcla evaluada respeta los límites de dosificación "
+                         "sin extrapolar; revise las variables fijas")
+
+    # Mejor mezcla: la más barata que cumple; si ninguna cumple, la más resistente
+    meets = all_strength >= target_strength
+    if meets.any():
+        best = np.flatnonzero(meets)[np.argmin(all_cost[meets])]
+    else:
+        best = int(np.argmax(all_strength))
+        logger.warning(f"Ninguna mezcla alcanzó {target_strength} kg/cm²")
+
+    front = pareto_front(all_strength, all_cost)
+    if len(front) > max_pareto_points:
+        front = front[np.linspace(0, len(front) - 1, max_pareto_points).round().astype(int)]
+
+    def as_mix(row: np.ndarray) -> Dict[str, float]:
+        return {name: round(float(value), 1) for name, value in zip(names, row)}
+
+    distance = (np.full(len(all_X), np.nan) if neighbor_index is None
+                else neighbor_index.check_batch(all_X)['distancia_vecino'])
+
+    logger.info(f"Optimizacion completada: {population * (generations + 1)} mezclas evaluadas, "
+                f"mejor costo {all_cost[best]:.2f} con {all_strength[best]:.1f} kg/cm²")
+
+    return {
+        'mejor_mezcla': as_mix(all_X[best]),
+        'resistencia_kg_cm2': float(all_strength[best]),
+        'costo': round(float(all_cost[best]), 2),
+        'distancia_vecino': round(float(distance[best]), 3),
+        'cumple_objetivo': bool(meets[best]),
+        'objetivo_kg_cm2': target_strength,
+        'frente_pareto': [
+            {'mezcla': as_mix(all_X[i]), 'resistencia_kg_cm2': float(all_strength[i]),
+             'costo': round(float(all_cost[i]), 2),
+             'distancia_vecino': round(float(distance[i]), 3)}
+            for i in front
+        ],
+        'evaluaciones': population * (generations + 1),
+        'generaciones': generations
+    }
+
+
+def _parse_assignments(values: List[str], option: str) -> Dict[str, float]:
+    """Convertir ["Variable=valor", ...] en diccionario."""
+    result = {}
+    for item in values:
+        name, sep, value = item.partition('=')
+        if not sep:
+            raise ValueError(f"{option} espera Variable=valor, se recibió '{item}'")
+        result[name.strip()] = float(value)
+    return result
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    """Argumentos del diseño inverso."""
+    parser = argparse.ArgumentParser(prog="main.py optimize",
+                                     description="Mezcla más económica que alcanza una resistencia objetivo")
+    parser.add_argument('--target', type=float, default=280.0,
+                        help="Resistencia objetivo en kg/cm² (por defecto 280)")
+    parser.add_argument('--age', type=float, default=28,
+                        help="Edad de ensayo en días (por defecto 28)")
+    parser.add_argument('--fix', action='append', default=[], metavar='VARIABLE=VALOR',
+                        help="Fijar una variable (repetible)")
+    parser.add_argument('--cost', action='append', default=[], metavar='VARIABLE=USD_KG',
+                        help="Costo por kg de un material (repetible)")
+    parser.add_argument('--generations', type=int, default=100, help="Generaciones")
+    parser.add_argument('--population', type=int, default=60, help="Mezclas por generación")
+    parser.add_argument('--seed', type=int, default=None, help="Semilla aleatoria")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada de `python main.py optimize`."""
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    try:
+        fixed = dict({'Edad_dias': args.age}, **_parse_assignments(args.fix, '--fix'))
+        costs = _parse_assignments(args.cost, '--cost')
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        return 1
+
+    from model_handler_fixed import ConcreteModelHandler
+    handler = ConcreteModelHandler()
+    if not handler.is_loaded:
+        print("ERROR: No se pudo cargar el modelo")
+        return 1
+
+    try:
+        result = optimize_mix(handler, args.target, fixed, costs, args.population,
+                              args.generations, seed=args.seed)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        return 1
+
+    status = "cumple" if result['cumple_objetivo'] else "NO alcanza"
+    print(f"=> Mejor mezcla ({status} {args.target:g} kg/cm²): "
+          f"{result['resistencia_kg_cm2']:.1f} kg/cm², costo {result['costo']:.2f} USD/m³, "
+          f"distancia al ensayo más cercano {result['distancia_vecino']:.2f}")
+    for name, value in result['mejor_mezcla'].items():
+        print(f"   {name:<28} {value:>8.1f}")
+    print(f"=> Frente de Pareto ({len(result['frente_pareto'])} mezclas):")
+    for point in result['frente_pareto']:
+        print(f"   {point['costo']:>8.2f} USD/m³  ->  {point['resistencia_kg_cm2']:>7.1f} kg/cm²")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+    sys.exit(main())
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Artefacto del Modelo sin Pickle (arrays .npy mapeados en memoria)
+=================================================================
+
+Convierte el RandomForestRegressor guardado con joblib en un directorio
+versionado de arrays .npy más un manifest.json. La carga usa
+np.load(mmap_mode='r', allow_pickle=False): es casi instantánea, varios
+procesos comparten las mismas páginas del sistema operativo y no se
+ejecuta código arbitrario al abrir el modelo.
+
+Uso:
+    python model_artifact.py modelo_hormigon_ecuador_v1.pkl
+"""
+
+import hashlib
+import json
+import logging
+import shutil
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from tree_engine import FlatForest
+
+logger = logging.getLogger(__name__)
+
+# Versión del formato en disco; incrementar ante cambios incompatibles
+ARTIFACT_FORMAT_VERSION = 1
+ARTIFACT_SUFFIX = ".forest"
+MANIFEST_NAME = "manifest.json"
+ARRAY_NAMES = ('feature', 'threshold', 'children', 'value', 'roots')
+
+
+def file_sha256(path: Union[str, Path], chunk_size: int = 1 << 20) -> str:
+    """
+    Calcular el hash SHA-256 de un archivo.
+
+    Args:
+        path: Ruta del archivo
+        chunk_size: Bytes leídos por iteración
+
+    Returns:
+        str: Hash hexadecimal
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def default_artifact_path(model_path: Union[str, Path]) -> Path:
+    """Directorio de artefacto asociado a un .pkl (mismo nombre, sufijo .forest)."""
+    return Path(model_path).with_suffix(ARTIFACT_SUFFIX)
+
+
+def save_forest_artifact(forest: FlatForest, directory: Union[str, Path],
+                         feature_names: List[str],
+                         feature_importances: Optional[np.ndarray] = None,
+                         source_path: Optional[Union[str, Path]] = None) -> Path:
+    """
+    Guardar un FlatForest como directorio de arrays .npy.
+
+    La escritura se hace en un directorio temporal que se renombra al final,
+    de modo que un lector nunca ve un artefacto a medio escribir.
+
+    Args:
+        forest: Bosque a guardar
+        directory: Directorio destino
+        feature_names: Nombres de las variables de entrada
+        feature_importances: Importancia de cada variable (opcional)
+        source_path: Archivo .pkl de origen, se registra su hash
+
+    Returns:
+        Path: Directorio del artefacto
+    """
+    directory = Path(directory)
+    tmp_dir = directory.with_name(directory.name + ".tmp")
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+    tmp_dir.mkdir(parents=True)
+
+    for name in ARRAY_NAMES:
+        np.save(tmp_dir / f"{name}.npy", np.ascontiguousarray(getattr(forest, name)),
+                allow_pickle=False)
+
+    manifest = {
+        'formato': ARTIFACT_FORMAT_VERSION,
+        'fecha_conversion': datetime.now().isoformat(),
+        'n_arboles': forest.n_trees,
+        'n_nodos': forest.node_count,
+        'profundidad_maxima': forest.max_depth,
+        'n_features': forest.n_features,
+        'variables_entrada': list(feature_names),
+        'importancia_variables': (None if feature_importances is None
+                                  else [float(v) for v in feature_importances]),
+        'origen': None
+    }
+    if source_path is not None:
+        manifest['origen'] = {
+            'archivo': Path(source_path).name,
+            'sha256': file_sha256(source_path)
+        }
+
+    with open(tmp_dir / MANIFEST_NAME, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+    # Reemplazo del directorio anterior lo más atómico posible
+    if directory.exists():
+        old_dir = directory.with_name(directory.name + ".old")
+        if old_dir.exists():
+            shutil.rmtree(old_dir)
+        directory.rename(old_dir)
+        tmp_dir.rename(directory)
+        shutil.rmtree(old_dir)
+    else:
+        tmp_dir.rename(directory)
+
+    logger.info(f"Artefacto guardado en {directory} ({forest.node_count} nodos)")
+    return directory
+
+
+def load_forest_artifact(directory: Union[str, Path],
+                         mmap: bool = True) -> Tuple[FlatForest, Dict[str, Any]]:
+    """
+    Cargar un artefacto sin ejecutar pickle.
+
+    Args:
+        directory: Directorio del artefacto
+        mmap: Mapear los arrays en memoria (solo lectura) en lugar de copiarlos
+
+    Returns:
+        Tuple[FlatForest, Dict]: (bosque, manifest)
+    """
+    directory = Path(directory)
+    with open(directory / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    if manifest.get('formato') != ARTIFACT_FORMAT_VERSION:
+        raise ValueError(f"Formato de artefacto no soportado: {manifest.get('formato')} "
+                         f"(se esperaba {ARTIFACT_FORMAT_VERSION})")
+
+    mmap_mode = 'r' if mmap else None
+    arrays = {name: np.load(directory / f"{name}.npy", mmap_mode=mmap_mode, allow_pickle=False)
+              for name in ARRAY_NAMES}
+
+    if len(arrays['feature']) != manifest['n_nodos'] or len(arrays['roots']) != manifest['n_arboles']:
+        raise ValueError("Artefacto inconsistente con su manifest")
+
+    forest = FlatForest(arrays['feature'], arrays['threshold'], arrays['children'],
+                        arrays['value'], arrays['roots'],
+                        manifest['profundidad_maxima'], manifest['n_features'])
+    return forest, manifest
+
+
+def is_artifact_current(directory: Union[str, Path], model_path: Union[str, Path]) -> bool:
+    """
+    Verificar que el artefacto corresponde al .pkl actual.
+
+    Si el .pkl no existe el artefacto se considera vigente.
+    """
+    directory, model_path = Path(directory), Path(model_path)
+    manifest_file = directory / MANIFEST_NAME
+    if not manifest_file.exists():
+        return False
+    if not model_path.is_file():
+        return True
+
+    with open(manifest_file, 'r', encoding='utf-8') as f:
+        origin = json.load(f).get('origen') or {}
+    return origin.get('sha256') == file_sha256(model_path)
+
+
+def convert_model(model_path: Union[str, Path],
+                  output_dir: Optional[Union[str, Path]] = None,
+                  feature_names: Optional[List[str]] = None) -> Path:
+    """
+    Convertir un modelo joblib/pickle al formato de artefacto.
+
+    Args:
+        model_path: Ruta al .pkl entrenado
+        output_dir: Directorio destino (por defecto <modelo>.forest)
+        feature_names: Nombres de las variables (por defecto los del handler)
+
+    Returns:
+        Path: Directorio del artefacto generado
+    """
+    import joblib
+
+    model_path = Path(model_path)
+    output_dir = Path(output_dir) if output_dir else default_artifact_path(model_path)
+
+    if feature_names is None:
+        from model_handler_fixed import ConcreteModelHandler
+        feature_names = ConcreteModelHandler.FEATURE_NAMES
+
+    model = joblib.load(model_path)
+    forest = FlatForest.from_sklearn(model)
+    return save_forest_artifact(forest, output_dir, feature_names,
+                                getattr(model, 'feature_importances_', None),
+                                source_path=model_path)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+    source = sys.argv[1] if len(sys.argv) > 1 else "modelo_hormigon_ecuador_v1.pkl"
+    target = sys.argv[2] if len(sys.argv) > 2 else None
+    print(f"=> Artefacto generado: {convert_model(source, target)}")
@@ -9,16 +9,47 @@ por el usuario en el notebook.
 
 import json
 import logging
+import math
+import threading
+import time
+from bisect import bisect_right
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Callable, List, Optional, Tuple, Union, TYPE_CHECKING
 import numpy as np
-import pandas as pd
 from datetime import datetime
-import joblib
+
+# pandas y joblib se importan solo cuando se necesitan (arranque rápido)
+if TYPE_CHECKING:
+    import pandas as pd
+    from mix_neighbors import MixNeighborIndex
+
+from tree_engine import FlatForest
+from model_artifact import (MANIFEST_NAME, default_artifact_path, file_sha256,
+                            is_artifact_current, load_forest_artifact)
+from prediction_cache import PredictionCache
+from timing_spans import span
 
 logger = logging.getLogger(__name__)
 
 
+class LoadedModel:
+    """Modelo cargado con su metadata y el hash de su archivo; no se modifica."""
+    
+    __slots__ = ('model', 'engine', 'feature_importances', 'metadata',
+                 'source', 'signature', 'sha256')
+    
+    def __init__(self, model, engine: Optional[FlatForest],
+                 feature_importances: Optional[np.ndarray], metadata: Dict[str, Any],
+                 source: Path, signature: Tuple[int, int], sha256: str):
+        self.model = model
+        self.engine = engine
+        self.feature_importances = feature_importances
+        self.metadata = metadata
+        self.source = source
+        self.signature = signature
+        self.sha256 = sha256
+
+
 class ConcreteModelHandler:
     """Manejador del modelo de predicción ORIGINAL del usuario."""
     
@@ -41,51 +72,117 @@ class ConcreteModelHandler:
         (280, 420): ("Alta Resistencia", "#22c55e", "Estructuras exigentes"),
         (420, float('inf')): ("Ultra Alta Resistencia", "#3b82f6", "Estructuras especiales")
     }
+    NEC_UNCLASSIFIED = ("Sin Clasificar", "#6b7280", "Valor fuera de rangos estándar")
+    
+    # Margen sobre VALID_RANGES antes de marcar una variable fuera de rango
+    RANGE_MARGIN = 0.1
+    
+    # Ensayos de laboratorio del índice de vecinos (detección de extrapolación)
+    DATASET_PATH = "Concrete_Data.csv"
+    
+    # Nombres de features EXACTOS del notebook
+    FEATURE_NAMES = [
+        'Cemento_kg_m3',
+        'Escoria_Alto_Horno_kg_m3',
+        'Ceniza_Volante_kg_m3', 
+        'Agua_kg_m3',
+        'Superplastificante_kg_m3',
+        'Agregado_Grueso_kg_m3',
+        'Agregado_Fino_kg_m3',
+        'Edad_dias'
+    ]
+    
+    # Hasta este número de filas el motor plano supera a sklearn
+    ENGINE_MAX_ROWS = 256
+    
+    # Cuantiles de la dispersión entre árboles reportados como intervalo
+    UNCERTAINTY_QUANTILES = (0.1, 0.9)
+    
+    # Barridos guardados (cada uno ocupa hasta una malla completa)
+    SWEEP_CACHE_SIZE = 32
+    
+    # Edades de ensayo de la curva de desarrollo de resistencia
+    AGE_CURVE_DAYS = (3, 7, 14, 28, 56, 90, 180, 365)
+    
+    # Recarga en caliente: segundos entre revisiones de los archivos del modelo
+    RELOAD_POLL_INTERVAL = 2.0
+    
+    # Validación canario de un modelo nuevo: rango físico (kg/cm²) y cambio
+    # relativo máximo de las mezclas predefinidas respecto al modelo vigente
+    CANARY_STRENGTH_RANGE = (1.0, 1500.0)
+    CANARY_MAX_CHANGE = 0.5
+    
+    # Resolución de los sliders de la GUI, usada para cuantizar la clave de caché
+    CACHE_RESOLUTION = {
+        'Cemento_kg_m3': 1,
+        'Escoria_Alto_Horno_kg_m3': 1,
+        'Ceniza_Volante_kg_m3': 1,
+        'Agua_kg_m3': 1,
+        'Superplastificante_kg_m3': 0.1,
+        'Agregado_Grueso_kg_m3': 1,
+        'Agregado_Fino_kg_m3': 1,
+        'Edad_dias': 1
+    }
+    
+    # Tolerancia (en pasos) para considerar un valor sobre la grilla de los sliders
+    CACHE_GRID_TOLERANCE = 1e-6
     
     def __init__(self, model_path: str = "modelo_hormigon_ecuador_v1.pkl", 
-                 metadata_path: str = "modelo_metadata.json"):
+                 metadata_path: str = "modelo_metadata.json",
+                 cache_size: int = 512):
         """Inicializar con el modelo ORIGINAL del usuario."""
         self.model_path = Path(model_path)
         self.metadata_path = Path(metadata_path)
-        self.model = None
-        self.metadata = None
-        
-        # Nombres de features EXACTOS del notebook
-        self.feature_names = [
-            'Cemento_kg_m3',
-            'Escoria_Alto_Horno_kg_m3',
-            'Ceniza_Volante_kg_m3', 
-            'Agua_kg_m3',
-            'Superplastificante_kg_m3',
-            'Agregado_Grueso_kg_m3',
-            'Agregado_Fino_kg_m3',
-            'Edad_dias'
-        ]
+        self.feature_names = list(self.FEATURE_NAMES)
+        
+        # Límites y cubetas NEC precalculados (se recalculan si cambia la tabla)
+        self._bounds_cache: Optional[Tuple] = None
+        self._nec_cache: Optional[Tuple] = None
+        
+        # Índice de vecinos sobre los ensayos, cargado al primer uso
+        self._neighbor_index: Optional["MixNeighborIndex"] = None
+        self._neighbor_lock = threading.Lock()
+        
+        # Caché LRU de predicciones, ligada al hash del archivo del modelo
+        self.prediction_cache = PredictionCache(cache_size)
+        self.sweep_cache = PredictionCache(self.SWEEP_CACHE_SIZE)
+        
+        # Modelo vigente: se reemplaza completo (nunca se modifica) al recargar
+        self._state: Optional[LoadedModel] = None
+        self._observed_signature = None
+        self._reload_lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_watching = threading.Event()
+        self.last_reload: Optional[Dict[str, Any]] = None
         
         self.is_loaded = False
         self._load_model_and_metadata()
     
+    # Vista del modelo vigente; las predicciones leen _state una sola vez
+    @property
+    def model(self):
+        return self._state.model if self._state else None
+    
+    @property
+    def engine(self) -> Optional[FlatForest]:
+        return self._state.engine if self._state else None
+    
+    @property
+    def feature_importances(self) -> Optional[np.ndarray]:
+        return self._state.feature_importances if self._state else None
+    
+    @property
+    def metadata(self) -> Optional[Dict[str, Any]]:
+        return self._state.metadata if self._state else None
+    
+    @property
+    def model_hash(self) -> Optional[str]:
+        return self._state.sha256 if self._state else None
+    
     def _load_model_and_metadata(self) -> bool:
-        """Cargar el modelo ORIGINAL usando joblib como se entrenó."""
+        """Cargar el modelo: artefacto .forest si está vigente, si no joblib."""
         try:
-            # Cargar modelo con joblib (como se guardó en el notebook)
-            logger.info(f"Cargando modelo original desde {self.model_path}")
-            self.model = joblib.load(self.model_path)
-            
-            # Verificar que es el modelo correcto
-            if not hasattr(self.model, 'predict'):
-                raise ValueError("El modelo no tiene método predict")
-                
-            if not self.model.__class__.__name__ == 'RandomForestRegressor':
-                logger.warning(f"Modelo inesperado: {self.model.__class__.__name__}")
-            
-            logger.info("Modelo RandomForestRegressor cargado correctamente")
-            
-            # Cargar metadata
-            logger.info(f"Cargando metadata desde {self.metadata_path}")
-            with open(self.metadata_path, 'r', encoding='utf-8') as f:
-                self.metadata = json.load(f)
-            
+            self._swap_state(self._load_state())
             self.is_loaded = True
             logger.info("Modelo y metadata cargados exitosamente")
             return True
@@ -97,21 +194,269 @@ class ConcreteModelHandler:
             logger.error(f"Error cargando modelo: {e}")
             return False
     
+    def _load_state(self) -> "LoadedModel":
+        """Leer modelo y metadata desde disco sin tocar el modelo vigente."""
+        artifact_path = self._find_artifact()
+        source = artifact_path / MANIFEST_NAME if artifact_path is not None else self.model_path
+        
+        # Hash antes de leer: si el archivo cambia durante la carga, la firma
+        # registrada queda vieja y el vigilante vuelve a recargar
+        stat = source.stat()
+        sha256 = file_sha256(source)
+        if artifact_path is not None:
+            model, engine, importances = self._load_artifact(artifact_path)
+        else:
+            model, engine, importances = self._load_joblib_model()
+        
+        logger.info(f"Cargando metadata desde {self.metadata_path}")
+        with open(self.metadata_path, 'r', encoding='utf-8') as f:
+            metadata = json.load(f)
+        
+        return LoadedModel(model, engine, importances, metadata, source,
+                           (stat.st_mtime_ns, stat.st_size), sha256)
+    
+    def _swap_state(self, state: "LoadedModel"):
+        """Publicar un modelo nuevo con una sola asignación y vaciar las cachés."""
+        self._state = state
+        self._observed_signature = state.signature
+        self.clear_cache()
+    
+    def _find_artifact(self) -> Optional[Path]:
+        """Buscar un artefacto sin pickle vigente para el modelo configurado."""
+        if self.model_path.is_dir():
+            return self.model_path
+        
+        artifact_path = default_artifact_path(self.model_path)
+        if not artifact_path.is_dir():
+            return None
+        if not is_artifact_current(artifact_path, self.model_path):
+            logger.warning(f"Artefacto {artifact_path} desactualizado respecto a "
+                           f"{self.model_path}, se usa el pickle")
+            return None
+        return artifact_path
+    
+    def _load_artifact(self, artifact_path: Path) -> Tuple[None, FlatForest, Optional[np.ndarray]]:
+        """Cargar el bosque desde arrays .npy mapeados en memoria (sin pickle)."""
+        logger.info(f"Cargando artefacto mapeado en memoria desde {artifact_path}")
+        engine, manifest = load_forest_artifact(artifact_path)
+        
+        if manifest['variables_entrada'] != self.feature_names:
+            raise ValueError("Las variables del artefacto no coinciden con las del modelo")
+        
+        importances = manifest.get('importancia_variables')
+        logger.info(f"Artefacto cargado: {engine.n_trees} árboles")
+        return None, engine, None if importances is None else np.asarray(importances)
+    
+    def _load_joblib_model(self) -> Tuple[Any, Optional[FlatForest], Optional[np.ndarray]]:
+        """Cargar el modelo ORIGINAL usando joblib como se entrenó."""
+        import joblib
+        
+        # Cargar modelo con joblib (como se guardó en el notebook)
+        logger.info(f"Cargando modelo original desde {self.model_path}")
+        model = joblib.load(self.model_path)
+        
+        # Verificar que es el modelo correcto
+        if not hasattr(model, 'predict'):
+            raise ValueError("El modelo no tiene método predict")
+            
+        if not model.__class__.__name__ == 'RandomForestRegressor':
+            logger.warning(f"Modelo inesperado: {model.__class__.__name__}")
+        
+        logger.info("Modelo RandomForestRegressor cargado correctamente")
+        
+        # Exportar árboles al motor plano (si falla se usa sklearn)
+        try:
+            engine = FlatForest.from_sklearn(model)
+        except Exception as e:
+            engine = None
+            logger.warning(f"Motor plano no disponible, se usa sklearn: {e}")
+        return model, engine, getattr(model, 'feature_importances_', None)
+    
+    def _check_model_file(self):
+        """Vaciar la caché si el hash del archivo del modelo cambió."""
+        state = self._state
+        try:
+            stat = state.source.stat()
+        except (OSError, AttributeError):
+            return
+        
+        # La firma evita recalcular el hash en cada predicción
+        if (stat.st_mtime_ns, stat.st_size) == self._observed_signature:
+            return
+        self._observed_signature = (stat.st_mtime_ns, stat.st_size)
+        
+        if file_sha256(state.source) != state.sha256:
+            logger.warning(f"El archivo del modelo {state.source} cambió; caché invalidada")
+            self.clear_cache()
+    
+    # --- Recarga en caliente ---
+    
+    def reload(self) -> bool:
+        """
+        Volver a cargar el modelo desde disco y reemplazar el vigente.
+        
+        El candidato se carga aparte, se valida con las mezclas canario y
+        solo entonces se publica con una asignación; las predicciones en
+        curso terminan con el modelo que tomaron al empezar. Si la carga o
+        la validación fallan se conserva el modelo vigente.
+        
+        Returns:
+            bool: True si el modelo fue reemplazado (detalle en last_reload)
+        """
+        with self._reload_lock:
+            start = time.perf_counter()
+            try:
+                candidate = self._load_state()
+                report = self._validate_candidate(candidate)
+            except Exception as e:
+                self.last_reload = {'exito': False, 'error': str(e),
+                                    'fecha': datetime.now().isoformat()}
+                logger.error(f"Recarga del modelo rechazada, se mantiene el vigente: {e}")
+                return False
+            
+            self._swap_state(candidate)
+            self.is_loaded = True
+            self.last_reload = {
+                'exito': True,
+                'fecha': datetime.now().isoformat(),
+                'version': candidate.metadata['modelo_info']['version'],
+                'modelo_sha256': candidate.sha256,
+                'segundos': round(time.perf_counter() - start, 3),
+                **report
+            }
+            logger.info(f"Modelo recargado en caliente: v{self.last_reload['version']} "
+                        f"({self.last_reload['segundos']} s)")
+            return True
+    
+    def _validate_candidate(self, candidate: "LoadedModel") -> Dict[str, Any]:
+        """Predecir las mezclas canario con el modelo nuevo y compararlas con el vigente."""
+        canary = np.array([[mix[f] for f in self.feature_names]
+                           for mix in self.get_preset_mixes().values()], dtype=np.float64)
+        predicted = self._tree_spread(canary, candidate)['resistencia_predicha_kg_cm2']
+        
+        low, high = self.CANARY_STRENGTH_RANGE
+        if not np.all(np.isfinite(predicted)) or np.any((predicted < low) | (predicted > high)):
+            raise ValueError(f"Predicciones canario fuera de [{low}, {high}] kg/cm²: "
+                             f"{np.round(predicted, 1).tolist()}")
+        report = {'canario_kg_cm2': np.round(predicted, 2).tolist()}
+        
+        current = self._state
+        if current is not None:
+            previous = self._tree_spread(canary, current)['resistencia_predicha_kg_cm2']
+            change = float(np.max(np.abs(predicted - previous) / np.maximum(previous, 1.0)))
+            report['cambio_maximo_canario'] = round(change, 4)
+            if change > self.CANARY_MAX_CHANGE:
+                raise ValueError(f"Las mezclas canario cambian {change:.0%} respecto al "
+                                 f"modelo vigente (máximo {self.CANARY_MAX_CHANGE:.0%})")
+        return report
+    
+    def start_watching(self, interval: Optional[float] = None,
+                       on_reload: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """
+        Vigilar los archivos del modelo y recargarlo en segundo plano.
+        
+        Un cambio se aplica cuando los archivos dejan de cambiar durante un
+        intervalo completo: un escritor no atómico, o el pipeline que escribe
+        modelo, artefacto y metadata en secuencia, producen una sola recarga.
+        
+        Args:
+            interval: Segundos entre revisiones (por defecto RELOAD_POLL_INTERVAL)
+            on_reload: Llamada con last_reload tras cada intento (aceptado o
+                rechazado), desde el hilo del vigilante
+        """
+        if self._watcher is not None:
+            return
+        self._stop_watching.clear()
+        self._watcher = threading.Thread(
+            target=self._watch_loop, args=(interval or self.RELOAD_POLL_INTERVAL, on_reload),
+            name="model-watcher", daemon=True)
+        self._watcher.start()
+        logger.info(f"Vigilando {self.model_path} para recarga en caliente")
+    
+    def stop_watching(self):
+        """Detener el hilo vigilante."""
+        if self._watcher is None:
+            return
+        self._stop_watching.set()
+        self._watcher.join()
+        self._watcher = None
+    
+    def _watched_signatures(self) -> Tuple:
+        """(mtime, tamaño) del modelo, del manifiesto del artefacto y de la metadata."""
+        paths = (self.model_path, default_artifact_path(self.model_path) / MANIFEST_NAME,
+                 self.metadata_path)
+        signatures = []
+        for path in paths:
+            try:
+                stat = path.stat()
+                signatures.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signatures.append(None)
+        return tuple(signatures)
+    
+    def _watch_loop(self, interval: float, on_reload: Optional[Callable[[Dict[str, Any]], None]]):
+        """Bucle del vigilante: recargar cuando las firmas cambian y se estabilizan."""
+        applied = self._watched_signatures()
+        pending = None
+        while not self._stop_watching.wait(interval):
+            current = self._watched_signatures()
+            if current == applied:
+                pending = None
+                continue
+            if current != pending:
+                pending = current
+                continue
+            
+            applied, pending = current, None
+            self.reload()
+            if on_reload is not None:
+                try:
+                    on_reload(dict(self.last_reload))
+                except Exception as e:
+                    logger.error(f"Error notificando la recarga del modelo: {e}")
+    
+    def _cache_key(self, inputs: Dict[str, float], model_hash: str) -> Optional[Tuple]:
+        """
+        Clave de caché: hash del modelo y variables en pasos de la resolución de los sliders.
+
+        Solo se cachean mezclas que caen exactamente en la grilla de los
+        sliders; para cualquier otra (HTTP, score) devuelve None y se predice
+        con los valores exactos, así el resultado no depende del orden de llamada.
+        """
+        steps = []
+        for feature in self.feature_names:
+            value = inputs[feature]
+            if not math.isfinite(value):
+                raise ValueError(f"{feature}: valor no finito ({value})")
+            step = value / self.CACHE_RESOLUTION[feature]
+            rounded = round(step)
+            if abs(step - rounded) > self.CACHE_GRID_TOLERANCE:
+                return None
+            steps.append(int(rounded))
+        return (model_hash,) + tuple(steps)
+    
+    def clear_cache(self):
+        """Vaciar la caché de predicciones y de barridos."""
+        self.prediction_cache.clear()
+        self.sweep_cache.clear()
+    
     def get_model_info(self) -> Dict[str, Any]:
         """Obtener información del modelo."""
         if not self.is_loaded:
             return {}
         
+        metadata = self.metadata
         return {
-            'tipo_modelo': self.metadata['modelo_info']['tipo'],
-            'version': self.metadata['modelo_info']['version'], 
-            'fecha_entrenamiento': self.metadata['modelo_info']['fecha_entrenamiento'],
-            'r2_score': round(self.metadata['metricas']['r2_score'], 4),
-            'mae_kg_cm2': round(self.metadata['metricas']['mae_kg_cm2'], 2),
-            'cv_score_mean': round(self.metadata['metricas']['cv_score_mean'], 4),
-            'estabilidad': round(self.metadata['metricas']['estabilidad'], 6),
+            'tipo_modelo': metadata['modelo_info']['tipo'],
+            'version': metadata['modelo_info']['version'], 
+            'fecha_entrenamiento': metadata['modelo_info']['fecha_entrenamiento'],
+            'r2_score': round(metadata['metricas']['r2_score'], 4),
+            'mae_kg_cm2': round(metadata['metricas']['mae_kg_cm2'], 2),
+            'cv_score_mean': round(metadata['metricas']['cv_score_mean'], 4),
+            'estabilidad': round(metadata['metricas']['estabilidad'], 6),
             'variables_entrada': self.feature_names,
-            'variable_salida': self.metadata['modelo_info']['variable_salida']
+            'variable_salida': metadata['modelo_info']['variable_salida'],
+            'cache': self.prediction_cache.stats()
         }
     
     def validate_inputs(self, inputs: Dict[str, float]) -> Tuple[bool, List[str]]:
@@ -123,50 +468,113 @@ class ConcreteModelHandler:
             if feature not in inputs:
                 errors.append(f"Falta la variable: {feature}")
         
-        # Validar rangos (más permisivos que antes)
+        # Validar rangos (más permisivos que antes: 10% de margen, precalculado)
+        bounds = self._extended_bounds()[2]
         for feature, value in inputs.items():
-            if feature in self.VALID_RANGES:
-                min_val, max_val = self.VALID_RANGES[feature]
-                # Agregar 10% de margen para flexibilidad
-                margin = (max_val - min_val) * 0.1
-                extended_min = max(0, min_val - margin)
-                extended_max = max_val + margin
-                
+            if feature in bounds and not math.isfinite(value):
+                errors.append(f"{feature}: valor no finito ({value})")
+            elif feature in bounds:
+                extended_min, extended_max = bounds[feature]
                 if not (extended_min <= value <= extended_max):
                     errors.append(f"{feature}: {value} fuera del rango extendido [{extended_min:.0f}, {extended_max:.0f}]")
         
         return len(errors) == 0, errors
     
+    def neighbor_index(self) -> "MixNeighborIndex":
+        """Índice de vecinos guardado junto al modelo (se carga o construye al primer uso)."""
+        with self._neighbor_lock:
+            if self._neighbor_index is None:
+                from mix_neighbors import load_or_build_index
+                self._neighbor_index = load_or_build_index(self.model_path, self.DATASET_PATH)
+            return self._neighbor_index
+    
+    def check_extrapolation(self, inputs: Union[Dict[str, float], np.ndarray, List[Dict[str, float]]],
+                            k: int = 5) -> Dict[str, Any]:
+        """
+        Distancia a los ensayos de laboratorio y alerta de extrapolación.
+
+        Args:
+            inputs: Mezcla (devuelve también sus k ensayos más cercanos) o lote
+            k: Ensayos cercanos devueltos para una mezcla
+
+        Returns:
+            Dict: para una mezcla, MixNeighborIndex.check; para un lote,
+            MixNeighborIndex.check_batch
+        """
+        index = self.neighbor_index()
+        if isinstance(inputs, dict):
+            return index.check(inputs, k)
+        return index.check_batch(self._to_feature_matrix(inputs))
+    
+    def range_flags(self, X: np.ndarray) -> np.ndarray:
+        """
+        Variables fuera del rango extendido, por fila, como máscara de bits.
+
+        Una comparación vectorizada por columna contra límites precalculados,
+        sin armar mensajes: sirve para millones de filas.
+
+        Args:
+            X: Matriz (n, 8) en el orden de feature_names
+
+        Returns:
+            np.ndarray: uint8 (n,); el bit j indica feature_names[j] fuera de
+            rango (o NaN). 0 = fila dentro de rango
+        """
+        low, high = self._extended_bounds()[:2]
+        # NaN falla ambas comparaciones y queda marcado
+        outside = ~((X >= low) & (X <= high))
+        # 8 variables: un byte por fila, bit j = columna j
+        return np.packbits(outside, axis=1, bitorder='little').ravel()
+    
+    def flagged_features(self, flags: int) -> List[str]:
+        """Nombres de las variables marcadas en una máscara de range_flags."""
+        return [feature for j, feature in enumerate(self.feature_names) if int(flags) >> j & 1]
+    
+    def _extended_bounds(self) -> Tuple[np.ndarray, np.ndarray, Dict[str, Tuple[float, float]]]:
+        """Límites extendidos de cada variable, calculados una vez por tabla de rangos."""
+        cached = self._bounds_cache
+        if cached is None or cached[0] is not self.VALID_RANGES:
+            bounds = {}
+            for feature, (min_val, max_val) in self.VALID_RANGES.items():
+                margin = (max_val - min_val) * self.RANGE_MARGIN
+                bounds[feature] = (max(0, min_val - margin), max_val + margin)
+            low = np.array([bounds[f][0] for f in self.feature_names], dtype=np.float64)
+            high = np.array([bounds[f][1] for f in self.feature_names], dtype=np.float64)
+            cached = self._bounds_cache = (self.VALID_RANGES, low, high, bounds)
+        return cached[1:]
+    
     def predict_strength(self, inputs: Dict[str, float]) -> Dict[str, Any]:
         """Predicción usando el modelo ORIGINAL como en el notebook."""
+        with span("predict_strength.total"):
+            return self._predict_strength(inputs)
+    
+    def _predict_strength(self, inputs: Dict[str, float]) -> Dict[str, Any]:
+        """Fases de predict_strength, cada una en su tramo de tiempo."""
         if not self.is_loaded:
             raise RuntimeError("Modelo no cargado correctamente")
         
         # Validar inputs
-        is_valid, errors = self.validate_inputs(inputs)
+        with span("predict_strength.validacion"):
+            is_valid, errors = self.validate_inputs(inputs)
         if not is_valid:
             logger.warning(f"Inputs con advertencias: {', '.join(errors)}")
             # No lanzar error, solo advertir
         
         try:
-            # Preparar datos EXACTAMENTE como en el notebook
-            # Crear DataFrame con nombres de columnas (como se entrenó)
-            feature_values = [inputs[feature] for feature in self.feature_names]
-            
-            # Usar array numpy para evitar warning de sklearn
-            input_array = np.array(feature_values, dtype=np.float64).reshape(1, -1)
-            
-            # Realizar predicción
-            prediction = self.model.predict(input_array)[0]
-            
-            # Verificar predicción válida
-            if np.isnan(prediction) or np.isinf(prediction):
-                raise ValueError("Predicción resultó en valor inválido")
-            
-            # Asegurar rango razonable
-            if prediction < 0:
-                prediction = abs(prediction)
-                logger.warning(f"Predicción negativa corregida: {prediction:.2f}")
+            # Consultar caché (invalidada si el archivo del modelo cambió). Solo
+            # guarda lo que depende del modelo; fuera de la grilla no hay clave
+            with span("predict_strength.cache"):
+                state = self._state
+                self._check_model_file()
+                cache_key = self._cache_key(inputs, state.sha256)
+                model_outputs = None if cache_key is None else self.prediction_cache.get(cache_key)
+            if model_outputs is not None:
+                logger.debug("Prediccion servida desde cache")
+            else:
+                model_outputs = self._model_outputs(inputs, state)
+                if cache_key is not None:
+                    self.prediction_cache.put(cache_key, model_outputs)
+            prediction = model_outputs['resistencia_predicha_kg_cm2']
             
             # Calcular métricas adicionales
             water_cement_ratio = inputs['Agua_kg_m3'] / inputs['Cemento_kg_m3']
@@ -174,23 +582,21 @@ class ConcreteModelHandler:
                                 inputs['Escoria_Alto_Horno_kg_m3'] + 
                                 inputs['Ceniza_Volante_kg_m3'])
             
-            # Clasificación NEC EXACTA del notebook
-            nec_class, nec_color, nec_description = self._classify_nec(prediction)
-            
-            # Confianza basada en la estabilidad del CV
-            confidence = max(0.7, min(0.95, 1 - self.metadata['metricas']['estabilidad']))
-            
-            result = {
-                'resistencia_predicha_kg_cm2': round(prediction, 2),
-                'relacion_agua_cemento': round(water_cement_ratio, 3),
-                'total_cementicios_kg_m3': round(total_cementitious, 1),
-                'clasificacion_nec': nec_class,
-                'color_clasificacion': nec_color,
-                'descripcion_nec': nec_description,
-                'confianza_prediccion': round(confidence, 3),
-                'edad_ensayo_dias': inputs['Edad_dias'],
-                'timestamp': datetime.now().isoformat()
-            }
+            with span("predict_strength.resultado"):
+                result = {
+                    'resistencia_predicha_kg_cm2': prediction,
+                    'relacion_agua_cemento': round(water_cement_ratio, 3),
+                    'total_cementicios_kg_m3': round(total_cementitious, 1),
+                    'clasificacion_nec': model_outputs['clasificacion_nec'],
+                    'color_clasificacion': model_outputs['color_clasificacion'],
+                    'descripcion_nec': model_outputs['descripcion_nec'],
+                    'confianza_prediccion': model_outputs['confianza_prediccion'],
+                    'desviacion_estandar_kg_cm2': model_outputs['desviacion_estandar_kg_cm2'],
+                    'intervalo_inferior_kg_cm2': model_outputs['intervalo_inferior_kg_cm2'],
+                    'intervalo_superior_kg_cm2': model_outputs['intervalo_superior_kg_cm2'],
+                    'edad_ensayo_dias': inputs['Edad_dias'],
+                    'timestamp': datetime.now().isoformat()
+                }
             
             logger.info(f"Prediccion exitosa: {prediction:.2f} kg/cm²")
             return result
@@ -199,26 +605,331 @@ class ConcreteModelHandler:
             logger.error(f"Error en prediccion: {e}")
             raise
     
-    def _classify_nec(self, strength: float) -> Tuple[str, str, str]:
-        """Clasificación NEC EXACTA del notebook."""
-        for (min_val, max_val), (classification, color, description) in self.NEC_CLASSIFICATION.items():
-            if min_val <= strength < max_val:
-                return classification, color, description
+    def _model_outputs(self, inputs: Dict[str, float], state: LoadedModel) -> Dict[str, Any]:
+        """Predicción, dispersión y clase NEC de una mezcla (lo que guarda la caché)."""
+        # Preparar datos EXACTAMENTE como en el notebook
+        with span("predict_strength.arreglo"):
+            feature_values = [inputs[feature] for feature in self.feature_names]
+            
+            # Usar array numpy para evitar warning de sklearn
+            input_array = np.array(feature_values, dtype=np.float64).reshape(1, -1)
+        
+        # Realizar predicción: una pasada por todos los árboles da media y dispersión
+        with span("predict_strength.modelo"):
+            spread = self._tree_spread(input_array, state)
+        prediction = float(spread['resistencia_predicha_kg_cm2'][0])
         
-        return "Sin Clasificar", "#6b7280", "Valor fuera de rangos estándar"
+        # Verificar predicción válida
+        if np.isnan(prediction) or np.isinf(prediction):
+            raise ValueError("Predicción resultó en valor inválido")
+        
+        # Asegurar rango razonable
+        if prediction < 0:
+            prediction = abs(prediction)
+            logger.warning(f"Predicción negativa corregida: {prediction:.2f}")
+        
+        # Clasificación NEC EXACTA del notebook
+        with span("predict_strength.clasificacion_nec"):
+            nec_class, nec_color, nec_description = self._classify_nec(prediction)
+        
+        return {
+            'resistencia_predicha_kg_cm2': round(prediction, 2),
+            'clasificacion_nec': nec_class,
+            'color_clasificacion': nec_color,
+            'descripcion_nec': nec_description,
+            'confianza_prediccion': float(spread['confianza_prediccion'][0]),
+            'desviacion_estandar_kg_cm2': float(spread['desviacion_estandar_kg_cm2'][0]),
+            'intervalo_inferior_kg_cm2': float(spread['intervalo_inferior_kg_cm2'][0]),
+            'intervalo_superior_kg_cm2': float(spread['intervalo_superior_kg_cm2'][0])
+        }
+    
+    def predict_batch(self, inputs: Union[np.ndarray, "pd.DataFrame", List[Dict[str, float]]],
+                      with_uncertainty: bool = False) -> Dict[str, np.ndarray]:
+        """
+        Predicción vectorizada de muchas mezclas con una sola llamada al modelo.
+
+        Args:
+            inputs: Matriz (n, 8) con las columnas en el orden de feature_names,
+                DataFrame con las columnas por nombre o lista de diccionarios
+            with_uncertainty: Agregar desviación, intervalo y confianza por mezcla
+                (recorre todos los árboles con el motor plano en una pasada)
+
+        Returns:
+            Dict de arrays columnares (una posición por mezcla)
+        """
+        if not self.is_loaded:
+            raise RuntimeError("Modelo no cargado correctamente")
+
+        state = self._state
+        X = self._to_feature_matrix(inputs)
+        flags = self._validate_matrix(X)
+
+        # Una sola llamada al modelo para todas las filas
+        spread = self._tree_spread(X, state) if with_uncertainty else {}
+        predictions = spread.get('resistencia_predicha_kg_cm2')
+        if predictions is None:
+            predictions = self._predict_matrix(X, state)
+        predictions = np.abs(predictions)
+        if not np.all(np.isfinite(predictions)):
+            raise ValueError("Predicción resultó en valores inválidos")
+
+        cement = X[:, 0]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            water_cement_ratio = np.where(cement > 0, X[:, 3] / cement, np.nan)
+        total_cementitious = X[:, 0] + X[:, 1] + X[:, 2]
+
+        logger.debug(f"Prediccion por lotes exitosa: {len(predictions)} mezclas")
+
+        return {
+            **spread,
+            'resistencia_predicha_kg_cm2': np.round(predictions, 2),
+            'relacion_agua_cemento': np.round(water_cement_ratio, 3),
+            'total_cementicios_kg_m3': np.round(total_cementitious, 1),
+            'clasificacion_nec': self._classify_nec_batch(predictions),
+            'edad_ensayo_dias': X[:, 7],
+            'dentro_de_rango': flags == 0,
+            'alertas_rango': flags
+        }
+
+    def _tree_spread(self, X: np.ndarray,
+                     state: Optional[LoadedModel] = None) -> Dict[str, np.ndarray]:
+        """
+        Media, desviación y cuantiles de las predicciones de cada árbol.
+
+        La matriz (n, n_árboles) sale de una sola pasada del motor plano
+        (no una llamada a predict por árbol); la media es la predicción del
+        bosque, sin corregir su signo. La confianza es 1 - coeficiente de
+        variación, acotada a [0, 1].
+        """
+        leaves = self._leaf_matrix(X, state or self._state)
+        mean = leaves.mean(axis=1)
+        std = leaves.std(axis=1)
+        lower, upper = np.quantile(leaves, self.UNCERTAINTY_QUANTILES, axis=1)
+        magnitude = np.abs(mean)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            confidence = np.clip(np.where(magnitude > 0, 1 - std / magnitude, 0.0), 0.0, 1.0)
+
+        return {
+            'resistencia_predicha_kg_cm2': mean,
+            'desviacion_estandar_kg_cm2': np.round(std, 2),
+            'intervalo_inferior_kg_cm2': np.round(lower, 2),
+            'intervalo_superior_kg_cm2': np.round(upper, 2),
+            'confianza_prediccion': np.round(confidence, 3)
+        }
+
+    def _leaf_matrix(self, X: np.ndarray, state: LoadedModel) -> np.ndarray:
+        """Predicción de cada árbol (n, n_árboles): motor plano o, si no hay, los árboles de sklearn."""
+        if state.engine is not None:
+            return state.engine.leaf_values(X)
+        # Los árboles de sklearn trabajan en float32, como el motor plano
+        X32 = np.asarray(X, dtype=np.float32)
+        return np.column_stack([tree.predict(X32) for tree in state.model.estimators_])
+
+    def sweep(self, base_inputs: Dict[str, float], x_feature: str,
+              x_values: Optional[np.ndarray] = None, y_feature: Optional[str] = None,
+              y_values: Optional[np.ndarray] = None, points: int = 200) -> Dict[str, Any]:
+        """
+        Resistencia sobre una malla 1-D o 2-D alrededor de una mezcla.
+
+        Todas las combinaciones se evalúan en una sola llamada al modelo y
+        el resultado se guarda por mezcla base (si cae en la grilla, como la caché de
+        predicciones), de modo que volver a pedir el mismo barrido es inmediato.
+
+        Args:
+            base_inputs: Mezcla base; las variables no barridas quedan fijas
+            x_feature: Variable del eje X
+            x_values: Valores del eje X (por defecto `points` valores en VALID_RANGES)
+            y_feature: Segunda variable para un mapa 2-D (opcional)
+            y_values: Valores del eje Y (por defecto como x_values)
+            points: Puntos por eje cuando no se indican valores
+
+        Returns:
+            Dict con 'x', 'y' (o None) y 'resistencia_kg_cm2' de forma (len(x),)
+            o (len(y), len(x)); los arrays son de solo lectura
+        """
+        if not self.is_loaded:
+            raise RuntimeError("Modelo no cargado correctamente")
+        for feature in (x_feature, y_feature):
+            if feature is not None and feature not in self.feature_names:
+                raise ValueError(f"Variable desconocida: {feature}")
+        if x_feature == y_feature:
+            raise ValueError("Las variables de los dos ejes deben ser distintas")
+
+        x = self._sweep_axis(x_feature, x_values, points)
+        y = None if y_feature is None else self._sweep_axis(y_feature, y_values, points)
+
+        # Las variables barridas no forman parte de la mezcla base en la clave
+        swept = {x_feature: 0, **({y_feature: 0} if y_feature else {})}
+        state = self._state
+        self._check_model_file()
+        cache_key = self._cache_key({**base_inputs, **swept}, state.sha256)
+        if cache_key is not None:
+            cache_key += (x_feature, x.tobytes(), y_feature, None if y is None else y.tobytes())
+        cached = None if cache_key is None else self.sweep_cache.get(cache_key)
+        if cached is not None:
+            return dict(cached)
+
+        base = np.array([base_inputs[f] for f in self.feature_names], dtype=np.float64)
+        x_col = self.feature_names.index(x_feature)
+        if y is None:
+            grid = np.tile(base, (len(x), 1))
+            grid[:, x_col] = x
+        else:
+            grid_x, grid_y = np.meshgrid(x, y)
+            grid = np.tile(base, (grid_x.size, 1))
+            grid[:, x_col] = grid_x.ravel()
+            grid[:, self.feature_names.index(y_feature)] = grid_y.ravel()
+
+        strength = np.abs(self._predict_matrix(grid, state))
+        if y is not None:
+            strength = strength.reshape(len(y), len(x))
+
+        for array in (x, y, strength):
+            if array is not None:
+                array.flags.writeable = False
+
+        result = {
+            'x_variable': x_feature,
+            'y_variable': y_feature,
+            'x': x,
+            'y': y,
+            'resistencia_kg_cm2': strength
+        }
+        if cache_key is not None:
+            self.sweep_cache.put(cache_key, result)
+        logger.info(f"Barrido calculado: {grid.shape[0]} mezclas")
+        return dict(result)
+
+    def predict_age_curve(self, inputs: Dict[str, float],
+                          ages: Optional[List[float]] = None) -> Dict[str, np.ndarray]:
+        """
+        Desarrollo de la resistencia de una mezcla con la edad de ensayo.
+
+        Todas las edades se predicen en una sola llamada al modelo y la curva
+        queda memorizada por mezcla (la edad de `inputs` no influye).
+
+        Args:
+            inputs: Mezcla a evaluar
+            ages: Edades en días (por defecto AGE_CURVE_DAYS)
+
+        Returns:
+            Dict con 'edades_dias' y 'resistencia_kg_cm2' (arrays de solo lectura)
+        """
+        ages = self.AGE_CURVE_DAYS if ages is None else ages
+        curve = self.sweep(inputs, 'Edad_dias', np.asarray(ages, dtype=np.float64))
+        return {'edades_dias': curve['x'], 'resistencia_kg_cm2': curve['resistencia_kg_cm2']}
+
+    def _sweep_axis(self, feature: str, values: Optional[np.ndarray], points: int) -> np.ndarray:
+        """Valores de un eje del barrido (copia propia, float64)."""
+        if values is None:
+            min_val, max_val = self.VALID_RANGES[feature]
+            return np.linspace(min_val, max_val, points)
+        return np.array(values, dtype=np.float64).ravel()
+
+    def _predict_matrix(self, X: np.ndarray, state: Optional[LoadedModel] = None) -> np.ndarray:
+        """Predecir una matriz con el motor plano o con sklearn según su tamaño."""
+        state = state or self._state
+        if state.model is None or (state.engine is not None and len(X) <= self.ENGINE_MAX_ROWS):
+            return state.engine.predict(X)
+        return state.model.predict(X)
+
+    def _to_feature_matrix(self, inputs: Union[np.ndarray, "pd.DataFrame", List[Dict[str, float]]]) -> np.ndarray:
+        """Convertir la entrada de predict_batch a una matriz float64 (n, 8)."""
+        if hasattr(inputs, 'columns') and hasattr(inputs, 'to_numpy'):  # DataFrame
+            missing = [f for f in self.feature_names if f not in inputs.columns]
+            if missing:
+                raise ValueError(f"Faltan las variables: {', '.join(missing)}")
+            X = inputs[self.feature_names].to_numpy(dtype=np.float64)
+        elif isinstance(inputs, np.ndarray):
+            X = np.asarray(inputs, dtype=np.float64)
+            if X.ndim == 1:
+                X = X.reshape(1, -1)
+        else:
+            try:
+                X = np.array([[row[f] for f in self.feature_names] for row in inputs],
+                             dtype=np.float64)
+            except KeyError as e:
+                raise ValueError(f"Falta la variable: {e.args[0]}") from e
+
+        if X.ndim != 2 or X.shape[1] != len(self.feature_names):
+            raise ValueError(f"Se esperaban {len(self.feature_names)} columnas, "
+                             f"se recibió una matriz con forma {X.shape}")
+        return X
+
+    def _validate_matrix(self, X: np.ndarray) -> np.ndarray:
+        """Validar rangos de todas las filas a la vez; devuelve range_flags y resume en el log."""
+        flags = self.range_flags(X)
+        flagged = flags[flags != 0]
+        if len(flagged):
+            counts = np.unpackbits(flagged[:, None], axis=1, bitorder='little').sum(axis=0)
+            for feature, count in zip(self.feature_names, counts):
+                if count:
+                    logger.warning(f"{feature}: {int(count)} filas fuera del rango extendido")
+        return flags
+
+    def nec_class_codes(self, strengths: np.ndarray) -> np.ndarray:
+        """
+        Índice de la clase NEC de cada resistencia con np.searchsorted.
+
+        Args:
+            strengths: Resistencias en kg/cm²
+
+        Returns:
+            np.ndarray: int8 con la posición en nec_classes(); la última
+            posición es "Sin Clasificar" (fuera de la tabla o NaN)
+        """
+        lower, upper = self._nec_bins()[:2]
+        strengths = np.asarray(strengths, dtype=np.float64)
+        index = np.searchsorted(lower, strengths, side='right') - 1
+        safe = np.clip(index, 0, len(lower) - 1)
+        inside = (index >= 0) & (strengths < upper[safe])
+        return np.where(inside, safe, len(lower)).astype(np.int8)
+
+    def nec_classes(self) -> List[Tuple[str, str, str]]:
+        """(clase, color, descripción) en el orden de nec_class_codes()."""
+        return list(self._nec_bins()[2])
+
+    def _nec_bins(self) -> Tuple[np.ndarray, np.ndarray, List[Tuple[str, str, str]], np.ndarray]:
+        """Límites de la tabla NEC ordenados, calculados una vez por tabla."""
+        cached = self._nec_cache
+        if cached is None or cached[0] is not self.NEC_CLASSIFICATION:
+            ranges = sorted(self.NEC_CLASSIFICATION.items())
+            lower = np.array([low for (low, _), _ in ranges], dtype=np.float64)
+            upper = np.array([high for (_, high), _ in ranges], dtype=np.float64)
+            labels = [label for _, label in ranges] + [self.NEC_UNCLASSIFIED]
+            names = np.array([label[0] for label in labels], dtype=object)
+            cached = self._nec_cache = (self.NEC_CLASSIFICATION, lower, upper, labels, names)
+        return cached[1:]
+
+    def _classify_nec_batch(self, strengths: np.ndarray) -> np.ndarray:
+        """Clasificación NEC vectorizada; devuelve array de nombres de clase."""
+        return self._nec_bins()[3][self.nec_class_codes(strengths)]
+
+    def _classify_nec(self, strength: float) -> Tuple[str, str, str]:
+        """Clasificación NEC EXACTA del notebook (bisección sobre los límites precalculados)."""
+        lower, upper, labels, _ = self._nec_bins()
+        index = bisect_right(lower, strength) - 1
+        if index >= 0 and strength < upper[index]:
+            return labels[index]
+        return self.NEC_UNCLASSIFIED
     
     def get_feature_importance(self) -> Dict[str, float]:
         """Obtener importancia de características del modelo original."""
-        if not self.is_loaded or not hasattr(self.model, 'feature_importances_'):
+        importances = self.feature_importances
+        if not self.is_loaded or importances is None:
             return {}
         
         importance_dict = {}
-        for name, importance in zip(self.feature_names, self.model.feature_importances_):
+        for name, importance in zip(self.feature_names, importances):
             friendly_name = self._get_friendly_name(name)
             importance_dict[friendly_name] = round(importance, 4)
         
         return dict(sorted(importance_dict.items(), key=lambda x: x[1], reverse=True))
     
+    def get_feature_labels(self) -> Dict[str, str]:
+        """Nombre amigable de cada variable, en el orden del modelo."""
+        return {name: self._get_friendly_name(name) for name in self.feature_names}
+    
     def _get_friendly_name(self, technical_name: str) -> str:
         """Convertir nombres técnicos a nombres amigables."""
         name_mapping = {
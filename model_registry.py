@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Registro de Modelos para Comparación de Versiones
+=================================================
+
+Mantiene varias versiones del modelo cargadas a la vez y evalúa una mezcla
+(o un lote) con todas en paralelo, informando cuánto discrepan antes de
+promover un candidato a producción.
+
+- Los candidatos viven en `modelos/` como `<nombre>.pkl` (o `<nombre>.forest`)
+  con su metadata en `<nombre>.json`; `python main.py train --model
+  modelos/candidato.pkl --metadata modelos/candidato.json` genera uno.
+- Cada modelo se carga desde su artefacto .forest cuando existe: los arrays
+  se mapean en memoria y el sistema operativo comparte sus páginas entre
+  procesos. Dos entradas con los mismos archivos comparten además un único
+  handler.
+- Cada entrada puede usar su propia tabla NEC, p. ej. los umbrales
+  210/280/420 de model_handler.py frente a 140/280/420 de
+  model_handler_fixed.py, para ver también el desacuerdo en la clase.
+"""
+
+import logging
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from model_artifact import ARTIFACT_SUFFIX, default_artifact_path
+from model_handler_fixed import ConcreteModelHandler
+
+logger = logging.getLogger(__name__)
+
+MODELS_DIR = "modelos"
+PRODUCTION_NAME = "vigente"
+
+
+class ModelRegistry:
+    """Varias versiones del modelo cargadas a la vez, evaluadas en paralelo."""
+
+    def __init__(self):
+        """Crear un registro vacío."""
+        self._entries: Dict[str, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    @property
+    def names(self) -> List[str]:
+        """Nombres registrados, en orden de registro."""
+        return list(self._entries)
+
+    def handler(self, name: str) -> ConcreteModelHandler:
+        """Handler de un modelo registrado."""
+        return self._entries[name]['handler']
+
+    def register(self, name: str, model_path: Union[str, Path] = "modelo_hormigon_ecuador_v1.pkl",
+                 metadata_path: Union[str, Path] = "modelo_metadata.json",
+                 handler: Optional[ConcreteModelHandler] = None,
+                 nec_classification: Optional[Dict[Tuple[float, float], Tuple[str, str, str]]] = None
+                 ) -> ConcreteModelHandler:
+        """
+        Registrar (y cargar) una versión del modelo.
+
+        Args:
+            name: Nombre de la versión (p. ej. "vigente", "notebook")
+            model_path: Modelo .pkl o directorio .forest
+            metadata_path: Metadata del modelo
+            handler: Handler ya cargado a reutilizar (p. ej. el de la GUI)
+            nec_classification: Tabla NEC propia de esta versión (por defecto la del handler)
+
+        Returns:
+            ConcreteModelHandler: Handler de la versión
+        """
+        if name in self._entries:
+            raise ValueError(f"Ya existe un modelo registrado como '{name}'")
+
+        if handler is None:
+            # Mismo archivo y misma tabla NEC: compartir el handler ya cargado
+            handler = self._find_shared(Path(model_path), Path(metadata_path), nec_classification)
+        if handler is None:
+            handler = ConcreteModelHandler(str(model_path), str(metadata_path))
+            if not handler.is_loaded:
+                raise RuntimeError(f"No se pudo cargar el modelo '{name}' desde {model_path}")
+            if nec_classification is not None:
+                handler.NEC_CLASSIFICATION = nec_classification
+
+        self._entries[name] = {'handler': handler, 'model_path': Path(model_path),
+                               'metadata_path': Path(metadata_path)}
+        logger.info(f"Modelo '{name}' registrado (v{handler.get_model_info().get('version')})")
+        return handler
+
+    def _find_shared(self, model_path: Path, metadata_path: Path,
+                     nec_classification) -> Optional[ConcreteModelHandler]:
+        """Handler ya registrado con los mismos archivos y la misma tabla NEC."""
+        for entry in self._entries.values():
+            handler = entry['handler']
+            if (entry['model_path'].resolve() == model_path.resolve()
+                    and entry['metadata_path'].resolve() == metadata_path.resolve()
+                    and (nec_classification is None
+                         or handler.NEC_CLASSIFICATION == nec_classification)):
+                return handler
+        return None
+
+    def discover(self, directory: Union[str, Path] = MODELS_DIR) -> List[str]:
+        """
+        Registrar los candidatos de un directorio (<nombre>.pkl|.forest + <nombre>.json).
+
+        Returns:
+            List[str]: Nombres registrados
+        """
+        directory = Path(directory)
+        if not directory.is_dir():
+            return []
+
+        registered = []
+        for path in sorted(directory.iterdir()):
+            is_model = (path.suffix == '.pkl' and path.is_file()) or \
+                       (path.suffix == ARTIFACT_SUFFIX and path.is_dir())
+            metadata_path = path.with_suffix('.json')
+            if not is_model or path.stem in self._entries or not metadata_path.is_file():
+                continue
+            # Un .forest generado a partir de un .pkl lo usa el propio handler del .pkl
+            if path.suffix == ARTIFACT_SUFFIX and path.with_suffix('.pkl').is_file():
+                continue
+            try:
+                self.register(path.stem, path, metadata_path)
+                registered.append(path.stem)
+            except (RuntimeError, ValueError) as e:
+                logger.warning(f"Candidato {path} ignorado: {e}")
+        return registered
+
+    def compare(self, inputs: Union[Dict[str, float], np.ndarray, List[Dict[str, float]]],
+                names: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Evaluar una mezcla o un lote con todos los modelos en paralelo.
+
+        Args:
+            inputs: Mezcla, lista de mezclas o matriz (n, 8)
+            names: Subconjunto de modelos (por defecto todos)
+
+        Returns:
+            Dict: 'modelos', 'versiones' y, por modelo y mezcla (m, n):
+            'resistencia_kg_cm2', 'desviacion_estandar_kg_cm2',
+            'clasificacion_nec'; por mezcla (n,): 'media_kg_cm2',
+            'desacuerdo_kg_cm2' (máximo - mínimo), 'desviacion_entre_modelos_kg_cm2'
+            y 'clasificacion_coincide'
+        """
+        names = list(names or self._entries)
+        if not names:
+            raise ValueError("No hay modelos registrados")
+        if isinstance(inputs, dict):
+            inputs = [inputs]
+
+        handlers = [self.handler(name) for name in names]
+        # Un handler compartido por varias entradas se evalúa una sola vez; el
+        # motor plano trabaja en numpy y libera el GIL, los hilos corren en paralelo
+        unique = list({id(handler): handler for handler in handlers}.values())
+        with ThreadPoolExecutor(max_workers=len(unique)) as pool:
+            by_handler = dict(zip(map(id, unique), pool.map(
+                lambda handler: handler.predict_batch(inputs, with_uncertainty=True), unique)))
+        results = [by_handler[id(handler)] for handler in handlers]
+
+        strength = np.vstack([r['resistencia_predicha_kg_cm2'] for r in results])
+        classes = np.vstack([r['clasificacion_nec'] for r in results])
+        return {
+            'modelos': names,
+            'versiones': [h.get_model_info().get('version') for h in handlers],
+            'resistencia_kg_cm2': strength,
+            'desviacion_estandar_kg_cm2': np.vstack([r['desviacion_estandar_kg_cm2'] for r in results]),
+            'clasificacion_nec': classes,
+            'media_kg_cm2': np.round(strength.mean(axis=0), 2),
+            'desacuerdo_kg_cm2': np.round(strength.max(axis=0) - strength.min(axis=0), 2),
+            'desviacion_entre_modelos_kg_cm2': np.round(strength.std(axis=0), 2),
+            'clasificacion_coincide': (classes == classes[0]).all(axis=0)
+        }
+
+    def promote(self, name: str, target: str = PRODUCTION_NAME):
+        """
+        Copiar un candidato sobre los archivos de otra entrada (por defecto producción).
+
+        Cada archivo se reemplaza de forma atómica; el handler de producción
+        (y la GUI con recarga en caliente) toma el modelo nuevo tras validarlo.
+
+        Args:
+            name: Candidato a promover
+            target: Entrada cuyos archivos se reemplazan
+        """
+        from model_artifact import convert_model
+        from training_pipeline import write_atomic
+
+        source, destination = self._entries[name], self._entries[target]
+        if source['model_path'].is_dir() or destination['model_path'].is_dir():
+            raise ValueError("La promoción requiere modelos .pkl (los .forest se regeneran)")
+
+        write_atomic(destination['model_path'],
+                     lambda tmp: shutil.copyfile(source['model_path'], tmp))
+        if default_artifact_path(destination['model_path']).is_dir():
+            convert_model(destination['model_path'])
+        write_atomic(destination['metadata_path'],
+                     lambda tmp: shutil.copyfile(source['metadata_path'], tmp))
+        logger.info(f"Modelo '{name}' promovido sobre '{target}' ({destination['model_path']})")
+
+
+def default_registry(production: Optional[ConcreteModelHandler] = None,
+                     directory: Union[str, Path] = MODELS_DIR) -> ModelRegistry:
+    """
+    Registro con el modelo de producción y los candidatos de `modelos/`.
+
+    Args:
+        production: Handler de producción ya cargado (por defecto se crea uno)
+        directory: Directorio de candidatos
+    """
+    registry = ModelRegistry()
+    if production is not None:
+        registry.register(PRODUCTION_NAME, production.model_path, production.metadata_path,
+                          handler=production)
+    else:
+        registry.register(PRODUCTION_NAME)
+    registry.discover(directory)
+    return registry
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Caché LRU de Predicciones
+=========================
+
+Caché acotada (menos recientemente usada) con contadores de aciertos,
+fallos y desalojos. Las claves son tuplas de valores ya cuantizados.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class PredictionCache:
+    """Caché LRU segura entre hilos con estadísticas de uso."""
+
+    def __init__(self, max_size: int = 512):
+        """
+        Inicializar la caché.
+
+        Args:
+            max_size: Número máximo de entradas antes de desalojar
+        """
+        if max_size < 1:
+            raise ValueError("El tamaño de la caché debe ser al menos 1")
+        self.max_size = max_size
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Obtener un valor y marcarlo como recién usado (None si no existe)."""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, value: Any):
+        """Guardar un valor, desalojando el menos usado si se excede el tamaño."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Vaciar la caché (los contadores se conservan)."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        """Estadísticas de uso de la caché."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entradas': len(self._data),
+                'capacidad': self.max_size,
+                'aciertos': self.hits,
+                'fallos': self.misses,
+                'desalojos': self.evictions,
+                'tasa_aciertos': round(self.hits / total, 4) if total else 0.0
+            }
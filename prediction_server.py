@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Servicio HTTP/JSON de Predicción
+================================
+
+Expone ConcreteModelHandler en la red local para que otros sistemas (p. ej.
+el LIMS del laboratorio) consulten el modelo. El proceso principal carga el
+modelo una sola vez y luego crea N procesos hijos con fork(): todos
+atienden el mismo socket y comparten las páginas del modelo (el artefacto
+.forest está mapeado en memoria; un .pkl se comparte por copy-on-write).
+
+Rutas:
+    POST /predict          {mezcla}                       -> resultado de predict_strength
+    POST /predict/batch    {"mezclas": [{...}, ...]}      -> arrays columnares de predict_batch
+                           ("incertidumbre": true agrega desviación e intervalo)
+    GET  /stats            latencia p50/p99 y rendimiento de todos los procesos
+    GET  /health           estado del servicio
+
+Uso:
+    python main.py serve --port 8765 --workers 4
+    python main.py serve --async --max-wait-ms 2 --max-batch 64   (ver micro_batching)
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import signal
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing.sharedctypes import RawArray
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+
+class LatencyStats:
+    """
+    Contadores de latencia compartidos entre procesos.
+
+    Cada proceso escribe solo en su propia ranura (anillo con las últimas
+    latencias y contadores) de una memoria compartida creada antes de
+    fork(), por lo que /stats puede agregar todos los procesos sin
+    comunicación adicional.
+    """
+
+    def __init__(self, n_slots: int = 1, ring_size: int = 4096):
+        """
+        Inicializar los contadores.
+
+        Args:
+            n_slots: Número de procesos que registran latencias
+            ring_size: Latencias recientes guardadas por proceso
+        """
+        self.n_slots = n_slots
+        self.ring_size = ring_size
+        self.started_at = time.time()
+        self._latencies = RawArray('d', n_slots * ring_size)
+        # Por ranura: solicitudes, errores
+        self._counters = RawArray('q', n_slots * 2)
+        self._lock = threading.Lock()
+
+    def record(self, slot: int, seconds: float, error: bool = False):
+        """Registrar una solicitud atendida por el proceso `slot`."""
+        with self._lock:
+            count = self._counters[2 * slot]
+            self._latencies[slot * self.ring_size + count % self.ring_size] = seconds
+            self._counters[2 * slot] = count + 1
+            if error:
+                self._counters[2 * slot + 1] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Latencias p50/p99 y rendimiento agregados de todas las ranuras."""
+        latencies = np.frombuffer(self._latencies, dtype=np.float64).reshape(self.n_slots, self.ring_size)
+        counters = np.frombuffer(self._counters, dtype=np.int64).reshape(self.n_slots, 2)
+
+        recent = np.concatenate([latencies[slot, :min(counters[slot, 0], self.ring_size)]
+                                 for slot in range(self.n_slots)])
+        total = int(counters[:, 0].sum())
+        uptime = time.time() - self.started_at
+
+        return {
+            'solicitudes': total,
+            'errores': int(counters[:, 1].sum()),
+            'solicitudes_por_proceso': [int(c) for c in counters[:, 0]],
+            'latencia_p50_ms': round(float(np.percentile(recent, 50)) * 1000, 3) if len(recent) else None,
+            'latencia_p99_ms': round(float(np.percentile(recent, 99)) * 1000, 3) if len(recent) else None,
+            'rendimiento_rps': round(total / uptime, 2) if uptime > 0 else 0.0,
+            'segundos_activo': round(uptime, 1)
+        }
+
+
+def to_jsonable(value: Any) -> Any:
+    """Convertir arrays y escalares de numpy a JSON (NaN -> null)."""
+    if isinstance(value, dict):
+        return {k: to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, np.ndarray):
+        return [to_jsonable(v) for v in value.tolist()]
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(v) for v in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+class PredictionHTTPServer(ThreadingHTTPServer):
+    """Servidor HTTP con el handler del modelo y los contadores compartidos."""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], model_handler, stats: LatencyStats,
+                 slot: int = 0):
+        """
+        Crear el servidor y abrir el socket.
+
+        Args:
+            address: (host, puerto); puerto 0 elige uno libre
+            model_handler: ConcreteModelHandler ya cargado
+            stats: Contadores compartidos
+            slot: Ranura de este proceso en stats
+        """
+        super().__init__(address, PredictionRequestHandler)
+        self.model_handler = model_handler
+        self.stats = stats
+        self.slot = slot
+
+
+class PredictionRequestHandler(BaseHTTPRequestHandler):
+    """Rutas JSON del servicio de predicción."""
+
+    server_version = "ConcretePredictor/1.0"
+
+    def do_GET(self):
+        if self.path == '/stats':
+            stats = self.server.stats.snapshot()
+            stats['cache_proceso'] = self.server.model_handler.prediction_cache.stats()
+            self._send_json(200, stats)
+        elif self.path == '/health':
+            self._send_json(200, {'estado': 'ok', 'pid': os.getpid(),
+                                  'modelo_sha256': self.server.model_handler.model_hash})
+        else:
+            self._send_json(404, {'error': f"Ruta no encontrada: {self.path}"})
+
+    def do_POST(self):
+        routes = {'/predict': self._predict, '/predict/batch': self._predict_batch}
+        route = routes.get(self.path)
+        if route is None:
+            self._send_json(404, {'error': f"Ruta no encontrada: {self.path}"})
+            return
+
+        start = time.perf_counter()
+        status = 500
+        try:
+            payload = self._read_json()
+            status, body = 200, route(payload)
+        except (ValueError, KeyError, TypeError) as e:
+            status, body = 400, {'error': str(e)}
+        except Exception as e:
+            logger.error(f"Error atendiendo {self.path}: {e}")
+            body = {'error': str(e)}
+        finally:
+            self.server.stats.record(self.server.slot, time.perf_counter() - start,
+                                     error=status != 200)
+        self._send_json(status, body)
+
+    def _predict(self, payload: Any) -> Dict[str, Any]:
+        if not isinstance(payload, dict):
+            raise ValueError("Se esperaba un objeto JSON con las variables de la mezcla")
+        inputs = {name: float(value) for name, value in payload.items()}
+        return self.server.model_handler.predict_strength(inputs)
+
+    def _predict_batch(self, payload: Any) -> Dict[str, Any]:
+        mixes = payload.get('mezclas') if isinstance(payload, dict) else payload
+        if not isinstance(mixes, list) or not mixes:
+            raise ValueError("Se esperaba {\"mezclas\": [ {...}, ... ]} con al menos una mezcla")
+        with_uncertainty = isinstance(payload, dict) and bool(payload.get('incertidumbre'))
+        return self.server.model_handler.predict_batch(mixes, with_uncertainty=with_uncertainty)
+
+    def _read_json(self) -> Any:
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_BODY_BYTES:
+            raise ValueError(f"Cuerpo demasiado grande ({length} bytes)")
+        try:
+            return json.loads(self.rfile.read(length) or b'null')
+        except json.JSONDecodeError as e:
+            raise ValueError(f"JSON inválido: {e}") from e
+
+    def _send_json(self, status: int, body: Dict[str, Any]):
+        data = json.dumps(to_jsonable(body), ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args):
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, workers: int = 1,
+          model_handler=None):
+    """
+    Cargar el modelo una vez y atender solicitudes hasta recibir SIGINT/SIGTERM.
+
+    Con workers > 1 (y fork disponible) el proceso principal abre el socket
+    y crea un proceso hijo por worker; en Windows se usa un solo proceso
+    con hilos.
+
+    Args:
+        host: Interfaz de escucha ("0.0.0.0" para toda la red local)
+        port: Puerto TCP
+        workers: Procesos que atienden solicitudes
+        model_handler: ConcreteModelHandler (por defecto se crea uno)
+    """
+    if model_handler is None:
+        from model_handler_fixed import ConcreteModelHandler
+        model_handler = ConcreteModelHandler()
+    if not model_handler.is_loaded:
+        raise RuntimeError("Modelo no cargado correctamente")
+
+    if workers > 1 and not hasattr(os, 'fork'):
+        logger.warning("fork() no disponible: se usa un solo proceso")
+        workers = 1
+
+    stats = LatencyStats(n_slots=workers)
+    server = PredictionHTTPServer((host, port), model_handler, stats)
+    logger.info(f"Servicio de prediccion en http://{host}:{server.server_address[1]} "
+                f"({workers} proceso(s))")
+
+    if workers == 1:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        return
+
+    # Socket no bloqueante: el proceso que pierde la carrera por accept() vuelve a esperar
+    server.socket.setblocking(False)
+    children: List[int] = []
+    for slot in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            server.slot = slot
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                os._exit(0)
+        children.append(pid)
+
+    def _stop_children(signum, frame):
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, _stop_children)
+    try:
+        for pid in children:
+            os.waitpid(pid, 0)
+    except KeyboardInterrupt:
+        _stop_children(signal.SIGINT, None)
+        for pid in children:
+            os.waitpid(pid, 0)
+    finally:
+        server.server_close()
+        logger.info("Servicio de prediccion detenido")
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    """Argumentos del servicio HTTP."""
+    parser = argparse.ArgumentParser(prog="main.py serve",
+                                     description="Servicio HTTP/JSON de predicción")
+    parser.add_argument('--host', default=DEFAULT_HOST,
+                        help=f"Interfaz de escucha (por defecto {DEFAULT_HOST})")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT,
+                        help=f"Puerto (por defecto {DEFAULT_PORT})")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="Procesos que atienden solicitudes (por defecto uno por CPU)")
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help="Bucle asyncio de un proceso con micro-lotes en /predict")
+    parser.add_argument('--max-wait-ms', type=float, default=2.0,
+                        help="Espera máxima para completar un micro-lote (--async)")
+    parser.add_argument('--max-batch', type=int, default=64,
+                        help="Filas máximas por micro-lote (--async)")
+    parser.add_argument('--model', default="modelo_hormigon_ecuador_v1.pkl",
+                        help="Modelo .pkl o directorio .forest")
+    parser.add_argument('--metadata', default="modelo_metadata.json",
+                        help="Archivo de metadata del modelo")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada de `python main.py serve`."""
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+
+    from model_handler_fixed import ConcreteModelHandler
+    handler = ConcreteModelHandler(args.model, args.metadata)
+    if not handler.is_loaded:
+        print("ERROR: No se pudo cargar el modelo")
+        return 1
+
+    if args.use_async:
+        from micro_batching import serve_async
+        print(f"=> Servicio de prediccion asincrono en http://{args.host}:{args.port} "
+              f"(micro-lotes de {args.max_batch} filas / {args.max_wait_ms} ms). Ctrl+C para detener.")
+        serve_async(args.host, args.port, handler, args.max_wait_ms, args.max_batch)
+        return 0
+
+    print(f"=> Servicio de prediccion en http://{args.host}:{args.port} "
+          f"({max(args.workers, 1)} procesos). Ctrl+C para detener.")
+    serve(args.host, args.port, max(args.workers, 1), handler)
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+    sys.exit(main())
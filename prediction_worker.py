@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Hilo de Predicción en Segundo Plano
+===================================
+
+Ejecuta predict_strength (o cualquier trabajo de la GUI, como rasterizar
+gráficos) fuera del hilo de la GUI. Solo se conserva la solicitud más
+reciente: si llegan varias mientras el hilo está ocupado, las intermedias
+se descartan sin calcularse.
+"""
+
+import logging
+from functools import partial
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from PyQt6.QtCore import QThread, QMutex, QMutexLocker, QWaitCondition, pyqtSignal
+
+logger = logging.getLogger(__name__)
+
+
+class PredictionWorker(QThread):
+    """Hilo que procesa la última solicitud de predicción pendiente."""
+
+    # (id de solicitud, resultado del trabajo)
+    resultReady = pyqtSignal(int, object)
+    # (id de solicitud, mensaje de error)
+    predictionFailed = pyqtSignal(int, str)
+
+    def __init__(self, model_handler, parent=None):
+        """
+        Inicializar el hilo.
+
+        Args:
+            model_handler: ConcreteModelHandler compartido con la GUI
+            parent: QObject padre
+        """
+        super().__init__(parent)
+        self.model_handler = model_handler
+        self._mutex = QMutex()
+        self._condition = QWaitCondition()
+        self._pending: Optional[Tuple[int, Callable[[], Any]]] = None
+        self._stopping = False
+        self.dropped_requests = 0
+
+    def submit(self, request_id: int, inputs: Dict[str, float]):
+        """
+        Encolar una predicción, reemplazando la pendiente si existe.
+
+        Args:
+            request_id: Identificador creciente de la solicitud
+            inputs: Valores de la mezcla
+        """
+        self.submit_job(request_id, partial(self.model_handler.predict_strength, dict(inputs)))
+
+    def submit_job(self, request_id: int, job: Callable[[], Any]):
+        """
+        Encolar un trabajo arbitrario; no debe tocar widgets de Qt.
+
+        Args:
+            request_id: Identificador creciente de la solicitud
+            job: Función sin argumentos cuyo resultado se emite en resultReady
+        """
+        with QMutexLocker(self._mutex):
+            if self._pending is not None:
+                self.dropped_requests += 1
+            self._pending = (request_id, job)
+            self._condition.wakeOne()
+
+        if not self.isRunning():
+            self._stopping = False
+            self.start()
+
+    def stop(self, timeout_ms: int = 2000):
+        """Detener el hilo y esperar a que termine."""
+        with QMutexLocker(self._mutex):
+            self._stopping = True
+            self._pending = None
+            self._condition.wakeAll()
+        self.wait(timeout_ms)
+
+    def run(self):
+        """Bucle del hilo: esperar solicitud, procesar la más reciente, emitir."""
+        while True:
+            self._mutex.lock()
+            while self._pending is None and not self._stopping:
+                self._condition.wait(self._mutex)
+            if self._stopping:
+                self._mutex.unlock()
+                return
+            request_id, job = self._pending
+            self._pending = None
+            self._mutex.unlock()
+
+            try:
+                result = job()
+                self.resultReady.emit(request_id, result)
+            except Exception as e:
+                logger.error(f"Error en prediccion en segundo plano: {e}")
+                self.predictionFailed.emit(request_id, str(e))
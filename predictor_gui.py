@@ -8,44 +8,165 @@ para la predicción de resistencia del hormigón.
 """
 
 import sys
+import time
 import logging
-from typing import Dict, Any, Optional
+from functools import partial
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
                            QSplitter, QGroupBox, QLabel, QPushButton, QComboBox,
-                           QFrame, QScrollArea, QTabWidget, QTableWidget, 
-                           QTableWidgetItem, QFileDialog, QMessageBox, QStatusBar,
-                           QMenuBar, QMenu, QApplication)
+                           QFrame, QScrollArea, QTabWidget, QTableView, QTableWidget,
+                           QTableWidgetItem,
+                           QHeaderView, QFileDialog, QMessageBox, QStatusBar,
+                           QMenuBar, QMenu, QApplication, QCheckBox)
 from PyQt6.QtCore import Qt, QTimer, QThread, pyqtSignal
 from PyQt6.QtGui import QFont, QPixmap, QIcon, QAction
 
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-import pandas as pd
-import numpy as np
-import seaborn as sns
+# matplotlib y pandas se importan al usarse por primera vez (arranque rápido)
 
 from model_handler_fixed import ConcreteModelHandler
-from ui_components import SliderSpinBoxWidget, CircularGauge, StatusCard, LogTextEdit
+from model_registry import ModelRegistry, PRODUCTION_NAME
+from prediction_worker import PredictionWorker
+from history_model import HistoryTableModel, HISTORY_FEATURES
+from history_store import HistoryStore
+from timing_spans import TIMING, span
+from ui_components import (SliderSpinBoxWidget, CircularGauge, StatusCard, LogTextEdit,
+                           ChartImageLabel, TimingDialog)
 from styles import get_complete_stylesheet, COLORS
 
 logger = logging.getLogger(__name__)
 
+
+def _prediction_job(model_handler: ConcreteModelHandler, inputs: Dict[str, float],
+                    chart_size: Tuple[int, int]) -> Dict[str, Any]:
+    """Predicción + rasterizado del gráfico; se ejecuta en el hilo de trabajo."""
+    from chart_rendering import render_results_chart
+    
+    result = model_handler.predict_strength(inputs)
+    with span("gui.grafico_resultados"):
+        image = render_results_chart(result['resistencia_predicha_kg_cm2'], *chart_size)
+    return {'inputs': inputs, 'result': result, 'image': image}
+
+
+def _sweep_job(model_handler: ConcreteModelHandler, inputs: Dict[str, float],
+               x_feature: str, y_feature: Optional[str],
+               chart_size: Tuple[int, int]) -> Dict[str, Any]:
+    """Barrido en una llamada al modelo + rasterizado; se ejecuta en el hilo de trabajo."""
+    from chart_rendering import render_sweep_chart
+    
+    sweep = model_handler.sweep(inputs, x_feature, y_feature=y_feature)
+    image = render_sweep_chart(sweep, inputs, model_handler.get_feature_labels(), *chart_size)
+    return {'sweep': sweep, 'image': image}
+
+
+def _age_curve_job(model_handler: ConcreteModelHandler,
+                   mixes: List[Tuple[str, Dict[str, float]]],
+                   chart_size: Tuple[int, int]) -> Dict[str, Any]:
+    """Curvas de edad (una llamada al modelo por mezcla, memorizadas) + rasterizado."""
+    from chart_rendering import render_age_curves
+    
+    curves = []
+    for label, inputs in mixes:
+        curve = model_handler.predict_age_curve(inputs)
+        curves.append((label, curve['edades_dias'], curve['resistencia_kg_cm2']))
+    return {'curves': curves, 'image': render_age_curves(curves, *chart_size)}
+
+
+def _neighbor_job(model_handler: ConcreteModelHandler, inputs: Dict[str, float],
+                  k: int) -> Dict[str, Any]:
+    """Ensayos de laboratorio más cercanos (el índice se carga en el primer trabajo)."""
+    with span("gui.vecinos"):
+        return model_handler.check_extrapolation(inputs, k=k)
+
+
+def _comparison_job(registry: ModelRegistry, inputs: Dict[str, float],
+                    discover: bool) -> Dict[str, Any]:
+    """Cargar candidatos (la primera vez) y evaluar la mezcla con todos los modelos."""
+    if discover:
+        registry.discover()
+    return registry.compare(inputs)
+
+
 class ConcreteStrengthPredictor(QMainWindow):
     """Ventana principal del predictor de resistencia de hormigón."""
     
-    def __init__(self):
-        """Inicializar la ventana principal."""
+    # Resultado de una recarga en caliente (emitida desde el hilo vigilante)
+    modelReloaded = pyqtSignal(object)
+    
+    # Espera tras el último movimiento de slider antes de predecir en vivo
+    LIVE_DEBOUNCE_MS = 150
+    
+    # Ensayos de laboratorio más parecidos mostrados junto al gauge
+    NEIGHBOR_COUNT = 5
+    
+    # Filas del historial guardado que se cargan por página
+    HISTORY_PAGE_SIZE = 500
+    
+    # Mezclas recientes del historial superpuestas en la curva de edad
+    AGE_CURVE_HISTORY_MIXES = 4
+    
+    def __init__(self, model_handler: Optional[ConcreteModelHandler] = None,
+                 history_store: Optional[HistoryStore] = None,
+                 watch_model: bool = True,
+                 model_registry: Optional[ModelRegistry] = None):
+        """
+        Inicializar la ventana principal.
+        
+        Args:
+            model_handler: Manejador ya cargado (por defecto se crea uno)
+            history_store: Historial persistente (por defecto historial_predicciones.db)
+            watch_model: Recargar el modelo en caliente cuando cambie su archivo
+            model_registry: Modelos a comparar (por defecto el vigente y los de modelos/)
+        """
         super().__init__()
         
         # Inicializar modelo
-        self.model_handler = ConcreteModelHandler()
+        self.model_handler = model_handler or ConcreteModelHandler()
         
         # Variables de estado
         self.current_prediction = None
-        self.prediction_history = []
+        self.current_neighbors = None
+        self.history_store = history_store or HistoryStore()
+        self.history_model = HistoryTableModel(self)
+        
+        # Predicción en vivo: debounce + hilo en segundo plano
+        self._live_request_id = 0
+        self.live_worker = PredictionWorker(self.model_handler, self)
+        self.live_timer = QTimer(self)
+        self.live_timer.setSingleShot(True)
+        self.live_timer.setInterval(self.LIVE_DEBOUNCE_MS)
+        
+        # Botón Predecir: inferencia y gráfico en segundo plano
+        self._predict_request_id = 0
+        self._predict_submitted_at: Optional[float] = None
+        self._timing_dialog = None
+        self.predict_worker = PredictionWorker(self.model_handler, self)
+        
+        # Redibujado del gráfico (F5): hilo propio para no descartar un Predecir pendiente
+        self._chart_request_id = 0
+        self.chart_worker = PredictionWorker(self.model_handler, self)
+        
+        # Curvas de respuesta de la pestaña Análisis
+        self._sweep_request_id = 0
+        self._sweep_outdated = False
+        self.analysis_worker = PredictionWorker(self.model_handler, self)
+        self._age_curve_request_id = 0
+        self.age_curve_worker = PredictionWorker(self.model_handler, self)
+        
+        # Comparación de versiones del modelo (candidatos de modelos/ al abrir Análisis)
+        self._discover_models = model_registry is None
+        if model_registry is None:
+            model_registry = ModelRegistry()
+            model_registry.register(PRODUCTION_NAME, self.model_handler.model_path,
+                                    self.model_handler.metadata_path, handler=self.model_handler)
+        self.model_registry = model_registry
+        self._comparison_request_id = 0
+        self.comparison_worker = PredictionWorker(self.model_handler, self)
+        
+        # Distancia a los ensayos de laboratorio, junto a cada predicción
+        self._neighbor_request_id = 0
+        self.neighbor_worker = PredictionWorker(self.model_handler, self)
         
         # Configurar ventana
         self._setup_window()
@@ -56,6 +177,14 @@ class ConcreteStrengthPredictor(QMainWindow):
         # Inicializar con valores por defecto
         self._load_default_values()
         
+        # Primera página del historial guardado
+        self._load_history_page()
+        
+        # Recarga en caliente: el vigilante notifica por señal al hilo de la GUI
+        self.modelReloaded.connect(self._on_model_reloaded)
+        if watch_model:
+            self.model_handler.start_watching(on_reload=self.modelReloaded.emit)
+        
         logger.info("Ventana principal inicializada")
     
     def _setup_window(self):
@@ -205,6 +334,11 @@ class ConcreteStrengthPredictor(QMainWindow):
                                   list(self.model_handler.get_preset_mixes().keys()))
         presets_layout.addWidget(self.presets_combo)
         
+        self.live_checkbox = QCheckBox("⚡ Predicción en vivo al mover los controles")
+        self.live_checkbox.setChecked(True)
+        self.live_checkbox.setToolTip("Actualiza el medidor y las tarjetas sin pulsar 'Predecir'")
+        presets_layout.addWidget(self.live_checkbox)
+        
         # Botones de acción
         buttons_layout = QHBoxLayout()
         
@@ -240,8 +374,8 @@ class ConcreteStrengthPredictor(QMainWindow):
         self.tabs.addTab(results_tab, "📊 Resultados")
         
         # Tab 2: Análisis avanzado
-        analysis_tab = self._create_analysis_tab()
-        self.tabs.addTab(analysis_tab, "🔬 Análisis")
+        self.analysis_tab = self._create_analysis_tab()
+        self.tabs.addTab(self.analysis_tab, "🔬 Análisis")
         
         # Tab 3: Historial
         history_tab = self._create_history_tab()
@@ -286,7 +420,7 @@ class ConcreteStrengthPredictor(QMainWindow):
         )
         
         self.confidence_card = StatusCard(
-            "Confianza", "--%", "Fiabilidad del modelo"
+            "Confianza", "--%", "Dispersión entre árboles"
         )
         
         # Organizar en cuadrícula 2x2 estética:
@@ -301,10 +435,31 @@ class ConcreteStrengthPredictor(QMainWindow):
         cards_widget = QWidget()
         cards_widget.setLayout(cards_layout)
         info_layout.addWidget(cards_widget)
+        
+        # Alerta de extrapolación: mezcla lejos de todo ensayo de laboratorio
+        self.extrapolation_label = QLabel()
+        self.extrapolation_label.setProperty("labelType", "warning")
+        self.extrapolation_label.setWordWrap(True)
+        self.extrapolation_label.hide()
+        info_layout.addWidget(self.extrapolation_label)
         info_layout.addStretch()
         
         result_layout.addLayout(info_layout)
         
+        # Ensayos de laboratorio más parecidos a la mezcla, como evidencia
+        neighbors_layout = QVBoxLayout()
+        neighbors_label = QLabel("Ensayos de laboratorio más parecidos")
+        neighbors_label.setProperty("labelType", "caption")
+        neighbors_layout.addWidget(neighbors_label)
+        self.neighbors_table = QTableWidget(0, 4)
+        self.neighbors_table.setHorizontalHeaderLabels(["Dist.", "kg/cm²", "Días", "A/C"])
+        self.neighbors_table.verticalHeader().setVisible(False)
+        self.neighbors_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.neighbors_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.neighbors_table.setFixedWidth(250)
+        neighbors_layout.addWidget(self.neighbors_table)
+        result_layout.addLayout(neighbors_layout)
+        
         layout.addWidget(result_section)
         
         # Sección inferior: Gráficos
@@ -312,10 +467,9 @@ class ConcreteStrengthPredictor(QMainWindow):
         charts_section.setProperty("frameType", "card")
         charts_layout = QVBoxLayout(charts_section)
         
-        # Crear figura de matplotlib
-        self.results_figure = Figure(figsize=(10, 6), facecolor='white')
-        self.results_canvas = FigureCanvas(self.results_figure)
-        charts_layout.addWidget(self.results_canvas)
+        # Gráfico renderizado en segundo plano (solo se muestra la imagen)
+        self.results_chart = ChartImageLabel("El gráfico aparecerá tras la primera predicción")
+        charts_layout.addWidget(self.results_chart)
         
         layout.addWidget(charts_section)
         
@@ -323,8 +477,8 @@ class ConcreteStrengthPredictor(QMainWindow):
     
     def _create_analysis_tab(self) -> QWidget:
         """Crear tab de análisis avanzado."""
-        tab = QWidget()
-        layout = QVBoxLayout(tab)
+        content = QWidget()
+        layout = QVBoxLayout(content)
         layout.setSpacing(16)
         
         # Información del modelo
@@ -362,25 +516,231 @@ class ConcreteStrengthPredictor(QMainWindow):
         model_layout.addLayout(model_cards_layout)
         layout.addWidget(model_info_frame)
         
-        # Gráfico de feature importance
+        # Curvas de respuesta: barrido de una o dos variables alrededor de la mezcla actual
+        sweep_frame = QFrame()
+        sweep_frame.setProperty("frameType", "card")
+        sweep_layout = QVBoxLayout(sweep_frame)
+        
+        sweep_controls = QHBoxLayout()
+        sweep_label = QLabel("Curvas de Respuesta")
+        sweep_label.setProperty("labelType", "subtitle")
+        sweep_controls.addWidget(sweep_label)
+        sweep_controls.addStretch()
+        
+        self.sweep_x_combo = QComboBox()
+        self.sweep_y_combo = QComboBox()
+        self.sweep_y_combo.addItem("— Ninguna (curva) —", None)
+        for feature, label in self.model_handler.get_feature_labels().items():
+            self.sweep_x_combo.addItem(label, feature)
+            self.sweep_y_combo.addItem(label, feature)
+        self.sweep_x_combo.setCurrentIndex(self.sweep_x_combo.findData('Agua_kg_m3'))
+        
+        self.sweep_button = QPushButton("📈 Calcular")
+        self.sweep_button.setProperty("buttonType", "secondary")
+        
+        sweep_controls.addWidget(QLabel("Eje X:"))
+        sweep_controls.addWidget(self.sweep_x_combo)
+        sweep_controls.addWidget(QLabel("Eje Y:"))
+        sweep_controls.addWidget(self.sweep_y_combo)
+        sweep_controls.addWidget(self.sweep_button)
+        sweep_layout.addLayout(sweep_controls)
+        
+        self.sweep_chart = ChartImageLabel("Seleccione las variables y pulse Calcular")
+        self.sweep_chart.setMinimumHeight(350)
+        sweep_layout.addWidget(self.sweep_chart)
+        
+        layout.addWidget(sweep_frame)
+        
+        # Desarrollo de resistencia con la edad (mezcla actual + historial reciente)
+        age_frame = QFrame()
+        age_frame.setProperty("frameType", "card")
+        age_layout = QVBoxLayout(age_frame)
+        
+        age_controls = QHBoxLayout()
+        age_label = QLabel("Desarrollo de Resistencia")
+        age_label.setProperty("labelType", "subtitle")
+        age_controls.addWidget(age_label)
+        age_controls.addStretch()
+        
+        self.age_curve_button = QPushButton("🔄 Actualizar")
+        self.age_curve_button.setProperty("buttonType", "secondary")
+        age_controls.addWidget(self.age_curve_button)
+        age_layout.addLayout(age_controls)
+        
+        self.age_curve_chart = ChartImageLabel("Curva de la mezcla actual y del historial reciente")
+        self.age_curve_chart.setMinimumHeight(320)
+        age_layout.addWidget(self.age_curve_chart)
+        
+        layout.addWidget(age_frame)
+        
+        # Misma mezcla evaluada con todas las versiones registradas
+        comparison_frame = QFrame()
+        comparison_frame.setProperty("frameType", "card")
+        comparison_layout = QVBoxLayout(comparison_frame)
+        
+        comparison_controls = QHBoxLayout()
+        comparison_label = QLabel("Comparación de Modelos")
+        comparison_label.setProperty("labelType", "subtitle")
+        comparison_controls.addWidget(comparison_label)
+        comparison_controls.addStretch()
+        self.comparison_button = QPushButton("⚖️ Comparar")
+        self.comparison_button.setProperty("buttonType", "secondary")
+        comparison_controls.addWidget(self.comparison_button)
+        comparison_layout.addLayout(comparison_controls)
+        
+        self.comparison_table = QTableWidget(0, 6)
+        self.comparison_table.setHorizontalHeaderLabels(
+            ["Modelo", "Versión", "Resistencia (kg/cm²)", "± Desv.", "Clase NEC", "Δ vs vigente"])
+        self.comparison_table.verticalHeader().setVisible(False)
+        self.comparison_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.comparison_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.comparison_table.setMinimumHeight(140)
+        comparison_layout.addWidget(self.comparison_table)
+        
+        self.comparison_summary = QLabel(
+            "Coloque candidatos en modelos/ (<nombre>.pkl + <nombre>.json) para compararlos")
+        self.comparison_summary.setWordWrap(True)
+        comparison_layout.addWidget(self.comparison_summary)
+        
+        layout.addWidget(comparison_frame)
+        
+        # Gráfico de feature importance (se crea al abrir la pestaña)
         importance_frame = QFrame()
         importance_frame.setProperty("frameType", "card")
-        importance_layout = QVBoxLayout(importance_frame)
+        self.importance_layout = QVBoxLayout(importance_frame)
         
         importance_label = QLabel("Importancia de Variables")
         importance_label.setProperty("labelType", "subtitle")
-        importance_layout.addWidget(importance_label)
+        self.importance_layout.addWidget(importance_label)
         
-        self.importance_figure = Figure(figsize=(10, 6), facecolor='white')
-        self.importance_canvas = FigureCanvas(self.importance_figure)
-        importance_layout.addWidget(self.importance_canvas)
+        self.importance_figure = None
+        self.importance_canvas = None
         
         layout.addWidget(importance_frame)
         
-        # Crear gráfico de importancia inicial
+        # Varios gráficos: la pestaña se desplaza verticalmente
+        tab = QScrollArea()
+        tab.setWidgetResizable(True)
+        tab.setFrameShape(QFrame.Shape.NoFrame)
+        tab.setWidget(content)
+        return tab
+    
+    def _ensure_importance_chart(self):
+        """Crear el gráfico de importancia (importa matplotlib) la primera vez."""
+        if self.importance_canvas is not None:
+            return
+        
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+        from matplotlib.figure import Figure
+        
+        self.importance_figure = Figure(figsize=(10, 6), facecolor='white')
+        self.importance_canvas = FigureCanvas(self.importance_figure)
+        self.importance_canvas.setMinimumHeight(350)
+        self.importance_layout.addWidget(self.importance_canvas)
         self._plot_feature_importance()
+    
+    def _on_tab_changed(self, index: int):
+        """Construir contenido pesado de las pestañas al mostrarse por primera vez."""
+        if self.tabs.widget(index) is self.analysis_tab:
+            self._ensure_importance_chart()
+            if self._sweep_request_id == 0 or self._sweep_outdated:
+                self._sweep_outdated = False
+                self._compute_sweep()
+            self._compute_age_curves()
+            self._compute_comparison()
+    
+    def _compute_sweep(self):
+        """Calcular y dibujar el barrido seleccionado en segundo plano."""
+        x_feature = self.sweep_x_combo.currentData()
+        y_feature = self.sweep_y_combo.currentData()
+        if x_feature == y_feature:
+            self.status_bar.showMessage("⚠️ Elija dos variables distintas para el mapa")
+            return
         
-        return tab
+        self._sweep_request_id += 1
+        job = partial(_sweep_job, self.model_handler, self._get_current_inputs(),
+                      x_feature, y_feature, self.sweep_chart.chart_size())
+        self.analysis_worker.submit_job(self._sweep_request_id, job)
+    
+    def _compute_age_curves(self):
+        """Curvas de edad de la mezcla actual y de las últimas del historial."""
+        mixes = [("Mezcla actual", self._get_current_inputs())]
+        timestamps, values = self.history_store.page(0, self.AGE_CURVE_HISTORY_MIXES)
+        for timestamp, row in zip(timestamps, values):
+            label = f"{timestamp[:16].replace('T', ' ')} ({row[0]:.0f} kg/cm²)"
+            mixes.append((label, dict(zip(HISTORY_FEATURES, row[1:]))))
+        
+        self._age_curve_request_id += 1
+        job = partial(_age_curve_job, self.model_handler, mixes, self.age_curve_chart.chart_size())
+        self.age_curve_worker.submit_job(self._age_curve_request_id, job)
+    
+    def _on_age_curves_ready(self, request_id: int, payload: Dict[str, Any]):
+        """Mostrar las curvas de edad más recientes."""
+        if request_id == self._age_curve_request_id:
+            self.age_curve_chart.set_image(payload['image'])
+    
+    def _on_age_curves_failed(self, request_id: int, message: str):
+        """Informar un error de las curvas de edad."""
+        if request_id == self._age_curve_request_id:
+            self.status_bar.showMessage(f"❌ Error en curvas de edad: {message}")
+    
+    def _compute_comparison(self):
+        """Evaluar la mezcla actual con todos los modelos registrados en segundo plano."""
+        self._comparison_request_id += 1
+        job = partial(_comparison_job, self.model_registry, self._get_current_inputs(),
+                      self._discover_models)
+        self._discover_models = False
+        self.comparison_worker.submit_job(self._comparison_request_id, job)
+    
+    def _on_comparison_ready(self, request_id: int, comparison: Dict[str, Any]):
+        """Llenar la tabla de comparación y resumir el desacuerdo."""
+        if request_id != self._comparison_request_id:
+            return
+        
+        names = comparison['modelos']
+        strengths = comparison['resistencia_kg_cm2'][:, 0]
+        classes = comparison['clasificacion_nec'][:, 0]
+        reference = names.index(PRODUCTION_NAME) if PRODUCTION_NAME in names else 0
+        
+        self.comparison_table.setRowCount(len(names))
+        for row, name in enumerate(names):
+            delta = strengths[row] - strengths[reference]
+            cells = [name, str(comparison['versiones'][row]), f"{strengths[row]:.2f}",
+                     f"{comparison['desviacion_estandar_kg_cm2'][row, 0]:.2f}", str(classes[row]),
+                     "—" if row == reference else f"{delta:+.2f}"]
+            for column, text in enumerate(cells):
+                item = QTableWidgetItem(text)
+                if classes[row] != classes[reference]:
+                    item.setForeground(Qt.GlobalColor.red)
+                self.comparison_table.setItem(row, column, item)
+        
+        if len(names) < 2:
+            self.comparison_summary.setText(
+                "Solo el modelo vigente está registrado. Coloque candidatos en modelos/ "
+                "(<nombre>.pkl + <nombre>.json) para compararlos")
+            return
+        agreement = ("todos coinciden en la clase NEC" if comparison['clasificacion_coincide'][0]
+                     else "⚠️ los modelos no coinciden en la clase NEC")
+        self.comparison_summary.setText(
+            f"Desacuerdo: {comparison['desacuerdo_kg_cm2'][0]:.2f} kg/cm² (máx − mín), "
+            f"desviación entre modelos {comparison['desviacion_entre_modelos_kg_cm2'][0]:.2f} "
+            f"kg/cm²; {agreement}")
+    
+    def _on_comparison_failed(self, request_id: int, message: str):
+        """Informar un error de la comparación de modelos."""
+        if request_id == self._comparison_request_id:
+            self.status_bar.showMessage(f"❌ Error comparando modelos: {message}")
+    
+    def _on_sweep_ready(self, request_id: int, payload: Dict[str, Any]):
+        """Mostrar el barrido más reciente."""
+        if request_id != self._sweep_request_id:
+            return
+        self.sweep_chart.set_image(payload['image'])
+    
+    def _on_sweep_failed(self, request_id: int, message: str):
+        """Informar un error del barrido."""
+        if request_id == self._sweep_request_id:
+            self.status_bar.showMessage(f"❌ Error en curva de respuesta: {message}")
     
     def _create_history_tab(self) -> QWidget:
         """Crear tab de historial de predicciones."""
@@ -397,6 +757,13 @@ class ConcreteStrengthPredictor(QMainWindow):
         
         controls_layout.addStretch()
         
+        self.history_count_label = QLabel()
+        controls_layout.addWidget(self.history_count_label)
+        
+        self.load_more_button = QPushButton("⬇️ Cargar más")
+        self.load_more_button.setProperty("buttonType", "secondary")
+        controls_layout.addWidget(self.load_more_button)
+        
         # Botones de exportación
         self.export_csv_button = QPushButton("📁 Exportar CSV")
         self.export_csv_button.setProperty("buttonType", "secondary")
@@ -409,18 +776,16 @@ class ConcreteStrengthPredictor(QMainWindow):
         
         layout.addLayout(controls_layout)
         
-        # Tabla de historial
-        self.history_table = QTableWidget()
-        self.history_table.setColumnCount(10)
-        
-        headers = [
-            "Fecha/Hora", "Resistencia (kg/cm²)", "Cemento", "Agua", 
-            "Escoria", "Ceniza V.", "Superplast.", "A. Grueso", 
-            "A. Fino", "Edad (días)"
-        ]
-        self.history_table.setHorizontalHeaderLabels(headers)
+        # Tabla de historial (modelo/vista: solo se pintan las filas visibles)
+        self.history_table = QTableView()
+        self.history_table.setModel(self.history_model)
         self.history_table.setAlternatingRowColors(True)
         self.history_table.setSortingEnabled(True)
+        self.history_table.sortByColumn(-1, Qt.SortOrder.AscendingOrder)
+        
+        # Alto de fila fijo para no medir cada fila al insertar
+        self.history_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.history_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
         
         layout.addWidget(self.history_table)
         
@@ -464,6 +829,19 @@ class ConcreteStrengthPredictor(QMainWindow):
         refresh_action.triggered.connect(self._refresh_charts)
         view_menu.addAction(refresh_action)
         
+        view_menu.addSeparator()
+        
+        # Tramos de tiempo de la predicción y de la interfaz
+        self.timing_action = QAction("&Medir Tiempos", self)
+        self.timing_action.setCheckable(True)
+        self.timing_action.setChecked(TIMING.enabled)
+        self.timing_action.toggled.connect(self._on_timing_toggled)
+        view_menu.addAction(self.timing_action)
+        
+        diagnostics_action = QAction("&Diagnóstico de Tiempos...", self)
+        diagnostics_action.triggered.connect(self._show_timing_dialog)
+        view_menu.addAction(diagnostics_action)
+        
         # Menú Ayuda
         help_menu = menubar.addMenu("&Ayuda")
         
@@ -482,8 +860,10 @@ class ConcreteStrengthPredictor(QMainWindow):
         model_status = f"Modelo: {model_info.get('tipo_modelo', 'N/A')} v{model_info.get('version', 'N/A')}"
         accuracy_status = f"Precisión: R²={model_info.get('r2_score', 0):.3f}"
         
-        self.status_bar.addWidget(QLabel(model_status))
-        self.status_bar.addPermanentWidget(QLabel(accuracy_status))
+        self.model_status_label = QLabel(model_status)
+        self.accuracy_status_label = QLabel(accuracy_status)
+        self.status_bar.addWidget(self.model_status_label)
+        self.status_bar.addPermanentWidget(self.accuracy_status_label)
         self.status_bar.showMessage("Listo para predicción")
     
     def _setup_connections(self):
@@ -505,9 +885,38 @@ class ConcreteStrengthPredictor(QMainWindow):
         # Conectar presets
         self.presets_combo.currentTextChanged.connect(self._load_preset)
         
+        # Predicción en vivo
+        self.live_timer.timeout.connect(self._submit_live_prediction)
+        self.live_worker.resultReady.connect(self._on_live_result)
+        self.live_worker.predictionFailed.connect(self._on_live_error)
+        self.neighbor_worker.resultReady.connect(self._on_neighbors_ready)
+        self.neighbor_worker.predictionFailed.connect(self._on_neighbors_failed)
+        self.live_checkbox.toggled.connect(self._on_live_toggled)
+        
+        # Resultados del botón Predecir
+        self.predict_worker.resultReady.connect(self._on_prediction_ready)
+        self.predict_worker.predictionFailed.connect(self._on_prediction_failed)
+        self.chart_worker.resultReady.connect(self._on_chart_ready)
+        self.chart_worker.predictionFailed.connect(self._on_chart_failed)
+        
+        # Contenido diferido de pestañas
+        self.tabs.currentChanged.connect(self._on_tab_changed)
+        
         # Conectar botones de historial
         self.export_csv_button.clicked.connect(self._export_history)
         self.clear_history_button.clicked.connect(self._clear_history)
+        self.load_more_button.clicked.connect(self._load_history_page)
+        
+        # Curvas de respuesta
+        self.sweep_button.clicked.connect(self._compute_sweep)
+        self.analysis_worker.resultReady.connect(self._on_sweep_ready)
+        self.analysis_worker.predictionFailed.connect(self._on_sweep_failed)
+        self.age_curve_button.clicked.connect(self._compute_age_curves)
+        self.age_curve_worker.resultReady.connect(self._on_age_curves_ready)
+        self.age_curve_worker.predictionFailed.connect(self._on_age_curves_failed)
+        self.comparison_button.clicked.connect(self._compute_comparison)
+        self.comparison_worker.resultReady.connect(self._on_comparison_ready)
+        self.comparison_worker.predictionFailed.connect(self._on_comparison_failed)
     
     def _apply_styles(self):
         """Aplicar estilos personalizados."""
@@ -523,8 +932,10 @@ class ConcreteStrengthPredictor(QMainWindow):
     
     def _on_input_changed(self):
         """Manejar cambios en los inputs.""" 
-        # SOLO cambiar preset, NO actualizar cards automáticamente
-        # (para evitar que sobrescriba las predicciones)
+        # Con predicción en vivo (activa por defecto) el gauge y las tarjetas se
+        # actualizan tras el debounce, sin tocar el historial. En modo manual las
+        # tarjetas conservan la última predicción hasta pulsar 'Predecir' y solo
+        # se informa la relación A/C en la barra de estado
         
         # Cambiar estado del preset a personalizado si se modifica
         if self.presets_combo.currentText() != "Seleccionar mezcla...":
@@ -532,6 +943,10 @@ class ConcreteStrengthPredictor(QMainWindow):
             self.presets_combo.setCurrentIndex(0)
             self.presets_combo.blockSignals(False)
         
+        if self.live_checkbox.isChecked():
+            self._schedule_live_prediction()
+            return
+        
         # Actualizar solo el status bar con info básica
         agua = self.agua_slider.get_value()
         cemento = self.cemento_slider.get_value()
@@ -539,6 +954,89 @@ class ConcreteStrengthPredictor(QMainWindow):
             wc_ratio = agua / cemento
             self.status_bar.showMessage(f"Relación A/C: {wc_ratio:.3f} - Hacer clic en 'Predecir' para ver resultados")
     
+    def _schedule_live_prediction(self):
+        """Reiniciar el debounce; la predicción se lanza al dejar de mover."""
+        if self.live_checkbox.isChecked() and self.model_handler.is_loaded:
+            self.live_timer.start()
+    
+    def _submit_live_prediction(self):
+        """Enviar los valores actuales al hilo de predicción."""
+        self._live_request_id += 1
+        inputs = self._get_current_inputs()
+        self.live_worker.submit(self._live_request_id, inputs)
+        self._submit_neighbor_check(inputs)
+    
+    def _on_live_result(self, request_id: int, result: Dict[str, Any]):
+        """Mostrar un resultado en vivo si corresponde a la última solicitud."""
+        if request_id != self._live_request_id:
+            return  # Resultado obsoleto: los inputs cambiaron mientras se calculaba
+        
+        self.current_prediction = result
+        with span("gui.tarjetas"):
+            self._update_results_ui(result, animate=False)
+        self.status_bar.showMessage(
+            f"En vivo: {result['resistencia_predicha_kg_cm2']:.2f} kg/cm² - "
+            f"A/C {result['relacion_agua_cemento']:.3f}"
+        )
+    
+    def _on_live_error(self, request_id: int, message: str):
+        """Informar un error de la predicción en vivo sin diálogos modales."""
+        if request_id == self._live_request_id:
+            self.status_bar.showMessage(f"Predicción en vivo no disponible: {message}")
+    
+    def _submit_neighbor_check(self, inputs: Dict[str, float]):
+        """Buscar los ensayos más cercanos a la mezcla en segundo plano."""
+        self._neighbor_request_id += 1
+        self.neighbor_worker.submit_job(self._neighbor_request_id,
+                                        partial(_neighbor_job, self.model_handler, inputs,
+                                                self.NEIGHBOR_COUNT))
+    
+    def _on_neighbors_ready(self, request_id: int, check: Dict[str, Any]):
+        """Mostrar los ensayos más parecidos y la alerta de extrapolación."""
+        if request_id != self._neighbor_request_id:
+            return
+        self.current_neighbors = check
+        self._update_neighbors_table(check['vecinos'])
+        if check['extrapolacion']:
+            self.extrapolation_label.setText(
+                f"⚠ Extrapolación: ningún ensayo de laboratorio se parece a esta mezcla "
+                f"(distancia {check['distancia_vecino']:.2f}, umbral {check['umbral']:.2f}). "
+                f"La predicción puede ser poco confiable.")
+            self.extrapolation_label.show()
+        else:
+            self.extrapolation_label.hide()
+    
+    def _update_neighbors_table(self, neighbors: List[Dict[str, Any]]):
+        """Llenar la tabla de ensayos cercanos; el tooltip muestra la mezcla completa."""
+        labels = self.model_handler.get_feature_labels()
+        self.neighbors_table.setRowCount(len(neighbors))
+        for row, sample in enumerate(neighbors):
+            cement = sample['Cemento_kg_m3']
+            cells = [f"{sample['distancia']:.2f}", f"{sample['resistencia_medida_kg_cm2']:.1f}",
+                     f"{sample['Edad_dias']:.0f}",
+                     f"{sample['Agua_kg_m3'] / cement:.2f}" if cement > 0 else "—"]
+            tooltip = "\n".join(f"{labels[f]}: {sample[f]:g}" for f in self.model_handler.feature_names)
+            for column, text in enumerate(cells):
+                item = QTableWidgetItem(text)
+                item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                item.setToolTip(f"Ensayo #{sample['indice_ensayo'] + 1} de Concrete_Data.csv\n{tooltip}")
+                self.neighbors_table.setItem(row, column, item)
+    
+    def _on_neighbors_failed(self, request_id: int, message: str):
+        """Sin índice de vecinos (p. ej. falta Concrete_Data.csv) no se muestra alerta."""
+        if request_id == self._neighbor_request_id:
+            logger.warning(f"Indice de vecinos no disponible: {message}")
+            self.extrapolation_label.hide()
+            self.neighbors_table.setRowCount(0)
+    
+    def _on_live_toggled(self, checked: bool):
+        """Activar o desactivar la predicción en vivo."""
+        if checked:
+            self._schedule_live_prediction()
+        else:
+            self.live_timer.stop()
+            self._live_request_id += 1  # Descartar resultados en vuelo
+    
     def _load_preset(self, preset_name: str):
         """Cargar valores de preset seleccionado."""
         if preset_name == "Seleccionar mezcla...":
@@ -548,6 +1046,7 @@ class ConcreteStrengthPredictor(QMainWindow):
         if preset_name in presets:
             values = presets[preset_name]
             self._apply_preset_values(values)
+            self._schedule_live_prediction()
     
     def _apply_preset_values(self, values: Dict[str, float]):
         """Aplicar valores de preset a los sliders."""
@@ -574,104 +1073,63 @@ class ConcreteStrengthPredictor(QMainWindow):
         }
     
     def _predict_strength(self):
-        """Realizar predicción de resistencia."""
-        print("DEBUG: BUTTON CLICKED - Iniciando prediccion...")
+        """Lanzar la predicción; el resultado llega en _on_prediction_ready."""
+        self.status_bar.showMessage("Realizando predicción...")
+        
+        inputs = self._get_current_inputs()
+        self._predict_request_id += 1
+        self._predict_submitted_at = time.perf_counter()
+        self.predict_worker.submit_job(
+            self._predict_request_id,
+            partial(_prediction_job, self.model_handler, inputs, self.results_chart.chart_size())
+        )
+        self._submit_neighbor_check(inputs)
+    
+    def _on_prediction_ready(self, request_id: int, payload: Dict[str, Any]):
+        """Mostrar resultados ya calculados (y gráfico ya rasterizado)."""
+        if request_id != self._predict_request_id:
+            return  # Se pulsó Predecir de nuevo mientras se calculaba
+        
+        result = payload['result']
+        self.current_prediction = result
+        with span("gui.tarjetas"):
+            self._update_results_ui(result, animate=False)
+        with span("gui.historial"):
+            self._add_to_history(payload['inputs'], result)
+        self.status_bar.showMessage(
+            f"Prediccion completada: {result['resistencia_predicha_kg_cm2']:.2f} kg/cm²")
+        
+        with span("gui.mostrar_grafico"):
+            self.results_chart.set_image(payload['image'])
+        if self._predict_submitted_at is not None:
+            # Desde el clic en Predecir hasta la interfaz actualizada (cruza hilos)
+            TIMING.record("gui.prediccion_total", time.perf_counter() - self._predict_submitted_at)
+    
+    def _on_prediction_failed(self, request_id: int, error_msg: str):
+        """Informar errores de la predicción en segundo plano."""
+        if request_id != self._predict_request_id:
+            return
         
-        try:
-            # Forzar actualización de status
-            self.status_bar.showMessage("Realizando predicción...")
-            self.status_bar.repaint()  # Forzar actualización visual
-            
-            # Obtener inputs actuales
-            inputs = self._get_current_inputs()
-            print(f"DEBUG: Inputs obtenidos: {inputs}")
-            
-            # Realizar predicción
-            result = self.model_handler.predict_strength(inputs)
-            self.current_prediction = result
-            print(f"DEBUG: Resultado prediccion: {result['resistencia_predicha_kg_cm2']:.2f}")
-            
-            # FORZAR actualización de UI inmediatamente
-            resistance = result['resistencia_predicha_kg_cm2']
-            
-            # Actualizar gauge directamente SIN ANIMACION
-            print("DEBUG: Actualizando gauge directamente...")
-            self.gauge.set_value(resistance, animate=False)
-            self.gauge.repaint()
-            
-            # Actualizar cards directamente
-            print("DEBUG: Actualizando resistance card...")
-            self.resistance_card.update_values(
-                f"{resistance:.2f} kg/cm²",
-                f"Edad: {result['edad_ensayo_dias']} días"
-            )
-            self.resistance_card.repaint()
-            
-            print("DEBUG: Actualizando NEC card...")
-            self.nec_card.update_values(
-                result['clasificacion_nec'],
-                result['descripcion_nec']
-            )
-            self.nec_card.repaint()
-            
-            print("DEBUG: Actualizando W/C ratio card...")
-            self.wc_ratio_card.update_values(
-                f"{result['relacion_agua_cemento']:.3f}",
-                "Agua/Cemento"
-            )
-            self.wc_ratio_card.repaint()
-            
-            print("DEBUG: Actualizando confidence card...")
-            confidence_pct = result['confianza_prediccion'] * 100
-            self.confidence_card.update_values(
-                f"{confidence_pct:.1f}%",
-                "Fiabilidad del modelo"
-            )
-            self.confidence_card.repaint()
-            
-            # Actualizar historial
-            print("DEBUG: Agregando al historial...")
-            self._add_to_history(inputs, result)
-            
-            # Actualizar gráficos
-            print("DEBUG: Actualizando graficos...")
-            self._plot_results_charts()
-            
-            # Forzar actualización completa de la ventana
-            self.update()
-            self.repaint()
-            
-            print("DEBUG: Prediccion completada exitosamente")
-            self.status_bar.showMessage(f"Prediccion completada: {resistance:.2f} kg/cm²")
-            
-        except Exception as e:
-            print(f"DEBUG: ERROR en prediccion: {e}")
-            import traceback
-            traceback.print_exc()
-            
-            error_msg = str(e)
-            logger.error(f"Error en predicción: {e}")
-            
-            # Mensajes de error más específicos
-            if "Singular matrix" in error_msg:
-                error_msg = "Error matemático: Verifique que los valores estén en rangos válidos"
-            elif "numpy" in error_msg.lower():
-                error_msg = "Error de cálculo: Algunos valores pueden estar fuera de rango"
-            
-            QMessageBox.critical(self, "Error", f"Error realizando predicción:\n{error_msg}")
-            self.status_bar.showMessage("Error en predicción")
+        logger.error(f"Error en predicción: {error_msg}")
+        
+        # Mensajes de error más específicos
+        if "Singular matrix" in error_msg:
+            error_msg = "Error matemático: Verifique que los valores estén en rangos válidos"
+        elif "numpy" in error_msg.lower():
+            error_msg = "Error de cálculo: Algunos valores pueden estar fuera de rango"
+        
+        QMessageBox.critical(self, "Error", f"Error realizando predicción:\n{error_msg}")
+        self.status_bar.showMessage("Error en predicción")
     
-    def _update_results_ui(self, result: Dict[str, Any]):
+    def _update_results_ui(self, result: Dict[str, Any], animate: bool = True):
         """Actualizar interfaz con resultados."""
-        print(f"DEBUG: Actualizando UI con resistencia: {result['resistencia_predicha_kg_cm2']}")
+        logger.debug(f"Actualizando UI con resistencia: {result['resistencia_predicha_kg_cm2']}")
         resistance = result['resistencia_predicha_kg_cm2']
         
         # Actualizar gauge
-        print("DEBUG: Actualizando gauge...")
-        self.gauge.set_value(resistance)
+        self.gauge.set_value(resistance, animate=animate)
         
         # Actualizar cards
-        print("DEBUG: Actualizando cards...")
         self.resistance_card.update_values(
             f"{resistance:.2f} kg/cm²",
             f"Edad: {result['edad_ensayo_dias']} días"
@@ -687,113 +1145,79 @@ class ConcreteStrengthPredictor(QMainWindow):
             "Agua/Cemento"
         )
         
+        # Confianza según la dispersión entre los árboles del bosque
         confidence_pct = result['confianza_prediccion'] * 100
         self.confidence_card.update_values(
             f"{confidence_pct:.1f}%",
-            "Fiabilidad del modelo"
+            f"±{result['desviacion_estandar_kg_cm2']:.1f} kg/cm² · "
+            f"P10-P90: {result['intervalo_inferior_kg_cm2']:.0f}-{result['intervalo_superior_kg_cm2']:.0f}"
         )
-        print("DEBUG: UI actualizada completamente")
     
     def _add_to_history(self, inputs: Dict[str, float], result: Dict[str, Any]):
-        """Agregar predicción al historial."""
-        history_item = {
-            'timestamp': result['timestamp'],
-            'resistance': result['resistencia_predicha_kg_cm2'],
-            **inputs
-        }
-        
-        self.prediction_history.append(history_item)
-        self._update_history_table()
-    
-    def _update_history_table(self):
-        """Actualizar tabla de historial."""
-        self.history_table.setRowCount(len(self.prediction_history))
+        """Agregar predicción al historial (solo se inserta la fila nueva)."""
+        try:
+            self.history_store.append(inputs, result)
+        except Exception as e:
+            logger.error(f"Error guardando prediccion en el historial: {e}")
         
-        for row, item in enumerate(self.prediction_history):
-            # Timestamp
-            self.history_table.setItem(row, 0, 
-                QTableWidgetItem(item['timestamp'][:19]))  # Sin microsegundos
-            
-            # Resistencia
-            self.history_table.setItem(row, 1, 
-                QTableWidgetItem(f"{item['resistance']:.2f}"))
-            
-            # Parámetros
-            params = [
-                item['Cemento_kg_m3'],
-                item['Agua_kg_m3'],
-                item['Escoria_Alto_Horno_kg_m3'],
-                item['Ceniza_Volante_kg_m3'],
-                item['Superplastificante_kg_m3'],
-                item['Agregado_Grueso_kg_m3'],
-                item['Agregado_Fino_kg_m3'],
-                item['Edad_dias']
-            ]
-            
-            for col, param in enumerate(params, start=2):
-                self.history_table.setItem(row, col, 
-                    QTableWidgetItem(str(param)))
+        self.history_model.append(result['timestamp'], result['resistencia_predicha_kg_cm2'], inputs)
         
-        # Ajustar columnas
-        self.history_table.resizeColumnsToContents()
+        # Ajustar columnas una sola vez, con la primera fila
+        if len(self.history_model) == 1:
+            self.history_table.resizeColumnsToContents()
+        self._update_history_count()
+    
+    def _load_history_page(self):
+        """Cargar en la tabla la siguiente página de predicciones guardadas."""
+        timestamps, values = self.history_store.page(len(self.history_model), self.HISTORY_PAGE_SIZE)
+        first_page = len(self.history_model) == 0
+        self.history_model.extend(timestamps, values)
+        
+        if first_page and timestamps:
+            self.history_table.resizeColumnsToContents()
+        self._update_history_count()
+    
+    def _update_history_count(self):
+        """Mostrar cuántas predicciones guardadas están cargadas."""
+        total = self.history_store.count()
+        loaded = len(self.history_model)
+        self.history_count_label.setText(f"Mostrando {loaded} de {total}")
+        self.load_more_button.setEnabled(loaded < total)
     
     def _plot_results_charts(self):
-        """Crear gráficos de resultados - ULTRA SIMPLIFICADO SIN ERRORES."""
+        """Volver a rasterizar el gráfico de resultados en segundo plano."""
         if not self.current_prediction:
             return
-            
-        try:
-            # Limpiar figura completamente
-            self.results_figure.clear()
-            
-            # Crear UN SOLO gráfico simple
-            ax = self.results_figure.add_subplot(111)
-            
-            # Datos simples de clasificación NEC
-            current_resistance = self.current_prediction['resistencia_predicha_kg_cm2']
-            
-            # Rangos NEC básicos
-            ranges = [140, 280, 420, 600]
-            labels = ['Baja\n<140', 'Normal\n140-280', 'Alta\n280-420', 'Ultra\n>420']
-            colors = ['#ef4444', '#f97316', '#22c55e', '#3b82f6']
-            
-            # Gráfico de barras simple
-            bars = ax.bar(labels, ranges, color=colors, alpha=0.7, width=0.6)
-            
-            # Línea de resistencia actual
-            ax.axhline(y=current_resistance, color='black', linestyle='--', linewidth=3, 
-                      label=f'Predicción: {current_resistance:.1f} kg/cm²')
-            
-            # Configuración básica
-            ax.set_ylabel('Resistencia (kg/cm²)', fontsize=12)
-            ax.set_title('Clasificación NEC Ecuador', fontsize=14, pad=20)
-            ax.set_ylim(0, 700)
-            ax.legend()
-            ax.grid(True, alpha=0.3)
-            
-            # Layout simple sin tight_layout que puede causar errores
-            self.results_figure.subplots_adjust(left=0.1, right=0.95, top=0.9, bottom=0.15)
-            
-            # Redibujar
-            self.results_canvas.draw()
-            
-        except Exception as e:
-            logger.error(f"Error en graficos - se omite visualizacion: {e}")
-            # Crear texto simple si fallan los gráficos
-            try:
-                self.results_figure.clear()
-                ax = self.results_figure.add_subplot(111)
-                ax.text(0.5, 0.5, f'Resistencia: {current_resistance:.2f} kg/cm²', 
-                       ha='center', va='center', fontsize=16, 
-                       transform=ax.transAxes)
-                ax.set_title('Resultado de Predicción')
-                ax.axis('off')
-                self.results_canvas.draw()
-            except:
-                pass  # Si todo falla, simplemente omitir gráficos
+        
+        resistance = self.current_prediction['resistencia_predicha_kg_cm2']
+        chart_size = self.results_chart.chart_size()
+        
+        def render_job():
+            from chart_rendering import render_results_chart
+            return {'resistance': resistance, 'image': render_results_chart(resistance, *chart_size)}
+        
+        self._chart_request_id += 1
+        self.chart_worker.submit_job(self._chart_request_id, render_job)
+    
+    def _on_chart_ready(self, request_id: int, payload: Dict[str, Any]):
+        """Mostrar el gráfico redibujado si sigue correspondiendo a la predicción actual."""
+        if request_id != self._chart_request_id or not self.current_prediction:
+            return
+        # Un Predecir terminado mientras se redibujaba ya mostró un gráfico más nuevo
+        if payload['resistance'] != self.current_prediction['resistencia_predicha_kg_cm2']:
+            return
+        self.results_chart.set_image(payload['image'])
+    
+    def _on_chart_failed(self, request_id: int, error_msg: str):
+        """Informar errores del redibujado (el gráfico anterior queda visible)."""
+        if request_id == self._chart_request_id:
+            logger.error(f"Error redibujando el gráfico de resultados: {error_msg}")
     
     def _plot_feature_importance(self):
         """Crear gráfico de importancia de variables - SIMPLIFICADO."""
+        if self.importance_canvas is None:
+            return  # Pestaña aún no abierta
+        
         try:
             importance = self.model_handler.get_feature_importance()
             
@@ -848,7 +1272,7 @@ class ConcreteStrengthPredictor(QMainWindow):
     
     def _export_history(self):
         """Exportar historial a CSV."""
-        if not self.prediction_history:
+        if not self.history_store.count():
             QMessageBox.information(self, "Información", 
                                   "No hay datos en el historial para exportar.")
             return
@@ -860,8 +1284,7 @@ class ConcreteStrengthPredictor(QMainWindow):
         
         if filename:
             try:
-                df = pd.DataFrame(self.prediction_history)
-                df.to_csv(filename, index=False)
+                self.history_store.export_csv(filename)
                 QMessageBox.information(self, "Éxito", 
                                       f"Historial exportado exitosamente a:\n{filename}")
                 self.status_bar.showMessage(f"✅ Historial exportado: {filename}")
@@ -875,10 +1298,62 @@ class ConcreteStrengthPredictor(QMainWindow):
                                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         
         if reply == QMessageBox.StandardButton.Yes:
-            self.prediction_history.clear()
-            self._update_history_table()
+            self.history_store.clear()
+            self.history_model.clear()
+            self._update_history_count()
             self.status_bar.showMessage("Historial limpiado")
     
+    def _on_model_reloaded(self, report: Dict[str, Any]):
+        """Actualizar la información del modelo y repetir la predicción tras una recarga."""
+        if not report.get('exito'):
+            self.status_bar.showMessage(f"⚠️ Modelo nuevo rechazado, se mantiene el vigente: "
+                                        f"{report.get('error', '')}")
+            return
+        
+        model_info = self.model_handler.get_model_info()
+        self.model_status_label.setText(
+            f"Modelo: {model_info.get('tipo_modelo', 'N/A')} v{model_info.get('version', 'N/A')}")
+        self.accuracy_status_label.setText(f"Precisión: R²={model_info.get('r2_score', 0):.3f}")
+        self.r2_card.update_values(f"{model_info.get('r2_score', 0):.4f}")
+        self.mae_card.update_values(f"{model_info.get('mae_kg_cm2', 0):.2f} kg/cm²")
+        self.cv_card.update_values(f"{model_info.get('cv_score_mean', 0):.4f}")
+        
+        # Las curvas de la pestaña Análisis se recalculan con el modelo nuevo
+        self._sweep_outdated = True
+        if self.tabs.currentWidget() is self.analysis_tab:
+            self._on_tab_changed(self.tabs.currentIndex())
+        if self.current_prediction is not None:
+            self._submit_live_prediction()
+        self.status_bar.showMessage(f"🔄 Modelo recargado: v{report['version']} "
+                                    f"({report['segundos']} s)")
+    
+    def closeEvent(self, event):
+        """Detener los hilos de predicción antes de cerrar."""
+        self.model_handler.stop_watching()
+        self.live_timer.stop()
+        self.live_worker.stop()
+        self.predict_worker.stop()
+        self.chart_worker.stop()
+        self.analysis_worker.stop()
+        self.age_curve_worker.stop()
+        self.comparison_worker.stop()
+        self.neighbor_worker.stop()
+        self.history_store.close()
+        super().closeEvent(event)
+    
+    def _on_timing_toggled(self, checked: bool):
+        """Activar o desactivar los tramos de tiempo."""
+        TIMING.enabled = checked
+        self.status_bar.showMessage("Medición de tiempos " + ("activada" if checked else "desactivada"))
+    
+    def _show_timing_dialog(self):
+        """Mostrar los histogramas de tiempo por fase."""
+        if self._timing_dialog is None:
+            self._timing_dialog = TimingDialog(TIMING, self)
+        self._timing_dialog.refresh()
+        self._timing_dialog.show()
+        self._timing_dialog.raise_()
+    
     def _show_about(self):
         """Mostrar diálogo Acerca de."""
         model_info = self.model_handler.get_model_info()
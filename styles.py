@@ -435,6 +435,15 @@ def get_complete_stylesheet() -> str:
         padding: 2px 0;
     }}
     
+    QLabel[labelType="warning"] {{
+        font-size: 10pt;
+        color: {COLORS['warning']};
+        background-color: #fef3c7;
+        border: 1px solid {COLORS['warning']};
+        border-radius: 6px;
+        padding: 6px 8px;
+    }}
+    
     /* Frame para cards */
     QFrame[frameType="card"] {{
         background-color: {COLORS['surface']};
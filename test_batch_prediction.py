@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Tests de la predicción por lotes (predict_batch)
+================================================
+
+Verifica que la API vectorizada devuelve los mismos valores que
+predict_strength mezcla por mezcla.
+"""
+
+import numpy as np
+import pandas as pd
+
+from model_handler_fixed import ConcreteModelHandler, LoadedModel
+
+
+def test_batch_matches_single():
+    """predict_batch coincide con predict_strength en los presets"""
+    handler = ConcreteModelHandler()
+    presets = list(handler.get_preset_mixes().values())
+
+    batch = handler.predict_batch(presets)
+
+    for i, mix in enumerate(presets):
+        single = handler.predict_strength(mix)
+        assert batch['resistencia_predicha_kg_cm2'][i] == single['resistencia_predicha_kg_cm2']
+        assert batch['relacion_agua_cemento'][i] == single['relacion_agua_cemento']
+        assert batch['total_cementicios_kg_m3'][i] == single['total_cementicios_kg_m3']
+        assert batch['clasificacion_nec'][i] == single['clasificacion_nec']
+
+
+def test_batch_input_formats():
+    """Array, DataFrame y lista de dicts producen el mismo resultado"""
+    handler = ConcreteModelHandler()
+    presets = list(handler.get_preset_mixes().values())
+    df = pd.DataFrame(presets)
+    X = df[handler.feature_names].to_numpy()
+
+    from_list = handler.predict_batch(presets)
+    from_df = handler.predict_batch(df)
+    from_array = handler.predict_batch(X)
+
+    np.testing.assert_array_equal(from_list['resistencia_predicha_kg_cm2'],
+                                  from_df['resistencia_predicha_kg_cm2'])
+    np.testing.assert_array_equal(from_list['resistencia_predicha_kg_cm2'],
+                                  from_array['resistencia_predicha_kg_cm2'])
+
+
+def test_batch_range_flags():
+    """Las filas fuera del rango extendido se marcan sin detener el lote"""
+    handler = ConcreteModelHandler()
+    mix = handler.get_preset_mixes()["C25 - Estructural"]
+    out_of_range = dict(mix, Agua_kg_m3=400)
+
+    batch = handler.predict_batch([mix, out_of_range])
+
+    assert batch['dentro_de_rango'].tolist() == [True, False]
+    assert len(batch['resistencia_predicha_kg_cm2']) == 2
+    assert handler.flagged_features(batch['alertas_rango'][1]) == ['Agua_kg_m3']
+
+    X = np.array([[mix[f] for f in handler.feature_names]] * 3)
+    X[1, 0] = np.nan
+    X[2, [4, 7]] = [100, 500]
+    flags = handler.range_flags(X)
+    assert flags.dtype == np.uint8 and flags[0] == 0
+    assert handler.flagged_features(flags[1]) == ['Cemento_kg_m3']
+    assert handler.flagged_features(flags[2]) == ['Superplastificante_kg_m3', 'Edad_dias']
+    assert handler.validate_inputs(dict(mix, Agua_kg_m3=400))[1] == \
+        ["Agua_kg_m3: 400 fuera del rango extendido [110, 260]"]
+
+
+def test_nec_bins_match_table_boundaries():
+    """searchsorted sobre los límites reproduce la tabla NEC, también la de 210"""
+    from model_handler import ConcreteModelHandler as LegacyModelHandler
+    handler = ConcreteModelHandler()
+    strengths = np.array([-1, 0, 139.99, 140, 279.99, 280, 420, 1e6, np.nan])
+
+    names = [label[0] for label in handler.nec_classes()]
+    classes = [names[code] for code in handler.nec_class_codes(strengths)]
+    assert classes == ["Sin Clasificar", "Baja Resistencia", "Baja Resistencia", "Resistencia Normal",
+                       "Resistencia Normal", "Alta Resistencia", "Ultra Alta Resistencia",
+                       "Ultra Alta Resistencia", "Sin Clasificar"]
+    assert [handler._classify_nec(s)[0] for s in strengths] == classes
+    assert handler._classify_nec_batch(strengths).tolist() == classes
+
+    # Cambiar la tabla (como hace el registro de modelos) recalcula las cubetas
+    handler.NEC_CLASSIFICATION = LegacyModelHandler.NEC_CLASSIFICATION
+    assert handler._classify_nec_batch(np.array([180.0]))[0] == "Baja Resistencia"
+
+
+def test_uncertainty_matches_individual_trees():
+    """La dispersión en una pasada coincide con predecir árbol por árbol"""
+    handler = ConcreteModelHandler()
+    presets = list(handler.get_preset_mixes().values())
+    X = pd.DataFrame(presets)[handler.feature_names].to_numpy(dtype=np.float32)
+
+    batch = handler.predict_batch(presets, with_uncertainty=True)
+    per_tree = np.stack([tree.predict(X) for tree in handler.model.estimators_], axis=1)
+
+    np.testing.assert_allclose(batch['desviacion_estandar_kg_cm2'], per_tree.std(axis=1), atol=0.01)
+    assert np.all(batch['intervalo_inferior_kg_cm2'] <= batch['resistencia_predicha_kg_cm2'])
+    assert np.all(batch['resistencia_predicha_kg_cm2'] <= batch['intervalo_superior_kg_cm2'])
+
+    single = handler.predict_strength(presets[0])
+    assert single['desviacion_estandar_kg_cm2'] == batch['desviacion_estandar_kg_cm2'][0]
+    assert single['confianza_prediccion'] == batch['confianza_prediccion'][0]
+
+
+def test_uncertainty_without_flat_engine():
+    """Sin motor plano la dispersión se calcula con los árboles de sklearn"""
+    handler = ConcreteModelHandler()
+    presets = list(handler.get_preset_mixes().values())
+    expected = handler.predict_batch(presets, with_uncertainty=True)
+
+    state = handler._state
+    handler._swap_state(LoadedModel(state.model, None, state.feature_importances, state.metadata,
+                                    state.source, state.signature, state.sha256))
+    assert handler.engine is None
+
+    batch = handler.predict_batch(presets, with_uncertainty=True)
+    for column in ('resistencia_predicha_kg_cm2', 'desviacion_estandar_kg_cm2', 'confianza_prediccion'):
+        np.testing.assert_allclose(batch[column], expected[column], atol=0.01)
+    single = handler.predict_strength(presets[0])
+    assert single['desviacion_estandar_kg_cm2'] == expected['desviacion_estandar_kg_cm2'][0]
+
+
+def test_sweep_grid_matches_batch_and_is_cached():
+    """Un barrido 2-D coincide con predict_batch y se reutiliza por mezcla base"""
+    handler = ConcreteModelHandler()
+    mix = handler.get_preset_mixes()["C25 - Estructural"]
+    water = np.array([150.0, 175.0, 200.0])
+    cement = np.array([250.0, 350.0])
+
+    sweep = handler.sweep(mix, 'Agua_kg_m3', water, 'Cemento_kg_m3', cement)
+    assert sweep['resistencia_kg_cm2'].shape == (2, 3)
+
+    corner = dict(mix, Agua_kg_m3=200.0, Cemento_kg_m3=350.0)
+    expected = handler.predict_batch([corner])['resistencia_predicha_kg_cm2'][0]
+    assert round(sweep['resistencia_kg_cm2'][1, 2], 2) == expected
+
+    again = handler.sweep(mix, 'Agua_kg_m3', water, 'Cemento_kg_m3', cement)
+    assert again['resistencia_kg_cm2'] is sweep['resistencia_kg_cm2']
+    assert handler.sweep_cache.stats()['aciertos'] == 1
+
+
+def test_age_curve_single_call_memoized_per_mix():
+    """La curva de edad coincide con predecir cada edad y no depende de la edad base"""
+    handler = ConcreteModelHandler()
+    mix = handler.get_preset_mixes()["C20 - Uso General"]
+
+    curve = handler.predict_age_curve(mix)
+    assert curve['edades_dias'].tolist() == list(handler.AGE_CURVE_DAYS)
+    for age, strength in zip(curve['edades_dias'], curve['resistencia_kg_cm2']):
+        single = handler.predict_strength(dict(mix, Edad_dias=age))
+        assert round(strength, 2) == single['resistencia_predicha_kg_cm2']
+
+    again = handler.predict_age_curve(dict(mix, Edad_dias=90))
+    assert again['resistencia_kg_cm2'] is curve['resistencia_kg_cm2']
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Tests de la evaluación masiva desde archivos
+============================================
+
+Verifica el formato ';' con coma decimal de Concrete_Data.csv, la
+escritura por bloques y que las filas inválidas no abortan el archivo.
+"""
+
+import pandas as pd
+
+from batch_scoring import detect_csv_format, score_file
+from model_handler_fixed import ConcreteModelHandler
+
+
+def test_scores_dataset_format_in_chunks(tmp_path):
+    """El CSV original se evalúa por bloques igual que con predict_batch"""
+    source = tmp_path / "mezclas.csv"
+    with open("Concrete_Data.csv", encoding='utf-8') as f:
+        source.write_text("".join(f.readline() for _ in range(26)), encoding='utf-8')
+    assert detect_csv_format(source) == (';', ',')
+
+    handler = ConcreteModelHandler()
+    output = tmp_path / "salida.csv"
+    summary = score_file(source, output, handler, chunk_size=7)
+
+    assert summary['filas'] == 25 and summary['filas_sin_prediccion'] == 0
+    scored = pd.read_csv(output, sep=';', decimal=',')
+    assert len(scored) == 25
+    expected = handler.predict_batch(scored[handler.feature_names])
+    assert (scored['resistencia_predicha_kg_cm2'] == expected['resistencia_predicha_kg_cm2']).all()
+
+
+def test_invalid_rows_are_left_unscored(tmp_path):
+    """Una fila no numérica queda sin predicción y el resto se evalúa"""
+    handler = ConcreteModelHandler()
+    mix = handler.get_preset_mixes()["C25 - Estructural"]
+    rows = pd.DataFrame([mix, dict(mix, Agua_kg_m3="n/d")])
+    source = tmp_path / "planilla.csv"
+    rows.to_csv(source, index=False)
+
+    output = tmp_path / "salida.csv"
+    summary = score_file(source, output, handler)
+
+    assert summary['filas'] == 2 and summary['filas_sin_prediccion'] == 1
+    scored = pd.read_csv(output)
+    assert scored['resistencia_predicha_kg_cm2'].notna().tolist() == [True, False]
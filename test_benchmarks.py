@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Tests de los benchmarks
+=======================
+
+Verifica que una corrida corta produce todas las mediciones y que la
+comparación con la línea base distingue regresiones del ruido.
+"""
+
+from benchmarks import compare_to_baseline, format_report, load_baseline, run_benchmarks, save_baseline
+
+
+def test_quick_run_reports_every_benchmark(tmp_path):
+    """Una corrida corta mide carga, lotes, predict_strength, gráfico e historial"""
+    report = run_benchmarks(batch_sizes=(1, 100), history_sizes=(10,), repeat=3)
+    results = report['resultados']
+
+    for name in ('carga_modelo', 'predict_batch_1', 'predict_batch_100', 'prediccion_cruda_1',
+                 'predict_strength_sin_cache', 'predict_strength_cache', 'vecinos_k5',
+                 'grafico_resultados', 'historial_agregar_10'):
+        assert results[name]['mediana_ms'] > 0
+    assert results['predict_batch_100']['filas_por_segundo'] > 0
+    assert 'sobrecosto_ms' in results['predict_strength_sin_cache']
+
+    save_baseline(report, tmp_path / "base.json")
+    baseline = load_baseline(tmp_path / "base.json")
+    assert all(row['estado'] == 'igual' for row in compare_to_baseline(report, baseline))
+    assert load_baseline(tmp_path / "no_existe.json") is None
+
+
+def test_compare_flags_regressions_beyond_tolerance():
+    """Solo los cambios sobre la tolerancia y sobre el ruido mínimo cuentan"""
+    baseline = {'entorno': {'nucleos': 8}, 'resultados': {
+        'lento': {'mediana_ms': 10.0}, 'rapido': {'mediana_ms': 10.0},
+        'ruido': {'mediana_ms': 0.01}, 'estable': {'mediana_ms': 10.0}}}
+    report = {'entorno': {'nucleos': 1}, 'resultados': {
+        'lento': {'mediana_ms': 14.0, 'p95_ms': 15.0}, 'rapido': {'mediana_ms': 5.0, 'p95_ms': 6.0},
+        'ruido': {'mediana_ms': 0.03, 'p95_ms': 0.04}, 'estable': {'mediana_ms': 11.0, 'p95_ms': 12.0},
+        'nuevo': {'mediana_ms': 1.0, 'p95_ms': 1.0}}}
+
+    status = {row['nombre']: row['estado'] for row in compare_to_baseline(report, baseline, 0.25)}
+    assert status == {'lento': 'regresion', 'rapido': 'mejora', 'ruido': 'igual',
+                      'estable': 'igual', 'nuevo': 'nuevo'}
+
+    text = format_report(report, compare_to_baseline(report, baseline, 0.25), baseline)
+    assert "1 regresiones de 5" in text and "otro entorno" in text
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests del modelo virtualizado del historial
+===========================================
+
+Verifica que agregar filas con la tabla ordenada las inserta en su
+posición, que sin orden lo más reciente queda arriba y que la exportación
+conserva el orden de inserción.
+"""
+
+import numpy as np
+from PyQt6.QtCore import Qt
+
+from history_model import HistoryTableModel, HISTORY_FEATURES
+
+
+def _mix(value: float):
+    return {feature: value for feature in HISTORY_FEATURES}
+
+
+def test_append_keeps_active_sort_order():
+    """Con orden descendente por resistencia, las filas nuevas caen en su lugar"""
+    model = HistoryTableModel(initial_capacity=2)
+    for i, resistance in enumerate([250.0, 120.0, 380.0]):
+        model.append(f"2026-01-01T10:00:0{i}", resistance, _mix(i))
+
+    model.sort(1, Qt.SortOrder.DescendingOrder)
+    model.append("2026-01-01T10:00:09", 300.0, _mix(9))
+    model.append("2026-01-01T10:00:10", 50.0, _mix(10))
+
+    assert len(model) == 5
+    shown = [model.record(row)['resistance'] for row in range(model.rowCount())]
+    assert shown == [380.0, 300.0, 250.0, 120.0, 50.0]
+
+
+def test_default_order_newest_first_across_pages():
+    """Predicciones nuevas arriba y páginas más antiguas al final"""
+    model = HistoryTableModel()
+    page = lambda stamps: (stamps, np.array([[float(t[-2:])] + [0.0] * len(HISTORY_FEATURES)
+                                             for t in stamps]))
+    model.extend(*page(["2026-01-01T10:00:05", "2026-01-01T10:00:04"]))
+    model.append("2026-01-01T10:00:06", 6.0, _mix(0))
+    model.append("2026-01-01T10:00:07", 7.0, _mix(0))
+    model.extend(*page(["2026-01-01T10:00:03", "2026-01-01T10:00:02"]))
+
+    shown = [model.record(row)['timestamp'][-2:] for row in range(model.rowCount())]
+    assert shown == ["07", "06", "05", "04", "03", "02"]
+
+
+def test_export_uses_insertion_order():
+    """to_columns devuelve el historial en el orden en que se agregó"""
+    model = HistoryTableModel()
+    model.append("2026-01-01T10:00:00", 200.0, _mix(1))
+    model.append("2026-01-01T10:00:01", 100.0, _mix(2))
+    model.sort(1, Qt.SortOrder.AscendingOrder)
+
+    columns = model.to_columns()
+    assert list(columns['resistance']) == [200.0, 100.0]
+    assert list(columns['Cemento_kg_m3']) == [1.0, 2.0]
+
+    model.clear()
+    assert len(model) == 0 and model.to_columns()['timestamp'] == []
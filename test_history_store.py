@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Tests del historial persistente
+===============================
+
+Verifica que las predicciones sobreviven al cierre, la paginación de la
+más reciente a la más antigua y las consultas por rango.
+"""
+
+from history_model import HISTORY_FEATURES
+from history_store import HistoryStore
+
+
+def _record(store: HistoryStore, day: int, resistance: float, nec_class: str):
+    inputs = {feature: float(day) for feature in HISTORY_FEATURES}
+    result = {
+        'timestamp': f"2026-03-{day:02d}T12:00:00",
+        'resistencia_predicha_kg_cm2': resistance,
+        'clasificacion_nec': nec_class
+    }
+    store.append(inputs, result)
+
+
+def test_history_persists_and_pages(tmp_path):
+    """Las filas se conservan al reabrir y las páginas van de nueva a antigua"""
+    path = tmp_path / "historial.db"
+    store = HistoryStore(path)
+    for day in range(1, 8):
+        _record(store, day, 100.0 + day, "Resistencia Normal")
+    store.close()
+
+    store = HistoryStore(path)
+    assert store.count() == 7
+
+    timestamps, values = store.page(offset=0, limit=3)
+    assert timestamps[0].startswith("2026-03-07")
+    assert values.shape == (3, 1 + len(HISTORY_FEATURES))
+    assert values[0, 0] == 107.0
+
+    timestamps, values = store.page(offset=6, limit=3)
+    assert len(timestamps) == 1 and timestamps[0].startswith("2026-03-01")
+    store.close()
+
+
+def test_range_query_uses_filters(tmp_path):
+    """Consulta por resistencia, fecha y clase NEC sin cargar todo"""
+    store = HistoryStore(":memory:")
+    _record(store, 1, 300.0, "Alta Resistencia")
+    _record(store, 10, 250.0, "Resistencia Normal")
+    _record(store, 20, 350.0, "Alta Resistencia")
+    _record(store, 25, 290.0, "Alta Resistencia")
+
+    rows = list(store.query(min_resistance=280, since="2026-03-05"))
+    assert [row['resistencia'] for row in rows] == [290.0, 350.0]
+    assert store.count(nec_class="Alta Resistencia") == 3
+
+    out = tmp_path / "export.csv"
+    assert store.export_csv(out, max_resistance=260) == 1
+    assert out.read_text(encoding='utf-8').splitlines()[0].startswith("timestamp,resistencia")
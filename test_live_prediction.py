@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Tests de la predicción en segundo plano (en vivo y botón Predecir)
+==================================================================
+
+Verifica que mover los sliders actualiza la predicción sin pulsar el
+botón, que los resultados obsoletos se descartan y que el botón Predecir
+entrega resultado y gráfico calculados fuera del hilo de la GUI.
+"""
+
+import time
+
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtTest import QTest
+
+
+_app = None
+
+
+def _create_window():
+    global _app
+    from predictor_gui import ConcreteStrengthPredictor
+    from history_store import HistoryStore
+    _app = QApplication.instance() or QApplication([])
+    return ConcreteStrengthPredictor(history_store=HistoryStore(":memory:"))
+
+
+def _wait_for(condition, timeout_s: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        QTest.qWait(20)
+    return False
+
+
+def test_slider_move_triggers_live_prediction():
+    """Mover un slider produce una predicción en vivo de los valores actuales"""
+    window = _create_window()
+    try:
+        window.cemento_slider.slider.setValue(400)
+
+        assert _wait_for(lambda: window.current_prediction is not None)
+        expected = window.model_handler.predict_strength(window._get_current_inputs())
+        assert window.current_prediction['resistencia_predicha_kg_cm2'] == \
+            expected['resistencia_predicha_kg_cm2']
+        assert len(window.history_model) == 0
+    finally:
+        window.close()
+
+
+def test_stale_results_are_dropped():
+    """Solo se muestra el resultado de la última solicitud"""
+    window = _create_window()
+    try:
+        for value in (300, 350, 420):
+            window.cemento_slider.slider.setValue(value)
+            window._submit_live_prediction()
+
+        assert _wait_for(lambda: window.current_prediction is not None)
+        QTest.qWait(200)
+        expected = window.model_handler.predict_strength(window._get_current_inputs())
+        assert window.current_prediction['resistencia_predicha_kg_cm2'] == \
+            expected['resistencia_predicha_kg_cm2']
+    finally:
+        window.close()
+
+
+def test_predict_button_runs_in_background():
+    """Predecir devuelve el control de inmediato y luego muestra resultado y gráfico"""
+    window = _create_window()
+    try:
+        window.live_checkbox.setChecked(False)
+        window.predict_button.click()
+        assert len(window.history_model) == 0
+
+        assert _wait_for(lambda: len(window.history_model) == 1)
+        assert _wait_for(lambda: window.results_chart.pixmap() is not None
+                         and not window.results_chart.pixmap().isNull())
+        assert window.current_prediction['resistencia_predicha_kg_cm2'] == \
+            window.history_model.record(0)['resistance']
+    finally:
+        window.close()
+
+
+def test_chart_refresh_keeps_pending_prediction():
+    """F5 mientras Predecir calcula no descarta su resultado ni su fila de historial"""
+    window = _create_window()
+    try:
+        window.live_checkbox.setChecked(False)
+        window.predict_button.click()
+        assert _wait_for(lambda: len(window.history_model) == 1)
+
+        window.cemento_slider.slider.setValue(420)
+        window.predict_button.click()
+        window._refresh_charts()
+
+        assert _wait_for(lambda: len(window.history_model) == 2)
+        expected = window.model_handler.predict_strength(window._get_current_inputs())
+        assert window.current_prediction['resistencia_predicha_kg_cm2'] == \
+            expected['resistencia_predicha_kg_cm2']
+    finally:
+        window.close()
+
+
+def test_extrapolation_warning_and_nearest_lab_mixes():
+    """La alerta sigue a la mezcla y la tabla muestra los ensayos más cercanos"""
+    window = _create_window()
+    try:
+        window.show()
+        window._load_preset("Test del Notebook")
+        assert _wait_for(lambda: window.extrapolation_label.isVisible())
+        assert window.current_neighbors['extrapolacion']
+
+        window._load_preset("C25 - Estructural")
+        assert _wait_for(lambda: not window.extrapolation_label.isVisible())
+        assert not window.current_neighbors['extrapolacion']
+
+        # Tabla junto al gauge: los ensayos más cercanos, del más parecido al menos
+        table = window.neighbors_table
+        assert table.rowCount() == window.NEIGHBOR_COUNT
+        distances = [float(table.item(row, 0).text()) for row in range(table.rowCount())]
+        assert distances == sorted(distances)
+        closest = window.current_neighbors['vecinos'][0]
+        assert table.item(0, 1).text() == f"{closest['resistencia_medida_kg_cm2']:.1f}"
+    finally:
+        window.close()
+
+
+def test_timing_spans_cover_predict_button():
+    """Con Medir Tiempos activo, el diálogo muestra las fases de la GUI y del handler"""
+    from timing_spans import TIMING
+    window = _create_window()
+    try:
+        window.live_checkbox.setChecked(False)
+        TIMING.reset()
+        window.timing_action.setChecked(True)
+        window.predict_button.click()
+        assert _wait_for(lambda: 'gui.prediccion_total' in TIMING.summary())
+
+        phases = TIMING.summary()
+        for name in ('gui.grafico_resultados', 'gui.tarjetas', 'gui.historial',
+                     'gui.mostrar_grafico', 'predict_strength.modelo'):
+            assert phases[name]['conteo'] == 1
+        window._show_timing_dialog()
+        assert window._timing_dialog.table.rowCount() == len(phases)
+    finally:
+        window.timing_action.setChecked(False)
+        TIMING.reset()
+        window.close()
+
+
+def test_analysis_tab_draws_response_and_age_curves():
+    """Abrir la pestaña Análisis calcula las curvas y la comparación de modelos"""
+    window = _create_window()
+    try:
+        window.tabs.setCurrentWidget(window.analysis_tab)
+        assert _wait_for(lambda: window.sweep_chart.pixmap() is not None
+                         and not window.sweep_chart.pixmap().isNull())
+        assert _wait_for(lambda: window.age_curve_chart.pixmap() is not None
+                         and not window.age_curve_chart.pixmap().isNull())
+        assert _wait_for(lambda: window.comparison_table.rowCount() >= 1)
+        assert window.comparison_table.item(0, 0).text() == "vigente"
+    finally:
+        window.close()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Tests de los micro-lotes asíncronos
+===================================
+
+Verifica que solicitudes concurrentes se resuelven con menos llamadas al
+modelo, que cada llamador recibe su propia fila y que /predict responde
+igual que el servidor síncrono.
+"""
+
+import asyncio
+import json
+import threading
+import urllib.request
+
+import numpy as np
+
+from micro_batching import AsyncPredictionServer, MicroBatcher
+from model_handler_fixed import ConcreteModelHandler
+from prediction_server import LatencyStats, PredictionHTTPServer
+
+
+def test_concurrent_requests_share_model_calls():
+    """20 predicciones concurrentes se agrupan y coinciden con predict_batch"""
+    handler = ConcreteModelHandler()
+    base = handler.get_preset_mixes()["C25 - Estructural"]
+    X = np.array([[dict(base, Edad_dias=age)[f] for f in handler.feature_names]
+                  for age in range(7, 27)], dtype=np.float64)
+    expected = handler.predict_batch(X)['resistencia_predicha_kg_cm2']
+
+    calls = []
+
+    def predict_fn(matrix):
+        calls.append(len(matrix))
+        return handler.predict_batch(matrix)
+
+    async def run():
+        batcher = MicroBatcher(predict_fn, max_wait_ms=20, max_batch=8)
+        try:
+            return await asyncio.gather(*(batcher.predict(row) for row in X)), batcher.stats()
+        finally:
+            await batcher.close()
+
+    results, stats = asyncio.run(run())
+
+    assert [r['resistencia_predicha_kg_cm2'] for r in results] == list(expected)
+    assert sum(calls) == 20 and max(calls) <= 8 and len(calls) < 20
+    assert stats['lotes'] == len(calls) and stats['filas'] == 20
+
+
+def test_async_predict_matches_sync_server():
+    """/predict asíncrono devuelve los mismos campos que el síncrono, también fuera de rango"""
+    handler = ConcreteModelHandler()
+    mix = handler.get_preset_mixes()["C25 - Estructural"]
+    out_of_range = dict(mix, Edad_dias=500)
+
+    sync_server = PredictionHTTPServer(("127.0.0.1", 0), handler, LatencyStats())
+    threading.Thread(target=sync_server.serve_forever, daemon=True).start()
+    try:
+        sync_results = []
+        for body in (mix, out_of_range):
+            request = urllib.request.Request(
+                f"http://127.0.0.1:{sync_server.server_address[1]}/predict",
+                data=json.dumps(body).encode('utf-8'), headers={'Content-Type': 'application/json'})
+            with urllib.request.urlopen(request) as response:
+                sync_results.append(json.load(response))
+    finally:
+        sync_server.shutdown()
+        sync_server.server_close()
+
+    async def run():
+        server = AsyncPredictionServer(handler, max_wait_ms=1)
+        try:
+            return [await server.route('POST', '/predict', json.dumps(body).encode('utf-8'))
+                    for body in (mix, out_of_range)]
+        finally:
+            await server.batcher.close()
+
+    for (status, result), expected in zip(asyncio.run(run()), sync_results):
+        assert status == 200
+        assert list(result) == list(expected)
+        for key in ('resistencia_predicha_kg_cm2', 'clasificacion_nec', 'color_clasificacion',
+                    'desviacion_estandar_kg_cm2', 'edad_ensayo_dias'):
+            assert result[key] == expected[key]
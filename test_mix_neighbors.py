@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Tests del índice de vecinos sobre los ensayos
+=============================================
+
+Verifica que un ensayo del dataset tiene distancia cero, que una mezcla
+con cada variable en rango pero en una combinación irreal se marca como
+extrapolación y que el índice guardado se reutiliza mientras el CSV no
+cambie.
+"""
+
+import shutil
+
+import numpy as np
+
+from mix_neighbors import MixNeighborIndex, default_index_path, load_or_build_index
+from model_handler_fixed import ConcreteModelHandler
+
+
+def test_dataset_rows_and_unrealistic_mix():
+    """Los ensayos están a distancia 0; una combinación irreal extrapola"""
+    index = MixNeighborIndex.from_csv("Concrete_Data.csv")
+    assert len(index) == 1030
+
+    sample = dict(zip(index.feature_names, index.features[100]))
+    check = index.check(sample, k=3)
+    assert check['distancia_vecino'] == 0 and not check['extrapolacion']
+    assert [n['distancia'] for n in check['vecinos']] == sorted(n['distancia'] for n in check['vecinos'])
+    assert check['vecinos'][0]['resistencia_medida_kg_cm2'] == round(index.strengths[100], 2)
+
+    # Cada variable dentro de VALID_RANGES, combinación nunca ensayada
+    handler = ConcreteModelHandler()
+    unrealistic = {'Cemento_kg_m3': 540, 'Escoria_Alto_Horno_kg_m3': 359, 'Ceniza_Volante_kg_m3': 200,
+                   'Agua_kg_m3': 122, 'Superplastificante_kg_m3': 32, 'Agregado_Grueso_kg_m3': 801,
+                   'Agregado_Fino_kg_m3': 594, 'Edad_dias': 28}
+    assert handler.validate_inputs(unrealistic)[0]
+    assert index.check(unrealistic)['extrapolacion']
+
+    batch = index.check_batch(np.vstack([index.features[:3], [list(unrealistic.values())]]))
+    assert batch['extrapolacion'].tolist() == [False, False, False, True]
+    assert np.all(batch['distancia_vecino'][:3] == 0)
+
+
+def test_index_is_persisted_next_to_model(tmp_path):
+    """El índice se guarda junto al modelo y se reconstruye si cambia el CSV"""
+    model_path = tmp_path / "modelo.pkl"
+    csv_path = tmp_path / "ensayos.csv"
+    shutil.copy("Concrete_Data.csv", csv_path)
+
+    built = load_or_build_index(model_path, csv_path)
+    index_path = default_index_path(model_path)
+    assert index_path == tmp_path / "modelo.vecinos.npz" and index_path.is_file()
+
+    loaded = load_or_build_index(model_path, csv_path)
+    assert loaded.threshold == built.threshold and loaded.source_sha256 == built.source_sha256
+    np.testing.assert_array_equal(loaded.features, built.features)
+
+    # Menos ensayos en el CSV: el índice guardado ya no corresponde
+    lines = csv_path.read_text(encoding='utf-8').splitlines(keepends=True)
+    csv_path.write_text("".join(lines[:501]), encoding='utf-8')
+    assert len(load_or_build_index(model_path, csv_path)) == 500
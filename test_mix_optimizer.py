@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Tests del diseño inverso de mezclas
+===================================
+
+Verifica el frente de Pareto y que la mezcla óptima cumple el objetivo,
+respeta las variables fijas, los límites de dosificación y no extrapola
+lejos de los ensayos de laboratorio.
+"""
+
+import numpy as np
+
+from mix_optimizer import design_violation, optimize_mix, pareto_front
+from model_handler_fixed import ConcreteModelHandler
+
+
+def test_pareto_front_keeps_non_dominated():
+    """Solo quedan las mezclas que ninguna más barata supera"""
+    strength = np.array([200.0, 250.0, 240.0, 300.0, 300.0])
+    cost = np.array([50.0, 60.0, 70.0, 80.0, 90.0])
+    assert pareto_front(strength, cost).tolist() == [0, 1, 3]
+
+
+def test_optimized_mix_meets_target_with_fixed_variables():
+    """La mejor mezcla alcanza 250 kg/cm², mantiene lo fijado y es factible"""
+    handler = ConcreteModelHandler()
+    fixed = {'Edad_dias': 28, 'Superplastificante_kg_m3': 0}
+    result = optimize_mix(handler, target_strength=250, fixed=fixed,
+                          population=24, generations=25, seed=0)
+
+    best = result['mejor_mezcla']
+    assert result['cumple_objetivo']
+    assert best['Edad_dias'] == 28 and best['Superplastificante_kg_m3'] == 0
+    X = np.array([[best[f] for f in handler.feature_names]])
+    assert design_violation(X, handler.feature_names)[0] < 1e-3
+
+    costs = [p['costo'] for p in result['frente_pareto']]
+    strengths = [p['resistencia_kg_cm2'] for p in result['frente_pareto']]
+    assert costs == sorted(costs) and strengths == sorted(strengths)
+
+
+def test_optimized_mixes_stay_near_lab_samples():
+    """Ni la mejor mezcla ni el frente superan el umbral de extrapolación"""
+    handler = ConcreteModelHandler()
+    result = optimize_mix(handler, target_strength=280, population=24, generations=25, seed=0)
+
+    index = handler.neighbor_index()
+    mixes = [result['mejor_mezcla']] + [p['mezcla'] for p in result['frente_pareto']]
+    X = np.array([[mix[f] for f in handler.feature_names] for mix in mixes])
+    # Tolerancia por el redondeo a 0,1 kg de las mezclas devueltas
+    assert np.all(index.check_batch(X)['distancia_vecino'] <= index.threshold + 0.01)
+    assert result['distancia_vecino'] <= index.threshold + 0.01
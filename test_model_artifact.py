@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Tests del artefacto sin pickle (model_artifact)
+===============================================
+
+Verifica la conversión del .pkl a arrays .npy, la carga mapeada en memoria
+y la detección de artefactos desactualizados.
+"""
+
+import shutil
+
+import numpy as np
+
+from model_artifact import convert_model, is_artifact_current, load_forest_artifact
+from model_handler_fixed import ConcreteModelHandler
+
+
+def test_artifact_roundtrip(tmp_path):
+    """El artefacto mapeado predice igual que el modelo original"""
+    artifact = convert_model("modelo_hormigon_ecuador_v1.pkl", tmp_path / "modelo.forest")
+    forest, manifest = load_forest_artifact(artifact)
+
+    assert isinstance(forest.threshold, np.memmap)
+    assert manifest['n_arboles'] == forest.n_trees
+
+    original = ConcreteModelHandler()
+    mixes = list(original.get_preset_mixes().values())
+    X = np.array([[m[f] for f in original.feature_names] for m in mixes])
+    np.testing.assert_array_equal(forest.predict(X), original.engine.predict(X))
+
+
+def test_handler_loads_artifact_without_pickle(tmp_path):
+    """El handler carga el directorio .forest y mantiene la misma API"""
+    artifact = convert_model("modelo_hormigon_ecuador_v1.pkl", tmp_path / "modelo.forest")
+
+    handler = ConcreteModelHandler(model_path=str(artifact))
+    original = ConcreteModelHandler()
+    mix = original.get_preset_mixes()["C25 - Estructural"]
+
+    assert handler.is_loaded
+    assert handler.model is None
+    assert handler.predict_strength(mix)['resistencia_predicha_kg_cm2'] == \
+        original.predict_strength(mix)['resistencia_predicha_kg_cm2']
+    assert handler.get_feature_importance() == original.get_feature_importance()
+
+
+def test_stale_artifact_detected(tmp_path):
+    """Un .pkl modificado invalida el artefacto derivado"""
+    model_copy = tmp_path / "modelo.pkl"
+    shutil.copy("modelo_hormigon_ecuador_v1.pkl", model_copy)
+    artifact = convert_model(model_copy)
+
+    assert is_artifact_current(artifact, model_copy)
+
+    with open(model_copy, 'ab') as f:
+        f.write(b'\0')
+    assert not is_artifact_current(artifact, model_copy)
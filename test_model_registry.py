@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Tests del registro de modelos
+=============================
+
+Verifica que las entradas con los mismos archivos comparten el handler,
+que la comparación informa el desacuerdo entre versiones y que promover
+un candidato reemplaza los archivos de producción.
+"""
+
+import json
+import shutil
+
+import numpy as np
+
+from model_handler import ConcreteModelHandler as LegacyModelHandler
+from model_registry import ModelRegistry
+from training_pipeline import train_model
+
+
+def test_compare_reports_disagreement_between_versions(tmp_path):
+    """Un candidato distinto y la tabla NEC heredada aparecen como desacuerdo"""
+    train_model(model_path=tmp_path / "candidato.pkl", metadata_path=tmp_path / "candidato.json",
+                param_grid={'max_depth': [4], 'min_samples_leaf': [5], 'max_features': [0.6]},
+                max_trees=10, folds=3, workers=1, write_artifact=False)
+
+    registry = ModelRegistry()
+    production = registry.register("vigente")
+    assert registry.register("alias") is production
+    registry.register("nec_210", nec_classification=LegacyModelHandler.NEC_CLASSIFICATION)
+    assert registry.discover(tmp_path) == ["candidato"]
+
+    mixes = [registry.handler("vigente").get_preset_mixes()["C25 - Estructural"]] * 2
+    comparison = registry.compare(mixes)
+    strength = comparison['resistencia_kg_cm2']
+    assert strength.shape == (4, 2)
+    assert np.array_equal(strength[0], strength[1]) and np.array_equal(strength[0], strength[2])
+    assert comparison['desacuerdo_kg_cm2'][0] == np.round(strength[:, 0].max() - strength[:, 0].min(), 2)
+    assert comparison['desacuerdo_kg_cm2'][0] > 0
+
+
+def test_legacy_thresholds_change_classification():
+    """Con la tabla 210/280/420 una mezcla de ~175 kg/cm² cambia de clase"""
+    registry = ModelRegistry()
+    registry.register("vigente")
+    registry.register("nec_210", nec_classification=LegacyModelHandler.NEC_CLASSIFICATION)
+    mix = dict(registry.handler("vigente").get_preset_mixes()["C20 - Uso General"], Edad_dias=3)
+    comparison = registry.compare(mix)
+
+    assert 140 <= comparison['resistencia_kg_cm2'][0, 0] < 210
+    assert comparison['desacuerdo_kg_cm2'][0] == 0
+    assert not comparison['clasificacion_coincide'][0]
+    assert registry.handler("vigente").NEC_CLASSIFICATION != LegacyModelHandler.NEC_CLASSIFICATION
+
+
+def test_promote_replaces_production_files(tmp_path):
+    """Promover copia modelo y metadata del candidato sobre producción"""
+    shutil.copy("modelo_hormigon_ecuador_v1.pkl", tmp_path / "produccion.pkl")
+    shutil.copy("modelo_metadata.json", tmp_path / "produccion.json")
+    train_model(model_path=tmp_path / "candidato.pkl", metadata_path=tmp_path / "candidato.json",
+                param_grid={'max_depth': [4], 'min_samples_leaf': [5], 'max_features': [0.6]},
+                max_trees=10, folds=3, workers=1, write_artifact=False)
+
+    registry = ModelRegistry()
+    registry.register("vigente", tmp_path / "produccion.pkl", tmp_path / "produccion.json")
+    registry.register("candidato", tmp_path / "candidato.pkl", tmp_path / "candidato.json")
+    registry.promote("candidato")
+
+    assert (tmp_path / "produccion.pkl").read_bytes() == (tmp_path / "candidato.pkl").read_bytes()
+    metadata = json.loads((tmp_path / "produccion.json").read_text(encoding='utf-8'))
+    assert metadata['hiperparametros']['max_depth'] == 4
+    assert registry.handler("vigente").reload()
+    assert registry.handler("vigente").engine.n_trees == 10
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Tests de la recarga en caliente del modelo
+==========================================
+
+Verifica que el vigilante detecta un modelo reentrenado, lo valida con
+las mezclas canario y lo publica, y que un candidato rechazado deja el
+modelo vigente intacto.
+"""
+
+import shutil
+import threading
+
+from model_handler_fixed import ConcreteModelHandler
+from training_pipeline import train_model
+
+_GRID = {'max_depth': [15], 'min_samples_leaf': [5], 'max_features': [0.6]}
+
+
+def _copy_model(tmp_path):
+    model_path = tmp_path / "modelo.pkl"
+    metadata_path = tmp_path / "metadata.json"
+    shutil.copy("modelo_hormigon_ecuador_v1.pkl", model_path)
+    shutil.copy("modelo_metadata.json", metadata_path)
+    return model_path, metadata_path
+
+
+def test_watcher_swaps_retrained_model(tmp_path):
+    """El modelo reentrenado se publica sin reiniciar y vacía la caché"""
+    model_path, metadata_path = _copy_model(tmp_path)
+    handler = ConcreteModelHandler(str(model_path), str(metadata_path))
+    mix = handler.get_preset_mixes()["C25 - Estructural"]
+    before = handler.predict_strength(mix)['resistencia_predicha_kg_cm2']
+    old_hash = handler.model_hash
+
+    reloaded = threading.Event()
+    handler.start_watching(interval=0.05, on_reload=lambda report: reloaded.set())
+    try:
+        train_model(model_path=model_path, metadata_path=metadata_path, param_grid=_GRID,
+                    max_trees=12, folds=3, workers=1)
+        assert reloaded.wait(10)
+    finally:
+        handler.stop_watching()
+
+    assert handler.last_reload['exito']
+    assert handler.model_hash != old_hash and handler.engine.n_trees == 12
+    after = handler.predict_strength(mix)['resistencia_predicha_kg_cm2']
+    assert after != before
+    assert handler.get_model_info()['version'] == handler.last_reload['version']
+
+
+def test_rejected_candidate_keeps_current_model(tmp_path):
+    """Si las mezclas canario cambian demasiado se conserva el modelo vigente"""
+    model_path, metadata_path = _copy_model(tmp_path)
+    handler = ConcreteModelHandler(str(model_path), str(metadata_path))
+    handler.CANARY_MAX_CHANGE = 0.0
+    old_hash = handler.model_hash
+
+    train_model(model_path=model_path, metadata_path=metadata_path, param_grid=_GRID,
+                max_trees=12, folds=3, workers=1)
+
+    assert not handler.reload()
+    assert 'canario' in handler.last_reload['error']
+    assert handler.model_hash == old_hash and handler.engine.n_trees == 100
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests de la caché LRU de predicciones
+=====================================
+
+Verifica aciertos, desalojos y la invalidación por cambio del archivo
+del modelo en ConcreteModelHandler.
+"""
+
+import os
+import shutil
+
+import pytest
+
+from model_handler_fixed import ConcreteModelHandler
+from prediction_cache import PredictionCache
+
+
+def test_repeated_preset_hits_cache():
+    """Predecir dos veces el mismo preset usa la caché"""
+    handler = ConcreteModelHandler()
+    mix = handler.get_preset_mixes()["C20 - Uso General"]
+
+    first = handler.predict_strength(mix)
+    second = handler.predict_strength(dict(mix))
+
+    stats = handler.get_model_info()['cache']
+    assert stats['aciertos'] == 1 and stats['fallos'] == 1
+    assert second['resistencia_predicha_kg_cm2'] == first['resistencia_predicha_kg_cm2']
+
+
+def test_off_grid_inputs_bypass_cache():
+    """Fuera de la grilla de los sliders se predice la mezcla exacta, sin depender del orden"""
+    handler = ConcreteModelHandler()
+    mix = handler.get_preset_mixes()["C25 - Estructural"]
+    above = dict(mix, Cemento_kg_m3=mix['Cemento_kg_m3'] + 0.4)
+    below = dict(mix, Cemento_kg_m3=mix['Cemento_kg_m3'] - 0.4)
+    exact = handler.predict_batch([above, below])['resistencia_predicha_kg_cm2']
+
+    handler.predict_strength(above)
+    assert handler.predict_strength(below)['resistencia_predicha_kg_cm2'] == exact[1]
+    assert handler.predict_strength(above)['resistencia_predicha_kg_cm2'] == exact[0]
+    assert len(handler.prediction_cache) == 0
+
+    with pytest.raises(ValueError, match="no finito"):
+        handler.predict_strength(dict(mix, Agua_kg_m3=float('nan')))
+    assert not handler.validate_inputs(dict(mix, Agua_kg_m3=float('inf')))[0]
+
+
+def test_lru_eviction_order():
+    """Se desaloja la entrada menos recientemente usada"""
+    cache = PredictionCache(max_size=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.stats()['desalojos'] == 1
+
+
+def test_cache_invalidated_when_model_file_changes(tmp_path):
+    """Un cambio en el hash del .pkl vacía la caché"""
+    model_copy = tmp_path / "modelo.pkl"
+    shutil.copy("modelo_hormigon_ecuador_v1.pkl", model_copy)
+    handler = ConcreteModelHandler(model_path=str(model_copy))
+    mix = handler.get_preset_mixes()["C25 - Estructural"]
+
+    handler.predict_strength(mix)
+    assert len(handler.prediction_cache) == 1
+
+    with open(model_copy, 'ab') as f:
+        f.write(b'\0')
+    os.utime(model_copy, ns=(0, 0))
+
+    handler.predict_strength(mix)
+    assert handler.get_model_info()['cache']['aciertos'] == 0
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests del servicio HTTP de predicción
+=====================================
+
+Levanta el servidor en un hilo (un solo proceso, puerto libre) y verifica
+las rutas de predicción individual, por lotes, errores y estadísticas.
+"""
+
+import json
+import threading
+import urllib.error
+import urllib.request
+
+from model_handler_fixed import ConcreteModelHandler
+from prediction_server import LatencyStats, PredictionHTTPServer
+
+
+def _start_server():
+    handler = ConcreteModelHandler()
+    server = PredictionHTTPServer(("127.0.0.1", 0), handler, LatencyStats())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, handler, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def _post(url: str, body):
+    request = urllib.request.Request(url, data=json.dumps(body).encode('utf-8'),
+                                     headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as e:
+        return e.code, json.load(e)
+
+
+def test_single_and_batch_predictions_match_handler():
+    """/predict y /predict/batch devuelven lo mismo que el handler"""
+    server, handler, base = _start_server()
+    try:
+        mix = handler.get_preset_mixes()["C25 - Estructural"]
+        expected = handler.predict_strength(mix)['resistencia_predicha_kg_cm2']
+
+        status, single = _post(base + "/predict", mix)
+        assert status == 200
+        assert single['resistencia_predicha_kg_cm2'] == expected
+
+        status, batch = _post(base + "/predict/batch", {"mezclas": [mix, mix]})
+        assert status == 200
+        assert batch['resistencia_predicha_kg_cm2'] == [expected, expected]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_invalid_input_and_stats():
+    """Una mezcla inválida responde 400 y /stats cuenta solicitudes y errores"""
+    server, handler, base = _start_server()
+    try:
+        status, body = _post(base + "/predict", {"Cemento_kg_m3": 300})
+        assert status == 400 and 'error' in body
+
+        _post(base + "/predict", handler.get_preset_mixes()["C20 - Uso General"])
+
+        with urllib.request.urlopen(base + "/stats") as response:
+            stats = json.load(response)
+        assert stats['solicitudes'] == 2 and stats['errores'] == 1
+        assert stats['latencia_p50_ms'] <= stats['latencia_p99_ms']
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Tests de los tramos de tiempo
+=============================
+
+Verifica que los tramos desactivados no registran nada y que, activados,
+predict_strength informa cada fase con su histograma.
+"""
+
+import json
+
+from model_handler_fixed import ConcreteModelHandler
+from timing_spans import BUCKET_EDGES_MS, TIMING, SpanRecorder, histogram_bar
+
+
+def test_disabled_recorder_is_a_noop():
+    """Desactivado, span() no mide ni crea estadísticas"""
+    recorder = SpanRecorder()
+    with recorder.span("fase"):
+        pass
+    recorder.record("fase", 0.5)
+    assert recorder.summary() == {}
+
+
+def test_histogram_buckets_and_quantiles():
+    """Cada duración cae en su cubeta 1-2-5 y los cuantiles salen de ellas"""
+    recorder = SpanRecorder(enabled=True)
+    for seconds in [0.0004] * 9 + [0.03]:
+        recorder.record("fase", seconds)
+    stats = recorder.summary()['fase']
+
+    assert stats['conteo'] == 10 and stats['max_ms'] == 30.0
+    assert stats['histograma'] == [{'hasta_ms': 0.5, 'conteo': 9}, {'hasta_ms': 50.0, 'conteo': 1}]
+    assert stats['p50_ms'] == 0.5 and stats['p95_ms'] == 30.0
+    assert histogram_bar(stats['histograma'])[0] == "█"
+    assert len(histogram_bar(stats['histograma'])) == BUCKET_EDGES_MS.index(50.0) - BUCKET_EDGES_MS.index(0.5) + 1
+
+
+def test_predict_strength_reports_each_phase(tmp_path):
+    """predict_strength mide validación, caché, modelo, NEC y resultado"""
+    handler = ConcreteModelHandler()
+    mix = handler.get_preset_mixes()["C25 - Estructural"]
+    TIMING.reset()
+    TIMING.enabled = True
+    try:
+        handler.predict_strength(mix)
+        handler.predict_strength(mix)  # acierto de caché: sin arreglo, modelo ni NEC
+        data = TIMING.dump_json(tmp_path / "tiempos.json")
+    finally:
+        TIMING.enabled = False
+        TIMING.reset()
+
+    phases = data['tramos']
+    assert phases['predict_strength.total']['conteo'] == 2
+    assert phases['predict_strength.cache']['conteo'] == 2
+    assert phases['predict_strength.resultado']['conteo'] == 2
+    for phase in ('arreglo', 'modelo', 'clasificacion_nec'):
+        assert phases[f'predict_strength.{phase}']['conteo'] == 1
+    assert json.loads((tmp_path / "tiempos.json").read_text(encoding='utf-8'))['tramos'].keys() == phases.keys()
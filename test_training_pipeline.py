@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tests del pipeline de entrenamiento
+===================================
+
+Verifica el calendario de successive halving, los pliegues y que el
+modelo entrenado en el pool se guarda completo y lo carga el handler.
+"""
+
+import json
+
+import numpy as np
+
+from model_handler_fixed import ConcreteModelHandler
+from training_pipeline import halving_schedule, kfold_indices, train_model
+from utils import DEFAULT_CONCRETE_PARAMS
+
+
+def test_halving_schedule_ends_with_full_forest():
+    """Las rondas crecen por el factor y la última usa todos los árboles"""
+    assert halving_schedule(27, 100, 3) == [11, 33, 100]
+    assert halving_schedule(1, 100, 3) == [100]
+
+
+def test_kfold_indices_partition_all_rows():
+    """Cada fila valida exactamente una vez y nunca entrena en su pliegue"""
+    splits = kfold_indices(103, 5)
+    tested = np.concatenate([test for _, test in splits])
+    assert sorted(tested.tolist()) == list(range(103))
+    for train, test in splits:
+        assert not np.intersect1d(train, test).size
+
+
+def test_train_model_writes_loadable_model(tmp_path):
+    """El mejor candidato se guarda con su metadata y el handler lo usa"""
+    model_path = tmp_path / "modelo.pkl"
+    metadata_path = tmp_path / "metadata.json"
+    grid = {'max_depth': [3, 15], 'min_samples_leaf': [5], 'max_features': [0.6]}
+    metadata = train_model(model_path=model_path, metadata_path=metadata_path,
+                           param_grid=grid, max_trees=20, folds=3, workers=2)
+
+    assert metadata['hiperparametros']['max_depth'] == 15
+    assert metadata['busqueda']['rondas'][0]['candidatos'] == 2
+    assert 0.5 < metadata['metricas']['cv_score_mean'] < 1.0
+    assert json.loads(metadata_path.read_text(encoding='utf-8')) == metadata
+    assert not list(tmp_path.glob("*.tmp"))
+
+    handler = ConcreteModelHandler(str(model_path), str(metadata_path))
+    assert handler.is_loaded and handler.engine.n_trees == 20
+    result = handler.predict_strength(DEFAULT_CONCRETE_PARAMS)
+    assert result['resistencia_predicha_kg_cm2'] > 0
+
+
+def test_incremental_retrain_tracks_tree_lineage(tmp_path):
+    """Los árboles nuevos ven los ensayos agregados y el OOB queda en la metadata"""
+    from incremental_training import decode_lineage, retrain_incremental
+    from training_store import TrainingStore
+
+    model_path = tmp_path / "modelo.pkl"
+    metadata_path = tmp_path / "metadata.json"
+    grid = {'max_depth': [15], 'min_samples_leaf': [5], 'max_features': [0.6]}
+    train_model(model_path=model_path, metadata_path=metadata_path, param_grid=grid,
+                max_trees=10, folds=3, workers=1, write_artifact=False)
+
+    store = TrainingStore(":memory:")
+    X, y = store.arrays(limit=30)
+    store.append(X, y * 1.1, "ensayos_nuevos")
+    metadata = retrain_incremental(None, model_path, metadata_path, store, new_trees=5,
+                                   replace='oldest', write_artifact=False)
+
+    lineage = decode_lineage(metadata['entrenamiento_incremental']['linaje_arboles'])
+    assert lineage == [1030] * 5 + [1060] * 5
+    assert metadata['datos_entrenamiento']['num_muestras'] == 1060
+    assert 0.5 < metadata['metricas']['oob_score'] < 1.0
+    assert metadata['entrenamiento_incremental']['actualizaciones'][-1]['arboles_retirados'] == 5
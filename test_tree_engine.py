@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Tests del motor de inferencia plano (tree_engine)
+=================================================
+
+Verifica la paridad de FlatForest con model.predict de sklearn sobre
+todas las filas de Concrete_Data.csv.
+"""
+
+import joblib
+import numpy as np
+
+from tree_engine import FlatForest
+from utils import load_concrete_dataset
+from model_handler_fixed import ConcreteModelHandler
+
+
+def _load_model_and_data():
+    handler = ConcreteModelHandler()
+    df = load_concrete_dataset()
+    X = df[handler.feature_names].to_numpy(dtype=np.float64)
+    return joblib.load(handler.model_path), X
+
+
+def test_parity_with_sklearn():
+    """FlatForest reproduce model.predict en Concrete_Data.csv"""
+    model, X = _load_model_and_data()
+    forest = FlatForest.from_sklearn(model)
+
+    np.testing.assert_allclose(forest.predict(X), model.predict(X), rtol=0, atol=1e-8)
+
+
+def test_leaf_values_per_tree():
+    """leaf_values coincide con la predicción de cada árbol individual"""
+    model, X = _load_model_and_data()
+    forest = FlatForest.from_sklearn(model)
+    sample = X[:50]
+
+    leaves = forest.leaf_values(sample)
+    expected = np.column_stack([tree.predict(sample.astype(np.float32))
+                                for tree in model.estimators_])
+
+    assert leaves.shape == (50, model.n_estimators)
+    np.testing.assert_allclose(leaves, expected, rtol=0, atol=1e-8)
+
+
+def test_chunking_does_not_change_result():
+    """El tamaño de bloque no altera las predicciones"""
+    model, X = _load_model_and_data()
+    forest = FlatForest.from_sklearn(model)
+
+    np.testing.assert_array_equal(forest.predict(X, chunk_size=7),
+                                  forest.predict(X, chunk_size=2048))
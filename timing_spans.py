@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Tramos de Tiempo Activables
+===========================
+
+Mide cuánto tarda cada fase de predict_strength y de la GUI sin un
+perfilador externo. Desactivado (por defecto) cada tramo cuesta una
+comparación y un `with` vacío; activado, cada duración se acumula en un
+histograma de cubetas logarítmicas (1-2-5 ms) por nombre de tramo.
+
+Uso:
+    from timing_spans import span, TIMING
+    TIMING.enabled = True            # o CONCRETE_TIMING=1 / main.py --timing
+    with span("predict_strength.modelo"):
+        ...
+    TIMING.dump_json("tiempos.json")
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Union
+
+# Límites superiores de las cubetas en ms (1-2-5 desde 1 µs hasta 10 s)
+BUCKET_EDGES_MS = [m * 10.0 ** e for e in range(-3, 4) for m in (1, 2, 5)] + [10000.0]
+
+_NULL_SPAN = nullcontext()
+
+
+class _SpanStats:
+    """Conteo, suma, extremos e histograma de un tramo."""
+
+    __slots__ = ('count', 'total', 'minimum', 'maximum', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.minimum = float('inf')
+        self.maximum = 0.0
+        # Una cubeta extra para duraciones sobre el último límite
+        self.buckets = [0] * (len(BUCKET_EDGES_MS) + 1)
+
+    def add(self, elapsed_ms: float):
+        self.count += 1
+        self.total += elapsed_ms
+        self.minimum = min(self.minimum, elapsed_ms)
+        self.maximum = max(self.maximum, elapsed_ms)
+        for i, edge in enumerate(BUCKET_EDGES_MS):
+            if elapsed_ms <= edge:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+    def quantile(self, q: float) -> float:
+        """Cuantil aproximado: límite superior de la cubeta que lo contiene."""
+        target = q * self.count
+        seen = 0
+        for i, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= target:
+                return min(BUCKET_EDGES_MS[i], self.maximum) if i < len(BUCKET_EDGES_MS) else self.maximum
+        return self.maximum
+
+
+class _Span:
+    """Tramo activo: mide desde __enter__ hasta __exit__."""
+
+    __slots__ = ('recorder', 'name', 'start')
+
+    def __init__(self, recorder: "SpanRecorder", name: str):
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.recorder.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class SpanRecorder:
+    """Acumula la duración de tramos con nombre, seguro entre hilos."""
+
+    def __init__(self, enabled: bool = False):
+        """
+        Inicializar el registro.
+
+        Args:
+            enabled: Si False, span() devuelve un contexto vacío y record() no hace nada
+        """
+        self.enabled = enabled
+        self._stats: Dict[str, _SpanStats] = {}
+        self._lock = threading.Lock()
+
+    def span(self, name: str):
+        """Contexto que mide su bloque bajo `name` (vacío si está desactivado)."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def record(self, name: str, seconds: float):
+        """Registrar una duración medida fuera de un `with` (p. ej. entre hilos)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = _SpanStats()
+            stats.add(seconds * 1000)
+
+    def reset(self):
+        """Descartar todas las mediciones."""
+        with self._lock:
+            self._stats.clear()
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Estadísticas por tramo, en orden alfabético.
+
+        Returns:
+            Dict: nombre -> 'conteo', 'total_ms', 'media_ms', 'min_ms', 'max_ms',
+            'p50_ms', 'p95_ms' e 'histograma' (lista de {'hasta_ms', 'conteo'};
+            la última cubeta, 'hasta_ms' None, reúne lo que supera 10 s)
+        """
+        with self._lock:
+            items = sorted(self._stats.items())
+            return {
+                name: {
+                    'conteo': stats.count,
+                    'total_ms': round(stats.total, 4),
+                    'media_ms': round(stats.total / stats.count, 4),
+                    'min_ms': round(stats.minimum, 4),
+                    'max_ms': round(stats.maximum, 4),
+                    'p50_ms': round(stats.quantile(0.5), 4),
+                    'p95_ms': round(stats.quantile(0.95), 4),
+                    'histograma': [{'hasta_ms': edge, 'conteo': count}
+                                   for edge, count in zip(BUCKET_EDGES_MS + [None], stats.buckets)
+                                   if count]
+                }
+                for name, stats in items
+            }
+
+    def dump_json(self, path: Union[str, Path]) -> Dict[str, Any]:
+        """Guardar el resumen en JSON (con fecha y cubetas) y devolverlo."""
+        data = {
+            'fecha': datetime.now().isoformat(timespec='seconds'),
+            'cubetas_ms': BUCKET_EDGES_MS,
+            'tramos': self.summary()
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        return data
+
+
+def histogram_bar(histogram: List[Dict[str, Any]]) -> str:
+    """Histograma compacto en texto (una barra por cubeta entre la primera y la última usada)."""
+    if not histogram:
+        return ""
+    index = {edge: i for i, edge in enumerate(BUCKET_EDGES_MS + [None])}
+    first, last = index[histogram[0]['hasta_ms']], index[histogram[-1]['hasta_ms']]
+    counts = [0] * (last - first + 1)
+    for bucket in histogram:
+        counts[index[bucket['hasta_ms']] - first] = bucket['conteo']
+    levels = " ▁▂▃▄▅▆▇█"
+    peak = max(counts)
+    return "".join(levels[0 if c == 0 else max(1, round(c / peak * 8))] for c in counts)
+
+
+# Registro global usado por el handler y la GUI
+TIMING = SpanRecorder(enabled=os.environ.get('CONCRETE_TIMING') == '1')
+
+
+def span(name: str):
+    """Atajo de TIMING.span(name)."""
+    return TIMING.span(name)
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Pipeline de Entrenamiento con Búsqueda de Hiperparámetros
+=========================================================
+
+Reemplaza a fix_model.py. Entrena el RandomForest desde Concrete_Data.csv
+con una búsqueda de hiperparámetros reproducible:
+
+- Cada (candidato, pliegue) se entrena en un proceso del pool; el dataset
+  se publica una sola vez en memoria compartida y los procesos lo leen sin
+  copiarlo ni volver a parsear el CSV.
+- Successive halving: todos los candidatos empiezan con pocos árboles y
+  solo el mejor tercio de cada ronda pasa a la siguiente con más árboles,
+  de modo que las combinaciones malas se descartan temprano.
+- La validación cruzada final sale de la última ronda (mismos pliegues,
+  bosque completo): no se reentrena el modelo cinco veces más.
+- El modelo, su artefacto .forest y la metadata se escriben en archivos
+  temporales que se renombran al final; un lector nunca ve un modelo a
+  medio escribir ni una metadata que no le corresponde.
+
+Uso:
+    python main.py train
+    python main.py train --workers 4 --folds 5 --trees 100
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+TARGET_COLUMN = 'Resistencia_Compresion_kg_cm2'
+RANDOM_STATE = 42
+
+# Configuración rf_optimized del notebook HORMIGON_ML.ipynb
+NOTEBOOK_PARAMS = {
+    'max_depth': 15,
+    'min_samples_split': 10,
+    'min_samples_leaf': 5,
+    'max_features': 0.6
+}
+
+# Espacio de búsqueda por defecto (incluye NOTEBOOK_PARAMS y el modelo de fix_model.py)
+DEFAULT_PARAM_GRID = {
+    'max_depth': [None, 15, 25],
+    'min_samples_split': [2, 10],
+    'min_samples_leaf': [1, 2, 5],
+    'max_features': [1.0, 0.6, 'sqrt']
+}
+
+DEFAULT_TREES = 100
+DEFAULT_FOLDS = 5
+HALVING_FACTOR = 3
+MIN_TREES = 10
+
+
+# --- Dataset en memoria compartida ---
+
+class SharedDataset:
+    """X e y publicados en bloques de memoria compartida para el pool."""
+
+    def __init__(self, X: np.ndarray, y: np.ndarray):
+        """
+        Copiar el dataset a memoria compartida.
+
+        Args:
+            X: Matriz (n, n_features)
+            y: Vector objetivo (n,)
+        """
+        self._blocks = []
+        self.spec = {name: self._publish(name, np.ascontiguousarray(array, dtype=np.float64))
+                     for name, array in (('X', X), ('y', y))}
+
+    def _publish(self, name: str, array: np.ndarray) -> Tuple[str, Tuple[int, ...]]:
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=np.float64, buffer=block.buf)[...] = array
+        self._blocks.append(block)
+        return block.name, array.shape
+
+    def close(self):
+        """Liberar los bloques (solo el proceso que los creó)."""
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Vistas del dataset dentro de cada proceso del pool
+_worker_data: Dict[str, Any] = {}
+
+
+def _attach_dataset(spec: Dict[str, Tuple[str, Tuple[int, ...]]]):
+    """Inicializador del pool: mapear los bloques compartidos sin copiarlos."""
+    for name, (block_name, shape) in spec.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        _worker_data[name + '_block'] = block
+        _worker_data[name] = np.ndarray(shape, dtype=np.float64, buffer=block.buf)
+
+
+def _fit_fold(params: Dict[str, Any], n_estimators: int,
+              train_idx: np.ndarray, test_idx: np.ndarray) -> Tuple[float, float]:
+    """Entrenar un candidato en un pliegue y devolver (R², MAE) de validación."""
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.metrics import mean_absolute_error, r2_score
+
+    X, y = _worker_data['X'], _worker_data['y']
+    model = RandomForestRegressor(n_estimators=n_estimators, random_state=RANDOM_STATE,
+                                  n_jobs=1, **params)
+    model.fit(X[train_idx], y[train_idx])
+    predicted = model.predict(X[test_idx])
+    return r2_score(y[test_idx], predicted), mean_absolute_error(y[test_idx], predicted)
+
+
+# --- Búsqueda ---
+
+def expand_grid(grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """Todas las combinaciones de un espacio de búsqueda {parámetro: valores}."""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+
+
+def halving_schedule(n_candidates: int, max_trees: int = DEFAULT_TREES,
+                     factor: int = HALVING_FACTOR, min_trees: int = MIN_TREES) -> List[int]:
+    """
+    Árboles por ronda de successive halving, terminando en max_trees.
+
+    Se usan tantas rondas como hagan falta para reducir los candidatos a
+    uno, sin bajar de min_trees en la primera.
+
+    Returns:
+        List[int]: p. ej. [11, 33, 100] para 27 candidatos y factor 3
+    """
+    by_candidates = math.ceil(math.log(max(n_candidates, 1), factor)) if n_candidates > 1 else 0
+    by_trees = int(math.floor(math.log(max(max_trees / min_trees, 1), factor)))
+    rounds = min(by_candidates, by_trees) + 1
+    return [max(int(round(max_trees / factor ** k)), 1) for k in reversed(range(rounds))]
+
+
+def kfold_indices(n_samples: int, folds: int = DEFAULT_FOLDS,
+                  seed: int = RANDOM_STATE) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """Pliegues barajados y reproducibles (el CSV viene ordenado por mezcla)."""
+    order = np.random.default_rng(seed).permutation(n_samples)
+    splits = np.array_split(order, folds)
+    return [(np.sort(np.concatenate(splits[:k] + splits[k + 1:])), np.sort(splits[k]))
+            for k in range(folds)]
+
+
+def search_hyperparameters(X: np.ndarray, y: np.ndarray,
+                           candidates: Optional[List[Dict[str, Any]]] = None,
+                           max_trees: int = DEFAULT_TREES, folds: int = DEFAULT_FOLDS,
+                           workers: Optional[int] = None,
+                           factor: int = HALVING_FACTOR) -> Dict[str, Any]:
+    """
+    Successive halving con validación cruzada en paralelo.
+
+    Args:
+        X: Variables de entrada
+        y: Resistencia en kg/cm²
+        candidates: Combinaciones a evaluar (por defecto DEFAULT_PARAM_GRID)
+        max_trees: Árboles de la última ronda (y del modelo final)
+        folds: Pliegues de validación cruzada
+        workers: Procesos del pool (por defecto os.cpu_count())
+        factor: Fracción 1/factor de candidatos que sobrevive cada ronda
+
+    Returns:
+        Dict: mejores_parametros, cv_r2_mean, cv_r2_std, cv_mae_mean y
+        rondas (árboles, candidatos y mejor R² por ronda)
+    """
+    candidates = list(candidates) if candidates else expand_grid(DEFAULT_PARAM_GRID)
+    schedule = halving_schedule(len(candidates), max_trees, factor)
+    splits = kfold_indices(len(y), folds)
+    workers = workers or os.cpu_count() or 1
+
+    rounds = []
+    survivors = list(range(len(candidates)))
+    with SharedDataset(X, y) as dataset, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_attach_dataset,
+                                initargs=(dataset.spec,)) as pool:
+        for trees in schedule:
+            start = time.perf_counter()
+            jobs = {(c, k): pool.submit(_fit_fold, candidates[c], trees, train, test)
+                    for c in survivors for k, (train, test) in enumerate(splits)}
+            scores = {c: np.array([jobs[c, k].result() for k in range(len(splits))])
+                      for c in survivors}
+
+            ranked = sorted(survivors, key=lambda c: scores[c][:, 0].mean(), reverse=True)
+            best = ranked[0]
+            rounds.append({
+                'arboles': trees,
+                'candidatos': len(survivors),
+                'mejor_r2': float(scores[best][:, 0].mean()),
+                'segundos': round(time.perf_counter() - start, 2)
+            })
+            logger.info(f"Ronda con {trees} arboles: {len(survivors)} candidatos, "
+                        f"mejor R2 CV {rounds[-1]['mejor_r2']:.4f}")
+            survivors = ranked[:max(1, math.ceil(len(ranked) / factor))]
+
+    return {
+        'mejores_parametros': candidates[best],
+        'cv_r2_mean': float(scores[best][:, 0].mean()),
+        'cv_r2_std': float(scores[best][:, 0].std()),
+        'cv_mae_mean': float(scores[best][:, 1].mean()),
+        'candidatos': len(candidates),
+        'pliegues': len(splits),
+        'rondas': rounds
+    }
+
+
+# --- Escritura atómica ---
+
+def write_atomic(path: Union[str, Path], writer: Callable[[Path], None]):
+    """
+    Escribir un archivo mediante un temporal en el mismo directorio y os.replace.
+
+    Args:
+        path: Archivo destino
+        writer: Función que escribe el contenido completo en la ruta recibida
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        writer(tmp_path)
+        with open(tmp_path, 'rb+') as f:
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def write_json_atomic(path: Union[str, Path], data: Dict[str, Any]):
+    """Guardar un JSON con write_atomic."""
+    def _dump(tmp_path: Path):
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+    write_atomic(path, _dump)
+
+
+def next_version(metadata_path: Path) -> str:
+    """Versión menor siguiente a la de la metadata existente."""
+    try:
+        with open(metadata_path, 'r', encoding='utf-8') as f:
+            major, minor = json.load(f)['modelo_info']['version'].split('.')[:2]
+        return f"{major}.{int(minor) + 1}"
+    except (OSError, ValueError, KeyError):
+        return "1.0"
+
+
+def save_trained_model(model, metadata: Dict[str, Any],
+                       model_path: Union[str, Path], metadata_path: Union[str, Path],
+                       write_artifact: bool = True):
+    """
+    Guardar modelo, artefacto .forest y metadata, cada uno de forma atómica.
+
+    El orden (modelo, artefacto, metadata) garantiza que el artefacto nunca
+    parece vigente para otro modelo: mientras no se reescribe, su hash no
+    coincide y el handler usa el pickle nuevo.
+
+    Args:
+        model: RandomForestRegressor entrenado
+        metadata: Contenido de modelo_metadata.json
+        model_path: Destino del .pkl (joblib)
+        metadata_path: Destino de la metadata
+        write_artifact: Regenerar también <modelo>.forest
+    """
+    import joblib
+
+    write_atomic(model_path, lambda tmp: joblib.dump(model, tmp))
+    if write_artifact:
+        from model_artifact import default_artifact_path, save_forest_artifact
+        from tree_engine import FlatForest
+        save_forest_artifact(FlatForest.from_sklearn(model), default_artifact_path(model_path),
+                             metadata['modelo_info']['variables_entrada'],
+                             model.feature_importances_, source_path=model_path)
+    write_json_atomic(metadata_path, metadata)
+    logger.info(f"Modelo guardado en {model_path} y metadata en {metadata_path}")
+
+
+# --- Pipeline ---
+
+def train_model(csv_path: Union[str, Path] = "Concrete_Data.csv",
+                model_path: Union[str, Path] = "modelo_hormigon_ecuador_v1.pkl",
+                metadata_path: Union[str, Path] = "modelo_metadata.json",
+                param_grid: Optional[Dict[str, List[Any]]] = None,
+                max_trees: int = DEFAULT_TREES, folds: int = DEFAULT_FOLDS,
+                workers: Optional[int] = None, write_artifact: bool = True) -> Dict[str, Any]:
+    """
+    Buscar hiperparámetros, entrenar el modelo final y guardarlo.
+
+    Args:
+        csv_path: Dataset de laboratorio
+        model_path: Destino del modelo
+        metadata_path: Destino de la metadata
+        param_grid: Espacio de búsqueda (por defecto DEFAULT_PARAM_GRID)
+        max_trees: Árboles del modelo final
+        folds: Pliegues de validación cruzada
+        workers: Procesos del pool
+        write_artifact: Regenerar el artefacto .forest
+
+    Returns:
+        Dict: Metadata escrita
+    """
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.metrics import mean_absolute_error, r2_score
+    from model_handler_fixed import ConcreteModelHandler
+    from utils import MPA_TO_KG_CM2, load_concrete_dataset
+
+    start = time.perf_counter()
+    feature_names = list(ConcreteModelHandler.FEATURE_NAMES)
+    df = load_concrete_dataset(str(csv_path))
+    X = df[feature_names].to_numpy(dtype=np.float64)
+    y = df[TARGET_COLUMN].to_numpy(dtype=np.float64)
+    logger.info(f"Dataset cargado: {X.shape[0]} muestras, {X.shape[1]} variables")
+
+    search = search_hyperparameters(X, y, expand_grid(param_grid or DEFAULT_PARAM_GRID),
+                                    max_trees, folds, workers)
+    params = search['mejores_parametros']
+    logger.info(f"Mejores hiperparametros: {params}")
+
+    model = RandomForestRegressor(n_estimators=max_trees, oob_score=True,
+                                  random_state=RANDOM_STATE, n_jobs=-1, **params)
+    model.fit(X, y)
+    predicted = model.predict(X)
+
+    metadata_path = Path(metadata_path)
+    metadata = {
+        "modelo_info": {
+            "tipo": "RandomForestRegressor",
+            "version": next_version(metadata_path),
+            "fecha_entrenamiento": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "variables_entrada": feature_names,
+            "variable_salida": TARGET_COLUMN
+        },
+        "metricas": {
+            "r2_score": float(r2_score(y, predicted)),
+            "mae_kg_cm2": float(mean_absolute_error(y, predicted)),
+            "cv_score_mean": search['cv_r2_mean'],
+            "estabilidad": search['cv_r2_std'],
+            "cv_mae_kg_cm2": search['cv_mae_mean'],
+            "oob_score": float(model.oob_score_)
+        },
+        "hiperparametros": dict(params, n_estimators=max_trees, random_state=RANDOM_STATE),
+        "busqueda": {
+            "candidatos": search['candidatos'],
+            "pliegues": search['pliegues'],
+            "rondas": search['rondas']
+        },
+        "datos_entrenamiento": {
+            "num_muestras": int(len(X)),
+            "num_features": int(X.shape[1]),
+            "conversion_mpa_kg_cm2": MPA_TO_KG_CM2
+        }
+    }
+
+    save_trained_model(model, metadata, model_path, metadata_path, write_artifact)
+    logger.info(f"Entrenamiento completado en {time.perf_counter() - start:.1f} s")
+    return metadata
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    """Argumentos del modo de entrenamiento."""
+    parser = argparse.ArgumentParser(
+        prog="main.py train",
+        description="Entrenar el modelo con búsqueda de hiperparámetros en paralelo")
+    parser.add_argument('--csv', default="Concrete_Data.csv", help="Dataset de laboratorio")
+    parser.add_argument('--model', default="modelo_hormigon_ecuador_v1.pkl",
+                        help="Destino del modelo .pkl")
+    parser.add_argument('--metadata', default="modelo_metadata.json",
+                        help="Destino de la metadata")
+    parser.add_argument('--trees', type=int, default=DEFAULT_TREES,
+                        help=f"Árboles del modelo final (por defecto {DEFAULT_TREES})")
+    parser.add_argument('--folds', type=int, default=DEFAULT_FOLDS,
+                        help=f"Pliegues de validación cruzada (por defecto {DEFAULT_FOLDS})")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Procesos del pool (por defecto todos los núcleos)")
+    parser.add_argument('--notebook', action='store_true',
+                        help="Sin búsqueda: usar la configuración rf_optimized del notebook")
+    parser.add_argument('--no-artifact', action='store_true',
+                        help="No regenerar el artefacto .forest")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada de `python main.py train`."""
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    if not Path(args.csv).is_file():
+        print(f"ERROR: No se encontro el dataset '{args.csv}'")
+        return 1
+
+    grid = {name: [value] for name, value in NOTEBOOK_PARAMS.items()} if args.notebook else None
+    try:
+        metadata = train_model(args.csv, args.model, args.metadata, grid,
+                               args.trees, args.folds, args.workers,
+                               write_artifact=not args.no_artifact)
+    except Exception as e:
+        logger.error(f"Error entrenando el modelo: {e}")
+        print(f"ERROR: {e}")
+        return 1
+
+    metrics = metadata['metricas']
+    print(f"=> Modelo v{metadata['modelo_info']['version']} guardado en {args.model}")
+    print(f"   Hiperparametros: {metadata['hiperparametros']}")
+    print(f"   R2 CV: {metrics['cv_score_mean']:.4f} ± {metrics['estabilidad']:.4f}   "
+          f"OOB: {metrics['oob_score']:.4f}   MAE CV: {metrics['cv_mae_kg_cm2']:.2f} kg/cm²")
+    for stage in metadata['busqueda']['rondas']:
+        print(f"   Ronda {stage['arboles']:>4} arboles: {stage['candidatos']:>3} candidatos, "
+              f"mejor R2 {stage['mejor_r2']:.4f} ({stage['segundos']} s)")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+    sys.exit(main())
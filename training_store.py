@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Almacén de Datos de Entrenamiento
+=================================
+
+Ensayos de laboratorio (mezcla + resistencia medida) en una tabla SQLite
+de solo inserción. Se siembra con Concrete_Data.csv la primera vez y luego
+recibe los resultados de cilindros nuevos. El id creciente define el orden
+de las filas: "las primeras n filas" identifica sin ambigüedad los datos
+que vio cada árbol del bosque (ver incremental_training).
+"""
+
+import logging
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+from model_handler_fixed import ConcreteModelHandler
+from training_pipeline import TARGET_COLUMN
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TRAINING_STORE_PATH = "datos_entrenamiento.db"
+SEED_DATASET = "Concrete_Data.csv"
+
+_FEATURES = ConcreteModelHandler.FEATURE_NAMES
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS ensayos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    fecha_ingreso TEXT NOT NULL,
+    origen TEXT,
+    {", ".join(f"{feature} REAL NOT NULL" for feature in _FEATURES)},
+    {TARGET_COLUMN} REAL NOT NULL
+);
+"""
+
+
+class TrainingStore:
+    """Ensayos de laboratorio usados para entrenar el modelo."""
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_TRAINING_STORE_PATH,
+                 seed_csv: Optional[Union[str, Path]] = SEED_DATASET):
+        """
+        Abrir (o crear) el almacén.
+
+        Args:
+            path: Archivo SQLite; ":memory:" para un almacén temporal
+            seed_csv: Dataset con el que se siembra un almacén vacío (None = no sembrar)
+        """
+        self.path = str(path)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+        if self.count() == 0 and seed_csv is not None and Path(seed_csv).is_file():
+            from utils import load_concrete_dataset
+            df = load_concrete_dataset(str(seed_csv))
+            self.append(df[_FEATURES].to_numpy(dtype=np.float64),
+                        df[TARGET_COLUMN].to_numpy(dtype=np.float64), Path(seed_csv).name)
+        logger.info(f"Almacen de entrenamiento abierto: {self.path} ({self.count()} ensayos)")
+
+    def close(self):
+        """Cerrar la conexión."""
+        self._conn.close()
+
+    def append(self, X: np.ndarray, y: np.ndarray, origin: Optional[str] = None) -> int:
+        """
+        Agregar ensayos al final del almacén.
+
+        Args:
+            X: Mezclas (n, 8) en el orden de FEATURE_NAMES
+            y: Resistencia medida en kg/cm²
+            origin: Archivo o lote del que provienen
+
+        Returns:
+            int: Filas agregadas
+        """
+        X = np.asarray(X, dtype=np.float64).reshape(-1, len(_FEATURES))
+        y = np.asarray(y, dtype=np.float64).reshape(-1)
+        if len(X) != len(y):
+            raise ValueError(f"{len(X)} mezclas para {len(y)} resistencias")
+        if not (np.isfinite(X).all() and np.isfinite(y).all()):
+            raise ValueError("Los ensayos contienen valores vacíos o no numéricos")
+
+        columns = ['fecha_ingreso', 'origen'] + _FEATURES + [TARGET_COLUMN]
+        now = datetime.now().isoformat()
+        with self._conn:
+            self._conn.executemany(
+                f"INSERT INTO ensayos ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' * len(columns))})",
+                ([now, origin, *row, target] for row, target in zip(X.tolist(), y.tolist())))
+        return len(X)
+
+    def count(self) -> int:
+        """Número de ensayos guardados."""
+        return self._conn.execute("SELECT COUNT(*) FROM ensayos").fetchone()[0]
+
+    def arrays(self, limit: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Ensayos en orden de ingreso.
+
+        Args:
+            limit: Solo las primeras filas (None = todas)
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (X (n, 8), y (n,))
+        """
+        sql = f"SELECT {', '.join(_FEATURES)}, {TARGET_COLUMN} FROM ensayos ORDER BY id"
+        params = ()
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = (int(limit),)
+        data = np.array(self._conn.execute(sql, params).fetchall(), dtype=np.float64)
+        data = data.reshape(-1, len(_FEATURES) + 1)
+        return data[:, :-1], data[:, -1]
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Motor de Inferencia de Árboles en Arrays Planos
+===============================================
+
+Este módulo exporta los árboles de un RandomForestRegressor entrenado a
+arrays NumPy contiguos (feature, threshold, children, value) y los
+evalúa con un recorrido vectorizado nivel por nivel, sin pasar por la
+validación ni el despacho de hilos de sklearn en cada llamada.
+"""
+
+import logging
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class FlatForest:
+    """Bosque de regresión representado como arrays de nodos contiguos."""
+
+    def __init__(self, feature: np.ndarray, threshold: np.ndarray,
+                 children: np.ndarray, value: np.ndarray, roots: np.ndarray,
+                 max_depth: int, n_features: int):
+        """
+        Inicializar el bosque plano.
+
+        Args:
+            feature: Índice de la variable evaluada en cada nodo
+            threshold: Umbral de cada nodo (las hojas usan +inf)
+            children: Hijos intercalados (izq, der) con índice global; las
+                hojas apuntan a sí mismas
+            value: Valor predicho en cada nodo
+            roots: Índice global de la raíz de cada árbol
+            max_depth: Profundidad máxima entre todos los árboles
+            n_features: Número de variables de entrada
+        """
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.value = value
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.n_features = int(n_features)
+
+        self._is_leaf = self.left == np.arange(len(feature))
+
+    @property
+    def left(self) -> np.ndarray:
+        """Índice global del hijo izquierdo de cada nodo."""
+        return self.children[0::2]
+
+    @property
+    def right(self) -> np.ndarray:
+        """Índice global del hijo derecho de cada nodo."""
+        return self.children[1::2]
+
+    @property
+    def n_trees(self) -> int:
+        """Número de árboles del bosque."""
+        return len(self.roots)
+
+    @property
+    def node_count(self) -> int:
+        """Número total de nodos de todos los árboles."""
+        return len(self.feature)
+
+    @classmethod
+    def from_sklearn(cls, model: Any) -> "FlatForest":
+        """
+        Exportar un RandomForestRegressor (o DecisionTreeRegressor) entrenado.
+
+        Args:
+            model: Estimador de sklearn ya entrenado
+
+        Returns:
+            FlatForest: Bosque listo para predecir
+        """
+        estimators = getattr(model, 'estimators_', [model])
+        trees = [est.tree_ for est in estimators]
+        if any(tree.n_outputs != 1 for tree in trees):
+            raise ValueError("Solo se soportan modelos de regresión con una salida")
+
+        offsets = np.cumsum([0] + [tree.node_count for tree in trees])
+        total = int(offsets[-1])
+
+        feature = np.zeros(total, dtype=np.int32)
+        threshold = np.full(total, np.inf, dtype=np.float64)
+        # Hijos intercalados (izq, der) para avanzar con un solo gather por nivel
+        children = np.empty(2 * total, dtype=np.intp)
+        value = np.empty(total, dtype=np.float64)
+
+        for tree, start, end in zip(trees, offsets[:-1], offsets[1:]):
+            nodes = np.arange(start, end, dtype=np.intp)
+            is_leaf = tree.children_left == -1
+            internal = ~is_leaf
+
+            feature[start:end][internal] = tree.feature[internal]
+            threshold[start:end][internal] = tree.threshold[internal]
+            # Las hojas apuntan a sí mismas para que el recorrido no requiera máscaras
+            children[2 * start:2 * end:2] = np.where(is_leaf, nodes, tree.children_left + start)
+            children[2 * start + 1:2 * end:2] = np.where(is_leaf, nodes, tree.children_right + start)
+            value[start:end] = tree.value[:, 0, 0]
+
+        max_depth = max(tree.max_depth for tree in trees)
+        n_features = getattr(model, 'n_features_in_', int(feature.max()) + 1)
+
+        logger.info(f"Bosque exportado: {len(trees)} árboles, {total} nodos, "
+                    f"profundidad máxima {max_depth}")
+
+        return cls(feature, threshold, children, value,
+                   offsets[:-1].astype(np.intp), max_depth, n_features)
+
+    def leaf_values(self, X: np.ndarray, chunk_size: int = 1024) -> np.ndarray:
+        """
+        Valor de la hoja alcanzada por cada fila en cada árbol.
+
+        Args:
+            X: Matriz de entrada (n, n_features)
+            chunk_size: Filas procesadas por bloque para acotar memoria
+
+        Returns:
+            np.ndarray: Matriz (n, n_trees) con el valor de cada árbol
+        """
+        # sklearn compara en float32, se replica para obtener las mismas hojas
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"Se esperaban {self.n_features} columnas, se recibieron {X.shape[1]}")
+
+        out = np.empty((X.shape[0], self.n_trees), dtype=np.float64)
+        for start in range(0, X.shape[0], chunk_size):
+            block = X[start:start + chunk_size]
+            out[start:start + len(block)] = self._traverse(block)
+        return out
+
+    def _traverse(self, block: np.ndarray) -> np.ndarray:
+        """Recorrer todos los árboles nivel por nivel para un bloque de filas."""
+        n_rows = len(block)
+        flat_block = block.ravel()
+
+        # Un par (fila, árbol) activo por posición; se compacta al llegar a hoja
+        nodes = np.tile(self.roots, n_rows)
+        row_offset = np.repeat(np.arange(n_rows, dtype=np.intp) * self.n_features, self.n_trees)
+        position = np.arange(nodes.size)
+        result = np.empty(nodes.size, dtype=np.float64)
+
+        for _ in range(self.max_depth + 1):
+            at_leaf = self._is_leaf[nodes]
+            if at_leaf.any():
+                result[position[at_leaf]] = self.value[nodes[at_leaf]]
+                active = ~at_leaf
+                nodes, position, row_offset = nodes[active], position[active], row_offset[active]
+                if nodes.size == 0:
+                    break
+            go_right = flat_block[row_offset + self.feature[nodes]] > self.threshold[nodes]
+            nodes = self.children[2 * nodes + go_right]
+
+        return result.reshape(n_rows, self.n_trees)
+
+    def predict(self, X: np.ndarray, chunk_size: int = 1024) -> np.ndarray:
+        """
+        Predicción del bosque (media de los árboles) para cada fila.
+
+        Args:
+            X: Matriz de entrada (n, n_features)
+            chunk_size: Filas procesadas por bloque para acotar memoria
+
+        Returns:
+            np.ndarray: Predicciones (n,)
+        """
+        return self.leaf_values(X, chunk_size).mean(axis=1)
@@ -12,9 +12,11 @@ import math
 
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QGroupBox, 
                            QSlider, QSpinBox, QDoubleSpinBox, QLabel, QPushButton,
-                           QFrame, QProgressBar, QTextEdit, QScrollArea)
+                           QFrame, QProgressBar, QTextEdit, QScrollArea, QSizePolicy,
+                           QDialog, QTableWidget, QTableWidgetItem, QHeaderView,
+                           QFileDialog, QMessageBox)
 from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QPropertyAnimation, QEasingCurve
-from PyQt6.QtGui import QPainter, QColor, QFont, QPen, QBrush, QPolygonF
+from PyQt6.QtGui import QPainter, QColor, QFont, QPen, QBrush, QPolygonF, QImage, QPixmap
 from PyQt6.QtCore import QPointF, QRectF
 import logging
 
@@ -387,6 +389,8 @@ class StatusCard(QFrame):
         self.value = value
         self.subtitle = subtitle
         self.color = color
+        self._value_label = None
+        self._subtitle_label = None
         
         self._setup_ui()
     
@@ -438,60 +442,91 @@ class StatusCard(QFrame):
             layout.addWidget(subtitle_label)
     
     def update_values(self, value: str, subtitle: str = None):
-        """Actualizar valores - RECREAR WIDGETS COMPLETAMENTE."""
+        """Actualizar valores; los labels se crean una vez y luego solo cambia su texto."""
         self.value = value
         if subtitle is not None:
             self.subtitle = subtitle
         
-        print(f"RECREANDO StatusCard: value='{value}', subtitle='{subtitle}'")
+        if self._value_label is None:
+            self._create_result_labels()
         
-        try:
-            # LIMPIAR TODO EL LAYOUT
-            layout = self.layout()
-            
-            # Eliminar todos los widgets existentes
-            while layout.count():
-                child = layout.takeAt(0)
-                if child.widget():
-                    child.widget().deleteLater()
-            
-            # RECREAR WIDGETS DESDE CERO
-            # Título - MINIMALISTA Y ELEGANTE  
-            title_label = QLabel(self.title)
-            title_label.setFont(QFont("Segoe UI", 9, QFont.Weight.Medium))
-            title_label.setStyleSheet("color: #6b7280; font-weight: 500; background: transparent; border: none; text-decoration: none;")
-            title_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
-            layout.addWidget(title_label)
-            
-            # Valor principal - TAMAÑO PROPORCIONADO Y ELEGANTE
-            value_label = QLabel(value)
-            value_label.setFont(QFont("Segoe UI", 14, QFont.Weight.Bold))  # Más pequeño y proporcionado
-            value_label.setStyleSheet("color: #111827; font-weight: 600; margin: 4px 0; background: transparent; border: none; text-decoration: none;")
-            value_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
-            value_label.setWordWrap(True)
-            layout.addWidget(value_label)
-            
-            # Subtitle si existe - DISCRETO Y MINIMALISTA
-            if subtitle:
-                subtitle_label = QLabel(subtitle) 
-                subtitle_label.setFont(QFont("Segoe UI", 8, QFont.Weight.Normal))
-                subtitle_label.setStyleSheet("color: #9ca3af; font-weight: 400; background: transparent; border: none; text-decoration: none;")
-                subtitle_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
-                subtitle_label.setWordWrap(True)
-                layout.addWidget(subtitle_label)
-            
-            # FORZAR ACTUALIZACIÓN COMPLETA
-            self.adjustSize()
-            self.updateGeometry() 
-            self.update()
-            self.repaint()
-            
-            print(f"RECREADO StatusCard completamente")
-            
-        except Exception as e:
-            print(f"ERROR recreando StatusCard: {e}")
-            import traceback
-            traceback.print_exc()
+        self._value_label.setText(value)
+        self._subtitle_label.setText(self.subtitle or "")
+        self._subtitle_label.setVisible(bool(self.subtitle))
+    
+    def _create_result_labels(self):
+        """Reemplazar los labels iniciales por los de estilo de resultado."""
+        layout = self.layout()
+        
+        # Eliminar todos los widgets existentes
+        while layout.count():
+            child = layout.takeAt(0)
+            if child.widget():
+                child.widget().deleteLater()
+        
+        # Título - MINIMALISTA Y ELEGANTE  
+        title_label = QLabel(self.title)
+        title_label.setFont(QFont("Segoe UI", 9, QFont.Weight.Medium))
+        title_label.setStyleSheet("color: #6b7280; font-weight: 500; background: transparent; border: none; text-decoration: none;")
+        title_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
+        layout.addWidget(title_label)
+        
+        # Valor principal - TAMAÑO PROPORCIONADO Y ELEGANTE
+        self._value_label = QLabel()
+        self._value_label.setFont(QFont("Segoe UI", 14, QFont.Weight.Bold))
+        self._value_label.setStyleSheet("color: #111827; font-weight: 600; margin: 4px 0; background: transparent; border: none; text-decoration: none;")
+        self._value_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
+        self._value_label.setWordWrap(True)
+        layout.addWidget(self._value_label)
+        
+        # Subtitle - DISCRETO Y MINIMALISTA
+        self._subtitle_label = QLabel()
+        self._subtitle_label.setFont(QFont("Segoe UI", 8, QFont.Weight.Normal))
+        self._subtitle_label.setStyleSheet("color: #9ca3af; font-weight: 400; background: transparent; border: none; text-decoration: none;")
+        self._subtitle_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
+        self._subtitle_label.setWordWrap(True)
+        layout.addWidget(self._subtitle_label)
+
+
+class ChartImageLabel(QLabel):
+    """Muestra un gráfico ya rasterizado, escalado al tamaño del widget."""
+    
+    def __init__(self, placeholder: str = "", parent=None):
+        """
+        Inicializar el visor de gráficos.
+        
+        Args:
+            placeholder: Texto mostrado mientras no hay imagen
+            parent: Widget padre
+        """
+        super().__init__(placeholder, parent)
+        self._image = None
+        self.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.setMinimumSize(300, 200)
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        self.setStyleSheet("color: #9ca3af; background: white;")
+    
+    def chart_size(self) -> Tuple[int, int]:
+        """Tamaño en píxeles con el que conviene renderizar el gráfico."""
+        return max(self.width(), 300), max(self.height(), 200)
+    
+    def set_image(self, image: QImage):
+        """Mostrar una imagen renderizada en otro hilo."""
+        self._image = image
+        self._rescale()
+    
+    def resizeEvent(self, event):
+        """Reescalar la imagen al cambiar el tamaño del widget."""
+        super().resizeEvent(event)
+        self._rescale()
+    
+    def _rescale(self):
+        """Escalar la imagen actual manteniendo la proporción."""
+        if self._image is None or self._image.isNull():
+            return
+        self.setPixmap(QPixmap.fromImage(self._image).scaled(
+            self.size(), Qt.AspectRatioMode.KeepAspectRatio,
+            Qt.TransformationMode.SmoothTransformation))
 
 
 class AnimatedProgressBar(QProgressBar):
@@ -580,4 +615,79 @@ class LogTextEdit(QTextEdit):
         # Auto-scroll al final
         cursor = self.textCursor()
         cursor.movePosition(cursor.MoveOperation.End)
-        self.setTextCursor(cursor)
\ No newline at end of file
+        self.setTextCursor(cursor)
+
+
+class TimingDialog(QDialog):
+    """Diagnóstico de tiempos: estadísticas e histograma de cada tramo."""
+    
+    HEADERS = ["Tramo", "N", "Media (ms)", "P50 (ms)", "P95 (ms)", "Máx (ms)", "Histograma"]
+    
+    def __init__(self, recorder, parent=None):
+        """
+        Inicializar el diálogo.
+        
+        Args:
+            recorder: SpanRecorder con las mediciones
+            parent: Widget padre
+        """
+        super().__init__(parent)
+        self.recorder = recorder
+        self.setWindowTitle("Diagnóstico de Tiempos")
+        self.resize(760, 420)
+        
+        layout = QVBoxLayout(self)
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+        
+        self.table = QTableWidget(0, len(self.HEADERS))
+        self.table.setHorizontalHeaderLabels(self.HEADERS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.table)
+        
+        buttons = QHBoxLayout()
+        for text, slot in (("Actualizar", self.refresh), ("Reiniciar", self._reset),
+                           ("Exportar JSON...", self._export_json), ("Cerrar", self.close)):
+            button = QPushButton(text)
+            button.clicked.connect(slot)
+            buttons.addWidget(button)
+        layout.addLayout(buttons)
+    
+    def refresh(self):
+        """Volver a leer las estadísticas del registro."""
+        from timing_spans import histogram_bar
+        
+        summary = self.recorder.summary()
+        self.status_label.setText(
+            ("Medición activa" if self.recorder.enabled else "Medición desactivada (Ver > Medir Tiempos)")
+            + f" · {len(summary)} tramos · cubetas 1-2-5 ms")
+        
+        self.table.setRowCount(len(summary))
+        for row, (name, stats) in enumerate(summary.items()):
+            values = [name, str(stats['conteo'])] + [
+                f"{stats[key]:.3f}" for key in ('media_ms', 'p50_ms', 'p95_ms', 'max_ms')
+            ] + [histogram_bar(stats['histograma'])]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column > 0:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.table.setItem(row, column, item)
+        self.table.resizeColumnsToContents()
+    
+    def _reset(self):
+        """Descartar las mediciones acumuladas."""
+        self.recorder.reset()
+        self.refresh()
+    
+    def _export_json(self):
+        """Guardar el resumen con los histogramas en un JSON."""
+        filename, _ = QFileDialog.getSaveFileName(self, "Exportar tiempos", "tiempos.json",
+                                                  "JSON Files (*.json)")
+        if not filename:
+            return
+        try:
+            self.recorder.dump_json(filename)
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"No se pudo guardar el archivo:\n{e}")
@@ -238,6 +238,23 @@ def load_data_from_csv(filename: str) -> Optional[List[Dict[str, Any]]]:
         return None
 
 
+def load_concrete_dataset(filename: str = "Concrete_Data.csv"):
+    """
+    Cargar el dataset de laboratorio con los nombres de columnas del modelo.
+    
+    Args:
+        filename: Ruta al CSV (separador ';' y coma decimal)
+        
+    Returns:
+        pd.DataFrame: Variables de entrada y resistencia en kg/cm²
+    """
+    import pandas as pd
+    df = pd.read_csv(filename, sep=';', decimal=',')
+    df = df.rename(columns=lambda c: DATASET_COLUMN_MAPPING.get(c.strip(), c.strip()))
+    df['Resistencia_Compresion_kg_cm2'] = df['Resistencia_Compresion_kg_cm2'] * MPA_TO_KG_CM2
+    return df
+
+
 def get_app_version() -> str:
     """
     Obtener versión de la aplicación.
@@ -293,4 +310,19 @@ NEC_CLASSIFICATIONS = {
     'normal': (210, 280, "#f97316", "Uso estructural común"),
     'alta': (280, 420, "#22c55e", "Estructuras exigentes"),
     'ultra_alta': (420, float('inf'), "#3b82f6", "Estructuras especiales")
-}
\ No newline at end of file
+}
+
+# Columnas del CSV original (UCI) -> nombres usados por el modelo
+DATASET_COLUMN_MAPPING = {
+    'Cement (component 1)(kg in a m^3 mixture)': 'Cemento_kg_m3',
+    'Blast Furnace Slag (component 2)(kg in a m^3 mixture)': 'Escoria_Alto_Horno_kg_m3',
+    'Fly Ash (component 3)(kg in a m^3 mixture)': 'Ceniza_Volante_kg_m3',
+    'Water  (component 4)(kg in a m^3 mixture)': 'Agua_kg_m3',
+    'Superplasticizer (component 5)(kg in a m^3 mixture)': 'Superplastificante_kg_m3',
+    'Coarse Aggregate  (component 6)(kg in a m^3 mixture)': 'Agregado_Grueso_kg_m3',
+    'Fine Aggregate (component 7)(kg in a m^3 mixture)': 'Agregado_Fino_kg_m3',
+    'Age (day)': 'Edad_dias',
+    'Concrete compressive strength(MPa, megapascals)': 'Resistencia_Compresion_kg_cm2'
+}
+
+MPA_TO_KG_CM2 = 10.197